@@ -1,23 +1,126 @@
+from __future__ import annotations
+
+import bz2
+import gzip
+import hashlib
+import importlib.util
+import io
+import lzma
+import mmap
+import numbers
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+from itertools import islice
 from pathlib import Path
 from typing import Tuple
 from typing import List
 from typing import Any
 from typing import Union
+from typing import Iterator
+from typing import Optional
+from typing import TextIO
+from typing import Iterable
+from typing import Dict
+from typing import BinaryIO
 
 import numpy as np
-import pandas as pd
 
 
-def get_random_matrix(num_rows: int, num_columns: int) -> np.ndarray:
-    """Generates a random matrix that is sampled from a uniform range (0, 1]
+class LazyModule:
+    """Module that is imported the first time one of its attributes is
+    accessed. Used for heavy dependencies that are not needed on every
+    code path.
+
+    Parameters
+    ----------
+    name : str
+        full name of the module, e.g. "pyarrow.csv"
+    """
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr: str) -> Any:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self) -> str:
+        return f"<lazy module '{self._name}'>"
+
+
+def _lazy_import(name: str) -> Optional[LazyModule]:
+    """Lazily imports a module, returns None if it is not installed"""
+    if importlib.util.find_spec(name.partition(".")[0]) is None:
+        return None
+    return LazyModule(name)
+
+
+pd = LazyModule("pandas")
+pa = _lazy_import("pyarrow")
+pa_csv = _lazy_import("pyarrow.csv")
+feather = _lazy_import("pyarrow.feather")
+zstandard = _lazy_import("zstandard")
+
+# column names of the iris dataset
+IRIS_COLUMNS = [
+    "sepal_width",
+    "sepal_length",
+    "petal_width",
+    "petal_length",
+    "iris_species",
+]
+
+
+def get_random_matrix(
+    num_rows: int,
+    num_columns: int,
+    seed: Optional[
+        Union[int, np.random.SeedSequence, np.random.Generator]
+    ] = None,
+    out: Optional[np.ndarray] = None,
+    workers: Optional[int] = None,
+    dtype: Any = np.float64,
+) -> np.ndarray:
+    """Generates a random matrix that is sampled from a uniform range [0, 1)
     with
 
+    If a seed is provided, the matrix is generated in fixed blocks of rows,
+    each with its own generator spawned from the seed, and the blocks are
+    filled in parallel across a thread pool. The generated matrix only
+    depends on the seed, the matrix shape and dtype, not on the number of
+    workers.
+
     Parameters:
     ----------
     num_rows : int
         Number of rows in your matrix
     num_columns : int
         Number of columns in your matrix
+    seed : Optional[Union[int, np.random.SeedSequence, np.random.Generator]]
+        seed used to generate the matrix. A Generator spawns a new seed
+        sequence on every call. If None, numpy's global random state is used
+        and the matrix is generated in a single thread, by default None
+    out : Optional[np.ndarray], optional
+        preallocated C-contiguous array of shape (num_rows, num_columns) and
+        type `dtype` where the matrix is written in place. Without a seed,
+        it is filled from a seed drawn from numpy's global random state, by
+        default None
+    workers : Optional[int], optional
+        number of threads used to generate a seeded matrix. If None, the
+        number of CPUs is used, by default None
+    dtype : Any, optional
+        float type of the matrix, either np.float32 or np.float64. Entries
+        are generated directly in this precision. float32 matrices without a
+        seed are generated from a seed drawn from numpy's global random
+        state, by default np.float64
 
     Returns:
     -------
@@ -27,33 +130,51 @@ def get_random_matrix(num_rows: int, num_columns: int) -> np.ndarray:
     Raises:
     ------
     TypeError
-        Raised if either num_rows or num_columns are not integer types
+        Raised if either num_rows or num_columns are not integer types, seed
+        is not an integer, SeedSequence or Generator, out is not a numpy
+        array or workers is not an integer
     ValueError
-        Raised if either num_rows or num_columns are less than 0
+        Raised if either num_rows or num_columns are less than 0, out does
+        not match the matrix shape or type, workers is lower than 1 or dtype
+        is not supported
     """
 
-    # type checking
-    if not isinstance(num_rows, int):
-        e_msg = f"num_rows must be a integer not {type(num_rows)}"
-        raise TypeError(e_msg)
-    elif not isinstance(num_columns, int):
-        e_msg = f"num_columns must be an integer not {type(num_rows)}"
-        raise TypeError(e_msg)
+    # checking inputs
+    _check_dimensions(num_rows, num_columns)
+    dtype = _get_matrix_dtype(dtype)
+    if out is not None:
+        _check_out_matrix(out, (num_rows, num_columns), dtype)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    elif not isinstance(workers, int):
+        raise TypeError(f"workers must be an integer not {type(workers)}")
+    elif workers < 1:
+        raise ValueError("workers must be larger than 0")
 
-    # checking num_rows and num_columns values
-    if num_rows < 0:
-        raise ValueError("Number of rows must be positive")
-    elif num_columns < 0:
-        raise ValueError("Number of columns must be positive")
+    # generating float32 matrices and filling preallocated matrices from
+    # numpy's global random state, so no temporary matrix is needed
+    if seed is None and (dtype != np.float64 or out is not None):
+        seed = np.random.randint(np.iinfo(np.int64).max)
 
-    # generating matrix
-    matrix = np.random.rand(num_rows, num_columns)
+    # generating matrix with numpy's global random state
+    if seed is None:
+        return np.random.rand(num_rows, num_columns)
 
-    return matrix
+    # generating matrix in blocks of rows, each block has its own seed
+    seed = _get_seed_sequence(seed)
+    if out is None:
+        out = np.empty((num_rows, num_columns), dtype=dtype)
+    _fill_random_rows(out, seed, workers=workers)
+
+    return out
 
 
 def get_file_dimensions(file_name: str) -> Tuple[int]:
-    """_summary_
+    """Returns the shape of an iris data file without loading it. Rows are
+    counted by scanning the (memory-mapped) file in blocks and the number of
+    columns is taken from the first row with data. Rows with no data are
+    skipped the same way as `read_data_file()`. Compressed files are
+    decompressed as a stream and read in blocks.
 
     Parameters
     ----------
@@ -63,12 +184,11 @@ def get_file_dimensions(file_name: str) -> Tuple[int]:
     Returns
     -------
     Tuple[int]
-        Returns the shape of the datafile (n_rows, n_columns)
+        Returns the shape of the datafile (n_rows, n_columns). Files with no
+        data return (0, 5), the shape `read_data_file()` loads them with
 
     Raises
     ------
-    Errors raised from `read_data_file()` function
-
     FileNotFoundError:
         Raised when a provided path points to a non-existing file
     PermissionError
@@ -77,13 +197,66 @@ def get_file_dimensions(file_name: str) -> Tuple[int]:
         raised if an unexpected error captured
     """
 
-    # reading file and getting shape
-    shape = read_data_file(file_name).shape
-    return shape
+    path_obj = Path(file_name)
+    if not path_obj.is_file():
+        raise FileNotFoundError(f"{file_name} does not exist.")
+
+    try:
+        compression = _detect_compression(path_obj)
+        with _open_data_file(path_obj, binary=True) as infile:
+
+            # number of columns is based on the first row with data
+            n_columns = 0
+            for row in infile:
+                if b"," in row:
+                    n_columns = row.count(b",") + 1
+                    break
+
+            if n_columns == 0:
+                return (0, len(IRIS_COLUMNS))
+
+        # counting rows from a memory-mapped view of the file, if the file
+        # cannot be memory-mapped (e.g. compressed files), it is read in
+        # blocks instead
+        with _open_data_file(path_obj, binary=True) as infile:
+            try:
+                if compression is not None:
+                    raise ValueError("Compressed files cannot be mapped")
+                buffer = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                blocks = (
+                    np.frombuffer(block, dtype=np.uint8)
+                    for block in iter(partial(infile.read, _BLOCK_SIZE), b"")
+                )
+                n_rows = _count_data_rows(blocks)
+            else:
+                with buffer:
+                    n_rows = _count_mapped_data_rows(buffer)
+
+    except PermissionError:
+        raise PermissionError(
+            f"You do not have permissions to read {file_name} file"
+        )
+    except RuntimeError:
+        raise
+    except Exception:
+        raise RuntimeError("Unexpected error captured when loading file")
+
+    return (n_rows, n_columns)
 
 
 def write_matrix_to_file(
-    num_rows: int, num_columns: int, file_name: str
+    num_rows: int,
+    num_columns: int,
+    file_name: str,
+    engine: str = "python",
+    precision: Optional[int] = None,
+    block_rows: Optional[int] = None,
+    file_format: str = "csv",
+    seed: Optional[
+        Union[int, np.random.SeedSequence, np.random.Generator]
+    ] = None,
+    dtype: Any = np.float64,
 ) -> None:
     """Generates a matrix based on given number of columns and rows. The matrix
     is is then written out into your a file in your current directory.
@@ -96,6 +269,30 @@ def write_matrix_to_file(
         number of columns for your matrix
     file_name : str
         name of the output file containing generated matrix
+    engine : str, optional
+        engine used to write the matrix. "python" writes the matrix one row at
+        a time and "bulk" generates and writes the matrix in blocks of rows,
+        by default "python"
+    precision : Optional[int], optional
+        number of significant digits written for each entry. If None, entries
+        are written with full precision, by default None
+    block_rows : Optional[int], optional
+        number of rows generated and written at a time when using the "bulk"
+        engine. If None, the number of rows is selected so each block holds
+        about 2^20 entries, by default None
+    file_format : str, optional
+        format of the generated file. "csv" writes a text file, "npy" writes
+        a numpy binary file and "raw" writes the matrix entries as raw
+        (C-ordered) bytes. Binary files are written in blocks of rows through
+        a memory-map and can be loaded with `load_matrix_file()`, by default
+        "csv"
+    seed : Optional[Union[int, np.random.SeedSequence, np.random.Generator]]
+        seed used to generate the matrix, see `get_random_matrix()`. When
+        writing in blocks, each block is generated with its own seed spawned
+        from it, by default None
+    dtype : Any, optional
+        float type of the generated matrix, either np.float32 or np.float64,
+        by default np.float64
 
     Returns
     -------
@@ -106,6 +303,8 @@ def write_matrix_to_file(
     -------
     FileExistsError:
         Raised if the file name exists.
+    ValueError
+        Raised if an unsupported engine, file format or dtype is provided
 
     Errors raised come from from the `get_random_matrix()` function:
     TypeError
@@ -114,29 +313,118 @@ def write_matrix_to_file(
         Raised if either num_rows or num_columns are less than 0
     """
 
-    # generate matrix
-    matrix = get_random_matrix(num_rows=num_rows, num_columns=num_columns)
+    # checking inputs
+    _check_dimensions(num_rows, num_columns)
+    if engine not in _WRITE_ENGINES:
+        raise ValueError(
+            f"engine must be one of {_WRITE_ENGINES}, not {engine}"
+        )
+    if file_format not in _WRITE_FORMATS:
+        raise ValueError(
+            f"file_format must be one of {_WRITE_FORMATS}, not {file_format}"
+        )
+    dtype = _get_matrix_dtype(dtype)
+    entry_fmt = _get_entry_format(precision, dtype)
+    seed = _get_seed_sequence(seed)
+    if block_rows is None:
+        block_rows = max(1, _WRITE_BLOCK_ENTRIES // max(1, num_columns))
 
     # create save path object
-    save_path = Path(".") / f"{file_name}.csv"
+    save_path = Path(".") / f"{file_name}.{file_format}"
 
     # to prevent overwriting, we check if the file exists, if so raise error
     if save_path.is_file():
         raise FileExistsError(f"{save_path.name} already exists.")
 
-    # writing csv file
-    with open(save_path, "w") as out_file:
+    # writing binary file in blocks of rows
+    if file_format != "csv":
+        blocks = _random_matrix_blocks(
+            num_rows, num_columns, block_rows, seed=seed, dtype=dtype
+        )
+        _write_binary_blocks(
+            blocks, save_path, (num_rows, num_columns), file_format, dtype
+        )
+
+    # writing csv file one row at a time
+    elif engine == "python":
+
+        # generate matrix
+        matrix = get_random_matrix(
+            num_rows=num_rows, num_columns=num_columns, seed=seed, dtype=dtype
+        )
+
+        with open(save_path, "w") as out_file:
+
+            # iterating each row and converting it into a string. Stringed
+            # array is written into a file
+            for row in matrix:
+
+                # convert array into string type
+                row_data_str = ",".join(entry_fmt % i for i in row.tolist())
+
+                # write into file
+                file_conts = f"{row_data_str}\n"
+                out_file.write(file_conts)
+
+    # writing csv file in blocks of rows, only one block is in memory
+    elif engine == "bulk":
+        blocks = _random_matrix_blocks(
+            num_rows, num_columns, block_rows, seed=seed, dtype=dtype
+        )
+        _write_csv_blocks(blocks, save_path, precision)
+
+    # printing message where the file is saved
+    print(f"File saved in: {str(save_path.absolute())}")
+
+    return None
+
+
+def write_matrix_blocks(
+    blocks: Iterable[np.ndarray],
+    file_name: str,
+    precision: Optional[int] = None,
+) -> None:
+    """Writes a matrix that is provided as consecutive blocks of rows into a
+    csv file in your current directory. Each block is formatted and written
+    at once, therefore the whole matrix never has to be in memory.
+
+    Parameters
+    ----------
+    blocks : Iterable[np.ndarray]
+        consecutive 2D blocks of rows, all blocks must have the same number of
+        columns
+    file_name : str
+        name of the output file containing the matrix
+    precision : Optional[int], optional
+        number of significant digits written for each entry. If None, entries
+        are written with full precision, by default None
+
+    Returns
+    -------
+    None
+        Generates a matrix file in current directory
+
+    Raises
+    ------
+    FileExistsError:
+        Raised if the file name exists.
+    TypeError
+        Raised if a block is not a numpy array or precision is not an integer
+    ValueError
+        Raised if a block is not 2D, blocks have different number of columns
+        or precision is lower than 0
+    """
+
+    _get_entry_format(precision)
 
-        # iterating each row and converting it into a string. Stringed array
-        # is written into a file
-        for row in matrix:
+    # create save path object
+    save_path = Path(".") / f"{file_name}.csv"
 
-            # convert array into string type
-            row_data_str = ",".join(str(i) for i in row.tolist())
+    # to prevent overwriting, we check if the file exists, if so raise error
+    if save_path.is_file():
+        raise FileExistsError(f"{save_path.name} already exists.")
 
-            # write into file
-            file_conts = f"{row_data_str}\n"
-            out_file.write(file_conts)
+    _write_csv_blocks(blocks, save_path, precision)
 
     # printing message where the file is saved
     print(f"File saved in: {str(save_path.absolute())}")
@@ -144,120 +432,2170 @@ def write_matrix_to_file(
     return None
 
 
+def load_matrix_file(
+    file_name: str, num_columns: Optional[int] = None, dtype: Any = np.float64
+) -> np.memmap:
+    """Loads a binary matrix file generated by `write_matrix_to_file()` as a
+    read-only memory-map. No data is read until the matrix is sliced.
+
+    Parameters
+    ----------
+    file_name : str
+        path to a ".npy" or ".raw" matrix file
+    num_columns : Optional[int], optional
+        number of columns of the matrix. Required for ".raw" files, by
+        default None
+    dtype : Any, optional
+        data type of the entries in ".raw" files, by default np.float64
+
+    Returns
+    -------
+    np.memmap
+        read-only memory-mapped matrix
+
+    Raises
+    ------
+    FileNotFoundError:
+        Raised when a provided path points to a non-existing file
+    ValueError
+        Raised if the file extension is not supported, num_columns is not
+        provided for ".raw" files or the file size does not match the number
+        of columns
+    """
+
+    path_obj = Path(file_name)
+    if not path_obj.is_file():
+        raise FileNotFoundError(f"{file_name} does not exist.")
+
+    # numpy binary files contain their own shape and data type
+    if path_obj.suffix == ".npy":
+        return np.load(path_obj, mmap_mode="r")
+
+    if path_obj.suffix != ".raw":
+        raise ValueError(
+            f"Unsupported matrix file {path_obj.name}, expected .npy or .raw"
+        )
+
+    # raw files: number of rows is inferred from the file size
+    if num_columns is None:
+        raise ValueError("num_columns must be provided for .raw files")
+    row_nbytes = np.dtype(dtype).itemsize * num_columns
+    file_nbytes = path_obj.stat().st_size
+    if row_nbytes == 0 or file_nbytes % row_nbytes != 0:
+        raise ValueError(
+            f"{path_obj.name} size does not match {num_columns} columns"
+        )
+
+    shape = (file_nbytes // row_nbytes, num_columns)
+    if file_nbytes == 0:
+        return np.empty(shape, dtype=dtype)
+
+    return np.memmap(path_obj, dtype=dtype, mode="r", shape=shape)
+
+
 # ------------------------------
 # additional functions
 # ------------------------------
-def _format_types(
-    data_content: List[str],
-) -> List[Union[Union[float, int], str]]:
-    """Converts string contents to it's appropriate format.
+# lookup table of literal spellings and their python values
+_LITERAL_VALUES = {
+    "true": True,
+    "false": False,
+    "none": None,
+    **{
+        f"{sign}{spelling}": float(f"{sign}{spelling}")
+        for sign in ["", "+", "-"]
+        for spelling in ["nan", "inf", "infinity"]
+    },
+}
+
+# data types supported when generating and writing matrices
+_MATRIX_DTYPES = [np.dtype(np.float32), np.dtype(np.float64)]
+
+# number of entries generated with the same seed in get_random_matrix
+_RANDOM_BLOCK_ENTRIES = 1 << 16
+
+# columns of the iris dataset stored as pd.Categorical
+_CATEGORICAL_COLUMNS = ["iris_species"]
+
+# parsers supported by read_data_file
+_READ_ENGINES = ["python", "c", "pyarrow"]
+
+# magic bytes at the start of compressed files
+_COMPRESSION_MAGIC = {
+    "gzip": b"\x1f\x8b",
+    "bz2": b"BZh",
+    "xz": b"\xfd7zXZ\x00",
+    "zstd": b"\x28\xb5\x2f\xfd",
+}
+
+# name of the cache directory created next to data files
+_CACHE_DIR_NAME = ".dataproc_cache"
+
+# version of the parsers and of the cache entry layout, cache entries written
+# with another version are parsed again. Bump when parsed dataframes change
+_CACHE_VERSION = "3"
+
+# number of weighted values kept by quantile sketches and number of lowest
+# and highest values kept exactly
+_SKETCH_SIZE = 1024
+_SKETCH_EXTREMES = 128
+
+# number of bytes scanned at a time when counting rows
+_BLOCK_SIZE = 1 << 22
+
+# in-process memo of parsed data files, see `read_data_file(memoize=True)`:
+# (resolved path, mtime_ns, size, dtype, engine) -> (dataframe, bytes) in
+# least recently used order, evicted above _READ_MEMO_MAX_BYTES
+_READ_MEMO = OrderedDict()
+_READ_MEMO_STATS = {"hits": 0, "misses": 0, "evictions": 0}
+_READ_MEMO_MAX_BYTES = 1 << 28
+_READ_MEMO_LOCK = threading.Lock()
+
+# engines supported by write_matrix_to_file
+_WRITE_ENGINES = ["python", "bulk"]
+
+# file formats supported by write_matrix_to_file
+_WRITE_FORMATS = ["csv", "npy", "raw"]
+
+# number of entries per block and buffer size (bytes) when writing matrices
+_WRITE_BLOCK_ENTRIES = 1 << 20
+_WRITE_BUFFER_SIZE = 1 << 23
+
+# entries that can be parsed with float(), e.g 1.5, -.5, 1e-3, 1_000.0
+_FLOAT_PATTERN = re.compile(
+    r"^\s*[+-]?(\d[\d_]*\.?[\d_]*|\.\d[\d_]*)([eE][+-]?\d[\d_]*)?\s*$"
+)
+
+
+def _check_dimensions(num_rows: int, num_columns: int) -> None:
+    """Checks that matrix dimensions are positive integers.
 
     Parameters
     ----------
-    data_content : List[Any]
-        extracted contents from iris data file
+    num_rows : int
+        Number of rows in your matrix
+    num_columns : int
+        Number of columns in your matrix
+
+    Raises
+    ------
+    TypeError
+        Raised if either num_rows or num_columns are not integer types
+    ValueError
+        Raised if either num_rows or num_columns are less than 0
+    """
+
+    # type checking
+    if not isinstance(num_rows, int):
+        e_msg = f"num_rows must be a integer not {type(num_rows)}"
+        raise TypeError(e_msg)
+    elif not isinstance(num_columns, int):
+        e_msg = f"num_columns must be an integer not {type(num_rows)}"
+        raise TypeError(e_msg)
+
+    # checking num_rows and num_columns values
+    if num_rows < 0:
+        raise ValueError("Number of rows must be positive")
+    elif num_columns < 0:
+        raise ValueError("Number of columns must be positive")
+
+
+def _get_seed_sequence(
+    seed: Optional[Union[int, np.random.SeedSequence, np.random.Generator]]
+) -> Optional[np.random.SeedSequence]:
+    """Converts a user provided seed into a SeedSequence.
+
+    Parameters
+    ----------
+    seed : Optional[Union[int, np.random.SeedSequence, np.random.Generator]]
+        user provided seed. Generators spawn a new SeedSequence from their
+        own seed sequence, or seed one from their stream if they have none
 
     Returns
     -------
-    List[Union[Union[float, int], str]]
-        list of appropriately typed data entries.
+    Optional[np.random.SeedSequence]
+        SeedSequence of the seed, or None if no seed was provided
+
+    Raises
+    ------
+    TypeError
+        Raised if seed is not an integer, SeedSequence or Generator
     """
 
-    formatted_data_entries = []
-    for row in data_content:
+    if seed is None or isinstance(seed, np.random.SeedSequence):
+        return seed
+    if isinstance(seed, np.random.Generator):
+        seed_seq = getattr(seed.bit_generator, "seed_seq", None)
+        if isinstance(seed_seq, np.random.SeedSequence):
+            return seed_seq.spawn(1)[0]
+        return np.random.SeedSequence(
+            seed.integers(np.iinfo(np.int64).max, size=4).tolist()
+        )
+    if not isinstance(seed, numbers.Integral) or isinstance(seed, bool):
+        raise TypeError(
+            "seed must be an integer, SeedSequence or Generator not "
+            f"{type(seed)}"
+        )
 
-        formatted_row_entries = []
-        for entry in row:
+    return np.random.SeedSequence(int(seed))
 
-            # check if it is a integer
-            if entry.isdigit():
-                entry = int(entry)
-                formatted_row_entries.append(entry)
-                continue
 
-            # checking if float
-            try:
-                entry = float(entry)
-                formatted_row_entries.append(entry)
+def _get_matrix_dtype(dtype: Any) -> np.dtype:
+    """Checks that a matrix data type is supported.
 
-            # if value error is raised, then it is a string or bool
-            except ValueError:
+    Parameters
+    ----------
+    dtype : Any
+        user provided data type
 
-                # checking if it is a bool
-                # -- eval checks for python attributes, functions and methods
-                # -- in string format
-                # eval("False") -> False #bool object from string
-                try:
-                    entry = eval(entry.capitalize())
-                    formatted_row_entries.append(entry)
+    Returns
+    -------
+    np.dtype
+        numpy data type
 
-                # if NameError is caught, then it is a string
-                except NameError:
-                    entry = str(entry)
-                    formatted_row_entries.append(entry)
+    Raises
+    ------
+    ValueError
+        Raised if dtype is not float32 or float64
+    """
 
-        formatted_data_entries.append(formatted_row_entries)
+    try:
+        dtype = np.dtype(dtype)
+    except TypeError:
+        raise ValueError(f"Unsupported dtype {dtype}")
+    if dtype not in _MATRIX_DTYPES:
+        raise ValueError(
+            f"dtype must be one of {[str(t) for t in _MATRIX_DTYPES]}, "
+            f"not {dtype}"
+        )
 
-    return formatted_data_entries
+    return dtype
 
 
-def read_data_file(path: str) -> List[str]:
-    """Loads contents from iris data file as a list.
+def _check_out_matrix(
+    out: np.ndarray, shape: Tuple[int, int], dtype: np.dtype
+) -> None:
+    """Checks that a preallocated matrix can hold a generated matrix.
 
     Parameters
     ----------
-    path : str
-        path to datafile
+    out : np.ndarray
+        preallocated matrix
+    shape : Tuple[int, int]
+        shape of the generated matrix
+    dtype : np.dtype
+        data type of the generated matrix
+
+    Raises
+    ------
+    TypeError
+        Raised if out is not a numpy array
+    ValueError
+        Raised if out does not have the expected shape or data type, is not
+        C-contiguous or is read-only
+    """
+
+    if not isinstance(out, np.ndarray):
+        raise TypeError(f"out must be a numpy array not {type(out)}")
+    if out.shape != shape:
+        raise ValueError(f"out must have shape {shape} not {out.shape}")
+    if out.dtype != dtype:
+        raise ValueError(f"out must be a {dtype} array not {out.dtype}")
+    if not out.flags.c_contiguous or not out.flags.writeable:
+        raise ValueError("out must be a writeable C-contiguous array")
+
+
+def _get_entry_format(
+    precision: Optional[int], dtype: Any = np.float64
+) -> str:
+    """Returns the printf-style format used to write a matrix entry.
+
+    Parameters
+    ----------
+    precision : Optional[int]
+        number of significant digits. If None, entries are formatted with
+        full precision (same as `str()`). float32 entries are written with 9
+        significant digits, which is enough to read them back exactly
+    dtype : Any, optional
+        data type of the written entries, by default np.float64
 
     Returns
     -------
-    List[str]
-        contents within data file as a list
+    str
+        format of a single entry
 
     Raises
-    FileNotFoundError:
-        Raised when a provided path points to a non-existing file
-    PermissionError
-        Raised if you do not have read permissions.
-    RuntimeError
-        raised if an unexpected error captured
+    ------
+    TypeError
+        Raised if precision is not an integer
+    ValueError
+        Raised if precision is lower than 0
     """
 
-    path_obj = Path(path)
-    if not path_obj.is_file():
-        raise FileNotFoundError(f"{path} does not exist.")
+    if precision is None and np.dtype(dtype) == np.float32:
+        return "%.9g"
+    if precision is None:
+        return "%r"
 
-    try:
-        data_entries = []
-        with open(path_obj, "r") as infile:
-            iris_data = []
-            for row in infile:
-                entries = row.rstrip("\n").split(",")
+    if not isinstance(precision, int):
+        raise TypeError(f"precision must be an integer not {type(precision)}")
+    if precision < 0:
+        raise ValueError("precision must be positive")
 
-                # remove rows with no data
-                if len(entries) == 1:
-                    continue
+    return f"%.{precision}g"
 
-                # store data
-                data_entries.append(entries)
 
-    except PermissionError:
-        raise PermissionError(
-            f"You do not have permissions to read {path} file"
-        )
-    except Exception:
-        raise RuntimeError("Unexpected error captured when loading file")
+def _format_block(block: np.ndarray, entry_fmt: str) -> str:
+    """Formats a 2D block of rows into csv text with a single formatting
+    call.
 
-    # formatting entries to appropriate types
-    data_entries = _format_types(data_entries)
+    Parameters
+    ----------
+    block : np.ndarray
+        2D block of rows
+    entry_fmt : str
+        format of a single entry, see `_get_entry_format()`
 
-    # convert into pandas dataframe
-    col_idx = [
-        "sepal_width",
-        "sepal_length",
-        "petal_width",
-        "petal_length",
-        "iris_species",
-    ]
-    iris_df = pd.DataFrame(data=data_entries, columns=col_idx)
-    return iris_df
+    Returns
+    -------
+    str
+        csv formatted rows
+    """
+
+    n_rows, n_columns = block.shape
+    row_fmt = ",".join([entry_fmt] * n_columns) + "\n"
+    block_str = (row_fmt * n_rows) % tuple(block.ravel().tolist())
+
+    return block_str
+
+
+def _write_csv_blocks(
+    blocks: Iterable[np.ndarray], save_path: Path, precision: Optional[int]
+) -> None:
+    """Formats and writes consecutive blocks of rows into a csv file.
+
+    Parameters
+    ----------
+    blocks : Iterable[np.ndarray]
+        consecutive 2D blocks of rows
+    save_path : Path
+        path of the csv file
+    precision : Optional[int]
+        number of significant digits, see `_get_entry_format()`
+
+    Raises
+    ------
+    TypeError
+        Raised if a block is not a numpy array
+    ValueError
+        Raised if a block is not 2D or blocks have different number of
+        columns
+    """
+
+    n_columns = None
+    with open(save_path, "w", buffering=_WRITE_BUFFER_SIZE) as out_file:
+        for block in blocks:
+
+            # checking block
+            if not isinstance(block, np.ndarray):
+                raise TypeError(
+                    f"blocks must be numpy arrays not {type(block)}"
+                )
+            if block.ndim != 2:
+                raise ValueError("blocks must be 2D arrays")
+            if n_columns is None:
+                n_columns = block.shape[1]
+            elif block.shape[1] != n_columns:
+                raise ValueError(
+                    "All blocks must contain the same number of columns"
+                )
+
+            entry_fmt = _get_entry_format(precision, block.dtype)
+            out_file.write(_format_block(block, entry_fmt))
+
+
+def _random_block_rows(num_columns: int) -> int:
+    """Returns the number of rows generated with the same seed when
+    generating a seeded matrix.
+
+    Parameters
+    ----------
+    num_columns : int
+        Number of columns in your matrix
+
+    Returns
+    -------
+    int
+        number of rows per seeded block
+    """
+    return max(1, _RANDOM_BLOCK_ENTRIES // max(1, num_columns))
+
+
+def _fill_random_rows(
+    out: np.ndarray,
+    seed: np.random.SeedSequence,
+    first_block: int = 0,
+    workers: Optional[int] = None,
+) -> None:
+    """Fills consecutive seeded blocks of a random matrix. The seed of each
+    block is the child of `seed` at the block's index, which is the same as
+    the children created by `seed.spawn()`.
+
+    Parameters
+    ----------
+    out : np.ndarray
+        C-contiguous array that is filled, its first row is the first row of
+        block `first_block`
+    seed : np.random.SeedSequence
+        seed of the complete matrix
+    first_block : int, optional
+        index of the first block held by `out`, by default 0
+    workers : Optional[int], optional
+        number of threads used to fill the blocks. If None, the number of
+        CPUs is used, by default None
+    """
+
+    block_rows = _random_block_rows(out.shape[1])
+    start_rows = range(0, out.shape[0], block_rows)
+
+    def fill_block(block_idx: int, start_row: int) -> None:
+        block_seed = np.random.SeedSequence(
+            seed.entropy,
+            spawn_key=seed.spawn_key + (first_block + block_idx,),
+            pool_size=seed.pool_size,
+        )
+        block = out[start_row:start_row + block_rows]
+        np.random.default_rng(block_seed).random(dtype=out.dtype, out=block)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(start_rows) <= 1:
+        for block_idx, start_row in enumerate(start_rows):
+            fill_block(block_idx, start_row)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(fill_block, range(len(start_rows)), start_rows))
+
+
+def _random_matrix_blocks(
+    num_rows: int,
+    num_columns: int,
+    block_rows: int,
+    seed: Optional[np.random.SeedSequence] = None,
+    dtype: np.dtype = np.float64,
+) -> Iterator[np.ndarray]:
+    """Generates a random matrix in consecutive blocks of rows.
+
+    Parameters
+    ----------
+    num_rows : int
+        Number of rows in your matrix
+    num_columns : int
+        Number of columns in your matrix
+    block_rows : int
+        Number of rows per block. With a seed, it is rounded up to a multiple
+        of the seeded block size so the blocks are the same as
+        `get_random_matrix()` with the same seed
+    seed : Optional[np.random.SeedSequence], optional
+        seed of the complete matrix. If None, numpy's global random state is
+        used, by default None
+    dtype : np.dtype, optional
+        data type of the generated blocks, by default np.float64
+
+    Yields
+    ------
+    Iterator[np.ndarray]
+        random blocks of at most `block_rows` rows
+    """
+
+    # generating blocks with numpy's global random state
+    if seed is None:
+        for start_row in range(0, num_rows, block_rows):
+            yield get_random_matrix(
+                num_rows=min(block_rows, num_rows - start_row),
+                num_columns=num_columns,
+                dtype=dtype,
+            )
+        return None
+
+    # generating blocks made of complete seeded blocks
+    seeded_rows = _random_block_rows(num_columns)
+    block_rows = -(-block_rows // seeded_rows) * seeded_rows
+    for start_row in range(0, num_rows, block_rows):
+        block = np.empty(
+            (min(block_rows, num_rows - start_row), num_columns), dtype=dtype
+        )
+        _fill_random_rows(block, seed, first_block=start_row // seeded_rows)
+        yield block
+
+
+def _write_binary_blocks(
+    blocks: Iterable[np.ndarray],
+    save_path: Path,
+    shape: Tuple[int, int],
+    file_format: str,
+    dtype: np.dtype = np.float64,
+) -> None:
+    """Writes consecutive blocks of rows into a memory-mapped binary file.
+
+    Parameters
+    ----------
+    blocks : Iterable[np.ndarray]
+        consecutive 2D blocks of rows
+    save_path : Path
+        path of the binary file
+    shape : Tuple[int, int]
+        shape of the complete matrix
+    file_format : str
+        "npy" or "raw"
+    dtype : np.dtype, optional
+        data type of the written matrix, by default np.float64
+    """
+
+    # raw empty files cannot be memory-mapped
+    if file_format == "raw" and 0 in shape:
+        save_path.touch()
+        return None
+
+    if file_format == "npy":
+        out_matrix = np.lib.format.open_memmap(
+            save_path, mode="w+", dtype=dtype, shape=shape
+        )
+    else:
+        out_matrix = np.memmap(save_path, dtype=dtype, mode="w+", shape=shape)
+
+    # filling memory-map one block at a time
+    start_row = 0
+    for block in blocks:
+        out_matrix[start_row:start_row + block.shape[0]] = block
+        start_row += block.shape[0]
+
+    out_matrix.flush()
+    del out_matrix
+
+
+def _format_entry(entry: str) -> Union[Union[float, int], str]:
+    """Converts a single string entry to it's appropriate type. Booleans,
+    None and nan/inf spellings are resolved through the `_LITERAL_VALUES`
+    lookup table and floats are pre-checked with `_FLOAT_PATTERN`, therefore
+    no exceptions are raised when an entry is a plain string.
+
+    Parameters
+    ----------
+    entry : str
+        single entry extracted from iris data file
+
+    Returns
+    -------
+    Union[Union[float, int], str]
+        appropriately typed entry
+    """
+
+    # check if it is a integer
+    if entry.isdigit():
+        return int(entry)
+
+    # checking if it is a literal (bool, None, nan or inf)
+    literal_key = entry.strip().lower()
+    if literal_key in _LITERAL_VALUES:
+        return _LITERAL_VALUES[literal_key]
+
+    # checking if float
+    if _FLOAT_PATTERN.match(entry) is not None:
+        try:
+            return float(entry)
+        except ValueError:
+            pass
+
+    # entry is a string
+    return str(entry)
+
+
+def _convert_column(
+    column: np.ndarray,
+    sample_size: int = 100,
+    dtype: Any = np.float64,
+    categorical: bool = False,
+) -> Union[np.ndarray, pd.Categorical, List[Any]]:
+    """Converts an entire column of string entries in one pass. The column
+    type (int, float, bool or string) is inferred once from a sample of the
+    column and the whole column is converted with numpy. If a value does not
+    fit the inferred type, the column falls back to converting each unique
+    entry with `_format_entry()`.
+
+    Parameters
+    ----------
+    column : np.ndarray
+        array of string entries belonging to one column
+    sample_size : int, optional
+        number of entries used to infer the column type, by default 100
+    dtype : Any, optional
+        data type of float columns, by default np.float64
+    categorical : bool, optional
+        if True, string columns are returned as a pd.Categorical built from
+        the unique entries, by default False
+
+    Returns
+    -------
+    Union[np.ndarray, pd.Categorical, List[Any]]
+        typed numpy array (or pd.Categorical) if the column holds a single
+        type, otherwise a list of entries typed the same way as
+        `_format_entry()`.
+    """
+
+    # inferring column type from a sample of the column
+    sample = column[:sample_size]
+    sample_is_digit = np.char.isdigit(sample)
+
+    # -- integer columns
+    if sample_is_digit.all() and np.char.isdigit(column).all():
+        try:
+            return column.astype(np.int64)
+        except (ValueError, OverflowError):
+            pass
+
+    # -- float columns, integer entries in a float column are left to the
+    # -- fallback so they keep their int type
+    elif not sample_is_digit.any():
+        try:
+            sample.astype(np.float64)
+            if not np.char.isdigit(column).any():
+                return column.astype(dtype)
+        except ValueError:
+            pass
+
+    # fallback: convert each unique entry once and map it back to all rows
+    uniq_entries, inverse_idx = np.unique(column, return_inverse=True)
+    converted = [_format_entry(str(entry)) for entry in uniq_entries]
+
+    # string and bool columns can still be stored as a single typed array,
+    # categorical string columns only store the codes of each entry
+    if all(isinstance(entry, str) for entry in converted):
+        if categorical:
+            return pd.Categorical.from_codes(inverse_idx, converted)
+        return np.array(converted, dtype=object)[inverse_idx]
+    if all(isinstance(entry, bool) for entry in converted):
+        return np.array(converted, dtype=bool)[inverse_idx]
+
+    return np.array(converted, dtype=object)[inverse_idx].tolist()
+
+
+def _format_columns(
+    data_content: List[List[str]],
+    dtype: Any = np.float64,
+    categorical_cols: Iterable[int] = (),
+) -> List[Union[np.ndarray, pd.Categorical, List[Any]]]:
+    """Converts string contents to their appropriate types column by column.
+
+    Parameters
+    ----------
+    data_content : List[List[str]]
+        extracted rows from iris data file
+    dtype : Any, optional
+        data type of float columns, by default np.float64
+    categorical_cols : Iterable[int], optional
+        indices of the columns converted to pd.Categorical when they hold
+        strings, by default ()
+
+    Returns
+    -------
+    List[Union[np.ndarray, pd.Categorical, List[Any]]]
+        list of converted columns, see `_convert_column()`
+    """
+
+    if len(data_content) == 0:
+        return []
+
+    # rows with missing entries are padded with None, same as pandas
+    row_lengths = {len(row) for row in data_content}
+    if len(row_lengths) > 1:
+        return [
+            [
+                _format_entry(row[col_idx]) if col_idx < len(row) else None
+                for row in data_content
+            ]
+            for col_idx in range(max(row_lengths))
+        ]
+
+    # converting one string array per column, each array is only as wide
+    # as the longest entry of its own column
+    categorical_cols = set(categorical_cols)
+    formatted_columns = [
+        _convert_column(
+            np.array([row[col_idx] for row in data_content], dtype=str),
+            dtype=dtype,
+            categorical=col_idx in categorical_cols,
+        )
+        for col_idx in range(len(data_content[0]))
+    ]
+
+    return formatted_columns
+
+
+def _format_types(
+    data_content: List[str],
+) -> List[Union[Union[float, int], str]]:
+    """Converts string contents to it's appropriate format.
+
+    Parameters
+    ----------
+    data_content : List[Any]
+        extracted contents from iris data file
+
+    Returns
+    -------
+    List[Union[Union[float, int], str]]
+        list of appropriately typed data entries.
+    """
+
+    # converting column-wise and transposing back into rows
+    formatted_columns = [
+        column.tolist() if isinstance(column, np.ndarray) else column
+        for column in _format_columns(data_content)
+    ]
+    formatted_data_entries = [list(row) for row in zip(*formatted_columns)]
+
+    return formatted_data_entries
+
+
+def _detect_compression(path_obj: Path) -> Optional[str]:
+    """Detects the compression of a file from its first bytes.
+
+    Parameters
+    ----------
+    path_obj : Path
+        path to file
+
+    Returns
+    -------
+    Optional[str]
+        "gzip", "bz2", "xz" or "zstd", or None if the file is not compressed
+    """
+
+    with open(path_obj, "rb") as infile:
+        magic = infile.read(max(map(len, _COMPRESSION_MAGIC.values())))
+
+    for compression, compression_magic in _COMPRESSION_MAGIC.items():
+        if magic.startswith(compression_magic):
+            return compression
+
+    return None
+
+
+def _open_data_file(
+    path_obj: Path, binary: bool = False
+) -> Union[TextIO, BinaryIO]:
+    """Opens a data file for reading. Compressed files are detected from
+    their first bytes and decompressed as a stream while they are read.
+
+    Parameters
+    ----------
+    path_obj : Path
+        path to file
+    binary : bool, optional
+        if True, the file is opened in binary mode, by default False
+
+    Returns
+    -------
+    Union[TextIO, BinaryIO]
+        opened file
+
+    Raises
+    ------
+    RuntimeError
+        Raised if a zstd compressed file is opened without zstandard
+        installed
+    """
+
+    compression = _detect_compression(path_obj)
+    if compression is None:
+        return open(path_obj, "rb" if binary else "r")
+
+    if compression == "gzip":
+        infile = gzip.open(path_obj, "rb")
+    elif compression == "bz2":
+        infile = bz2.open(path_obj, "rb")
+    elif compression == "xz":
+        infile = lzma.open(path_obj, "rb")
+    else:
+        if zstandard is None:
+            raise RuntimeError(
+                "zstandard is required to read zstd compressed files"
+            )
+        infile = io.BufferedReader(
+            zstandard.ZstdDecompressor().stream_reader(
+                open(path_obj, "rb"), closefd=True
+            )
+        )
+
+    if binary:
+        return infile
+    return io.TextIOWrapper(infile)
+
+
+def _compress_sketch(
+    values: np.ndarray, weights: np.ndarray, size: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Merges sorted weighted values into at most `size` values of about
+    equal weight. Each merged value is the weighted mean of its group.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        sorted values
+    weights : np.ndarray
+        weight of each value
+    size : int
+        maximum number of values kept
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        merged values and their weights
+    """
+
+    if len(values) <= size:
+        return values, weights
+
+    # groups are assigned from the rank at the middle of each value
+    cum_weights = np.cumsum(weights)
+    mid_ranks = (cum_weights - weights / 2) / cum_weights[-1]
+    group_idx = np.minimum((mid_ranks * size).astype(np.int64), size - 1)
+    starts = np.flatnonzero(np.diff(group_idx, prepend=-1))
+
+    merged_weights = np.add.reduceat(weights, starts)
+    merged_values = np.add.reduceat(values * weights, starts) / merged_weights
+
+    return merged_values, merged_weights
+
+
+def _count_data_rows(blocks: Iterable[np.ndarray]) -> int:
+    """Counts rows that contain data (at least one comma) across consecutive
+    blocks of a file. Rows are allowed to span multiple blocks.
+
+    Parameters
+    ----------
+    blocks : Iterable[np.ndarray]
+        consecutive uint8 blocks of the file
+
+    Returns
+    -------
+    int
+        number of rows with data
+    """
+
+    n_rows = 0
+    open_row_has_data = False
+    for block in blocks:
+        if block.size == 0:
+            continue
+
+        # checking which rows of the block have at least one comma. Each row
+        # spans from its start up to and including its newline
+        newline_idx = np.flatnonzero(block == ord("\n"))
+        row_starts = np.concatenate(([0], newline_idx + 1))
+        row_starts = row_starts[row_starts < block.size]
+        row_has_data = np.logical_or.reduceat(block == ord(","), row_starts)
+
+        # the first row of the block is a continuation of the unfinished row
+        # of the previous block
+        n_rows += np.count_nonzero(row_has_data)
+        if open_row_has_data and row_has_data[0]:
+            n_rows -= 1
+
+        # checking if the last (unfinished) row of the block has data
+        if block[-1] == ord("\n"):
+            open_row_has_data = False
+        elif newline_idx.size == 0:
+            open_row_has_data = open_row_has_data or bool(row_has_data[0])
+        else:
+            open_row_has_data = bool(row_has_data[-1])
+
+    return int(n_rows)
+
+
+def _count_mapped_data_rows(buffer: mmap.mmap) -> int:
+    """Counts rows that contain data in a memory-mapped file. Blocks are zero
+    copy views of the mapped file.
+
+    Parameters
+    ----------
+    buffer : mmap.mmap
+        memory-mapped file
+
+    Returns
+    -------
+    int
+        number of rows with data
+    """
+
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    blocks = (
+        data[start:start + _BLOCK_SIZE]
+        for start in range(0, data.size, _BLOCK_SIZE)
+    )
+    n_rows = _count_data_rows(blocks)
+
+    # releasing views so the memory-map can be closed
+    del blocks, data
+
+    return n_rows
+
+
+def hash_file(path_obj: Path) -> str:
+    """Computes the sha256 hash of a file's contents.
+
+    Parameters
+    ----------
+    path_obj : Path
+        path to file
+
+    Returns
+    -------
+    str
+        hexadecimal sha256 hash
+    """
+
+    file_hash = hashlib.sha256()
+    with open(path_obj, "rb") as infile:
+        for block in iter(partial(infile.read, _BLOCK_SIZE), b""):
+            file_hash.update(block)
+
+    return file_hash.hexdigest()
+
+
+def _write_cache_entry(
+    iris_df: pd.DataFrame,
+    cache_path: Path,
+    cache_info: Dict[str, str],
+    content_hash: str,
+) -> None:
+    """Stores a dataframe as an uncompressed Feather cache entry. The
+    information used to validate the entry is stored in the file's schema
+    metadata. Cache entries that cannot be written are skipped.
+
+    Parameters
+    ----------
+    iris_df : pd.DataFrame
+        typed iris dataframe
+    cache_path : Path
+        path of the cache entry
+    cache_info : Dict[str, str]
+        size and modification time of the data file, dtype, engine and
+        cache version
+    content_hash : str
+        content hash of the data file
+    """
+
+    # dataframes arrow cannot store (e.g. object columns mixing empty
+    # strings and floats) are returned uncached
+    try:
+        table = pa.Table.from_pandas(iris_df, preserve_index=False)
+    except (pa.ArrowException, TypeError, ValueError):
+        return None
+    metadata = {
+        f"dataproc_{key}": value
+        for key, value in {**cache_info, "hash": content_hash}.items()
+    }
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), **metadata}
+    )
+
+    # writing into a temporary file first so readers never see a partially
+    # written entry
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        feather.write_feather(table, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _freeze_data_frame(iris_df: pd.DataFrame) -> pd.DataFrame:
+    """Returns the dataframe with read-only numpy columns, writing to the
+    arrays of memoized dataframes raises instead of changing them"""
+
+    columns = {}
+    for col_name in iris_df.columns:
+        col = iris_df[col_name]
+        if isinstance(col.dtype, np.dtype):
+            col = col.to_numpy().view()
+            col.flags.writeable = False
+        columns[col_name] = col
+
+    return pd.DataFrame(columns, index=iris_df.index, copy=False)
+
+
+def _get_memo_view(iris_df: pd.DataFrame) -> pd.DataFrame:
+    """Returns a view of a memoized dataframe that callers cannot use to
+    change the memo. Numpy columns are shared read-only (see
+    `_freeze_data_frame()`), other columns are copied: pd.Categorical codes
+    are written in place by `.loc`/`.iloc` even when the numpy columns are
+    read-only. Categorical copies only hold the codes, the categories are
+    shared."""
+
+    memo_view = iris_df.copy(deep=False)
+    for col_name in memo_view.columns:
+        if not isinstance(memo_view[col_name].dtype, np.dtype):
+            memo_view[col_name] = memo_view[col_name].copy()
+
+    return memo_view
+
+
+def _evict_read_memo() -> None:
+    """Evicts least recently used dataframes from the read memo until their
+    total size fits _READ_MEMO_MAX_BYTES. Callers hold _READ_MEMO_LOCK."""
+
+    n_bytes = sum(entry_bytes for _, entry_bytes in _READ_MEMO.values())
+    while n_bytes > _READ_MEMO_MAX_BYTES:
+        _, (_, entry_bytes) = _READ_MEMO.popitem(last=False)
+        n_bytes -= entry_bytes
+        _READ_MEMO_STATS["evictions"] += 1
+
+
+def _memoize_data_frame(
+    memo_key: Tuple[str, int, int, str, str], iris_df: pd.DataFrame
+) -> pd.DataFrame:
+    """Adds a parsed data file to the read memo and returns a read-only view
+    of it. Memoized versions of the file with another modification time or
+    size are dropped, dataframes larger than the memo are not kept.
+
+    Parameters
+    ----------
+    memo_key : Tuple[str, int, int, str, str]
+        resolved path, mtime_ns, size, dtype and engine of the data file
+    iris_df : pd.DataFrame
+        parsed data file
+
+    Returns
+    -------
+    pd.DataFrame
+        read-only view of the memoized dataframe
+    """
+
+    iris_df = _freeze_data_frame(iris_df)
+    n_bytes = int(iris_df.memory_usage(deep=True).sum())
+
+    with _READ_MEMO_LOCK:
+        for cached_key in list(_READ_MEMO):
+            if cached_key[0] == memo_key[0] and cached_key[1:3] != (
+                memo_key[1:3]
+            ):
+                del _READ_MEMO[cached_key]
+        if n_bytes <= _READ_MEMO_MAX_BYTES:
+            _READ_MEMO[memo_key] = (iris_df, n_bytes)
+            _evict_read_memo()
+
+    return _get_memo_view(iris_df)
+
+
+def _read_data_file_task(
+    task: Tuple[str, Any, str]
+) -> Tuple[Optional[pd.DataFrame], Optional[Exception]]:
+    """Loads a single iris data file for `read_data_files()`. Errors raised
+    by `read_data_file()` are returned instead of raised so a failing file
+    does not stop the other files.
+
+    Parameters
+    ----------
+    task : Tuple[str, Any, str]
+        path, dtype and engine passed to `read_data_file()`
+
+    Returns
+    -------
+    Tuple[Optional[pd.DataFrame], Optional[Exception]]
+        loaded dataframe or the error raised while loading it
+    """
+
+    path, dtype, engine = task
+    try:
+        return read_data_file(path, dtype=dtype, engine=engine), None
+    except (FileNotFoundError, PermissionError, RuntimeError, ValueError) as e:
+        return None, e
+
+
+def _read_rows(infile: TextIO) -> Iterator[List[str]]:
+    """Splits rows from an opened iris data file into entries. Rows with no
+    data are skipped.
+
+    Parameters
+    ----------
+    infile : TextIO
+        opened iris data file
+
+    Yields
+    ------
+    Iterator[List[str]]
+        string entries of each row
+    """
+
+    for row in infile:
+        entries = row.rstrip("\n").split(",")
+
+        # remove rows with no data
+        if len(entries) == 1:
+            continue
+
+        yield entries
+
+
+def _entries_to_dataframe(
+    data_entries: List[List[str]],
+    start_idx: int = 0,
+    dtype: Any = np.float64,
+) -> pd.DataFrame:
+    """Converts string entries into a typed iris dataframe.
+
+    Parameters
+    ----------
+    data_entries : List[List[str]]
+        string entries of each row
+    start_idx : int, optional
+        index of the first row, by default 0
+    dtype : Any, optional
+        data type of float columns, by default np.float64
+
+    Returns
+    -------
+    pd.DataFrame
+        typed iris dataframe
+    """
+
+    # formatting entries to appropriate types
+    data_columns = _format_columns(
+        data_entries,
+        dtype=dtype,
+        categorical_cols=[
+            IRIS_COLUMNS.index(col_name) for col_name in _CATEGORICAL_COLUMNS
+        ],
+    )
+    if len(data_entries) > 0 and len(data_columns) != len(IRIS_COLUMNS):
+        raise ValueError(
+            f"{len(IRIS_COLUMNS)} columns passed, passed data had "
+            f"{len(data_columns)} columns"
+        )
+
+    # convert into pandas dataframe
+    iris_df = pd.DataFrame(
+        dict(zip(IRIS_COLUMNS, data_columns)),
+        columns=IRIS_COLUMNS,
+        index=pd.RangeIndex(start_idx, start_idx + len(data_entries)),
+    )
+
+    # float columns that were converted entry by entry
+    if dtype != np.float64:
+        float_cols = iris_df.select_dtypes(include=np.float64).columns
+        iris_df = iris_df.astype({col_name: dtype for col_name in float_cols})
+
+    return _categorize_columns(iris_df)
+
+
+def _read_data_chunks(
+    path_obj: Path, chunksize: int, dtype: Any = np.float64
+) -> Iterator[pd.DataFrame]:
+    """Reads iris data file in chunks of `chunksize` rows. Only one chunk is
+    held in memory at a time.
+
+    Parameters
+    ----------
+    path_obj : Path
+        path to datafile
+    chunksize : int
+        number of rows per chunk
+    dtype : Any, optional
+        data type of float columns, by default np.float64
+
+    Yields
+    ------
+    Iterator[pd.DataFrame]
+        typed iris dataframe chunks
+    """
+
+    try:
+        infile = _open_data_file(path_obj)
+    except PermissionError:
+        raise PermissionError(
+            f"You do not have permissions to read {path_obj} file"
+        )
+    except RuntimeError:
+        raise
+    except Exception:
+        raise RuntimeError("Unexpected error captured when loading file")
+
+    with infile:
+        rows = _read_rows(infile)
+        start_idx = 0
+        while True:
+
+            # reading next chunk of rows
+            try:
+                chunk_entries = list(islice(rows, chunksize))
+            except Exception:
+                raise RuntimeError(
+                    "Unexpected error captured when loading file"
+                )
+
+            if len(chunk_entries) == 0:
+                break
+
+            yield _entries_to_dataframe(
+                chunk_entries, start_idx=start_idx, dtype=dtype
+            )
+            start_idx += len(chunk_entries)
+
+
+def _categorize_columns(iris_df: pd.DataFrame) -> pd.DataFrame:
+    """Stores the string columns listed in `_CATEGORICAL_COLUMNS` as a
+    pd.Categorical with sorted categories, so every engine returns the same
+    categories.
+
+    Parameters
+    ----------
+    iris_df : pd.DataFrame
+        iris dataframe
+
+    Returns
+    -------
+    pd.DataFrame
+        iris dataframe with categorical columns
+    """
+
+    for col_name in _CATEGORICAL_COLUMNS:
+        column = iris_df[col_name]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            categories = column.cat.categories
+            if not categories.is_monotonic_increasing:
+                iris_df[col_name] = column.cat.reorder_categories(
+                    categories.sort_values()
+                )
+        elif pd.api.types.infer_dtype(column, skipna=True) == "string":
+            iris_df[col_name] = column.astype("category")
+
+    return iris_df
+
+
+def _table_to_pandas(table: pa.Table) -> pd.DataFrame:
+    """Converts a table parsed by the "pyarrow" engine into a dataframe.
+    String columns listed in `_CATEGORICAL_COLUMNS` are dictionary encoded
+    first, so they are converted to pd.Categorical without creating one
+    string per row.
+
+    Parameters
+    ----------
+    table : pa.Table
+        table with autogenerated column names
+
+    Returns
+    -------
+    pd.DataFrame
+        unnamed dataframe
+    """
+
+    for col_name in _CATEGORICAL_COLUMNS:
+        col_idx = IRIS_COLUMNS.index(col_name)
+        if col_idx >= table.num_columns:
+            continue
+        column = table.column(col_idx)
+        if pa.types.is_string(column.type):
+            table = table.set_column(
+                col_idx,
+                table.column_names[col_idx],
+                column.dictionary_encode(),
+            )
+
+    return table.to_pandas()
+
+
+def _clean_engine_chunk(
+    iris_df: pd.DataFrame, start_idx: int, dtype: np.dtype
+) -> pd.DataFrame:
+    """Formats a dataframe parsed by the "c" or "pyarrow" engines the same
+    way as the python engine. Columns are named after the iris columns, rows
+    with no delimiter (parsed with only the first column set) are removed,
+    rows are indexed from `start_idx`, float columns are cast to `dtype` and
+    species are stored as a pd.Categorical.
+
+    Parameters
+    ----------
+    iris_df : pd.DataFrame
+        dataframe parsed by an engine
+    start_idx : int
+        index of the first row
+    dtype : np.dtype
+        data type of float columns
+
+    Returns
+    -------
+    pd.DataFrame
+        typed iris dataframe
+
+    Raises
+    ------
+    ValueError
+        Raised if the number of columns does not match the iris columns
+    """
+
+    # pandas uses the leading entries of rows with more entries than column
+    # names as the index
+    n_columns = iris_df.shape[1]
+    if not isinstance(iris_df.index, pd.RangeIndex):
+        n_columns += iris_df.index.nlevels
+    if n_columns != len(IRIS_COLUMNS):
+        raise ValueError(
+            f"{len(IRIS_COLUMNS)} columns passed, passed data had "
+            f"{n_columns} columns"
+        )
+    iris_df.columns = IRIS_COLUMNS
+
+    # removing rows with no data, columns they held strings in (e.g. title
+    # lines) are converted again like the python engine
+    no_data = iris_df[IRIS_COLUMNS[1:]].isna().all(axis=1)
+    if no_data.any():
+        iris_df = iris_df[~no_data.to_numpy()].copy()
+        for col_name in IRIS_COLUMNS:
+            column = iris_df[col_name]
+            if col_name in _CATEGORICAL_COLUMNS or (
+                pd.api.types.is_numeric_dtype(column.dtype)
+            ):
+                continue
+            iris_df[col_name] = _convert_column(
+                column.to_numpy(dtype=str), dtype=np.float64
+            )
+    iris_df.index = pd.RangeIndex(start_idx, start_idx + len(iris_df))
+
+    # categorical columns parsed by the "c" engine hold strings, columns of
+    # numbers or bools are converted back like the other columns
+    for col_name in _CATEGORICAL_COLUMNS:
+        column = iris_df[col_name]
+        if not isinstance(column.dtype, pd.CategoricalDtype):
+            continue
+        converted = [
+            _format_entry(str(entry)) for entry in column.cat.categories
+        ]
+        if all(isinstance(entry, str) for entry in converted):
+            continue
+        codes = column.cat.codes.to_numpy()
+        values = np.array(converted + [np.nan], dtype=object)[codes]
+        iris_df[col_name] = pd.Series(
+            values, index=iris_df.index
+        ).infer_objects()
+
+    # casting float columns
+    if dtype != np.float64:
+        float_cols = iris_df.select_dtypes(include=np.float64).columns
+        iris_df = iris_df.astype({col_name: dtype for col_name in float_cols})
+
+    return _categorize_columns(iris_df)
+
+
+def _skip_no_data_row(row: Any) -> str:
+    """Invalid row handler of the "pyarrow" engine, rows with no delimiter
+    (e.g. whitespace or title lines) are skipped like the python engine
+
+    Parameters
+    ----------
+    row : Any
+        pyarrow.csv.InvalidRow
+
+    Returns
+    -------
+    str
+        "skip" for rows with no delimiter, "error" otherwise
+    """
+
+    return "skip" if row.actual_columns == 1 else "error"
+
+
+def _read_engine_chunks(
+    path_obj: Path, engine: str, chunksize: Optional[int]
+) -> Iterator[pd.DataFrame]:
+    """Parses iris data file with the "c" (pandas.read_csv) or "pyarrow"
+    (pyarrow.csv) engines. Both engines parse 5 columns. Rows with no
+    delimiter are skipped by the "pyarrow" engine and parsed with only the
+    first column set by the "c" engine, which keeps all entries but empty
+    ones as strings.
+
+    Parameters
+    ----------
+    path_obj : Path
+        path to datafile
+    engine : str
+        "c" or "pyarrow"
+    chunksize : Optional[int]
+        number of rows per chunk. If None, the whole file is returned as a
+        single chunk
+
+    Yields
+    ------
+    Iterator[pd.DataFrame]
+        unnamed dataframe chunks, see `_clean_engine_chunk()`
+    """
+
+    # compressed files are decoded as a stream and passed to the engines
+    with ExitStack() as stack:
+        source = path_obj
+        if _detect_compression(path_obj) is not None:
+            source = stack.enter_context(
+                _open_data_file(path_obj, binary=True)
+            )
+
+        # categorical columns are parsed as pd.Categorical, without creating
+        # one string per row
+        if engine == "c":
+            reader = pd.read_csv(
+                source,
+                header=None,
+                names=range(len(IRIS_COLUMNS)),
+                engine="c",
+                skip_blank_lines=True,
+                keep_default_na=False,
+                na_values=[""],
+                chunksize=chunksize,
+                dtype={
+                    IRIS_COLUMNS.index(col_name): "category"
+                    for col_name in _CATEGORICAL_COLUMNS
+                },
+            )
+            if chunksize is None:
+                yield reader
+            else:
+                with reader:
+                    yield from reader
+            return None
+
+        # pyarrow engine: parsed in parallel, batches are regrouped into
+        # chunks
+        read_options = pa_csv.ReadOptions(
+            column_names=[str(col_idx) for col_idx in range(len(IRIS_COLUMNS))]
+        )
+        parse_options = pa_csv.ParseOptions(
+            ignore_empty_lines=True, invalid_row_handler=_skip_no_data_row
+        )
+        if chunksize is None:
+            yield _table_to_pandas(
+                pa_csv.read_csv(
+                    source,
+                    read_options=read_options,
+                    parse_options=parse_options,
+                )
+            )
+            return None
+
+        reader = pa_csv.open_csv(
+            source, read_options=read_options, parse_options=parse_options
+        )
+        pending_table = None
+        for batch in reader:
+            batch_table = pa.Table.from_batches([batch])
+            if pending_table is not None:
+                batch_table = pa.concat_tables([pending_table, batch_table])
+            while batch_table.num_rows >= chunksize:
+                yield _table_to_pandas(batch_table.slice(0, chunksize))
+                batch_table = batch_table.slice(chunksize)
+            pending_table = batch_table
+
+        if pending_table is not None and pending_table.num_rows > 0:
+            yield _table_to_pandas(pending_table)
+
+
+def _read_engine_data(
+    path_obj: Path, engine: str, chunksize: Optional[int], dtype: np.dtype
+) -> Iterator[pd.DataFrame]:
+    """Reads iris data file with the "c" or "pyarrow" engines and raises the
+    same exceptions as the python engine.
+
+    Parameters
+    ----------
+    path_obj : Path
+        path to datafile
+    engine : str
+        "c" or "pyarrow"
+    chunksize : Optional[int]
+        number of rows per chunk. If None, the whole file is returned as a
+        single chunk
+    dtype : np.dtype
+        data type of float columns
+
+    Yields
+    ------
+    Iterator[pd.DataFrame]
+        typed iris dataframe chunks
+
+    Raises
+    ------
+    PermissionError
+        Raised if you do not have read permissions.
+    ValueError
+        Raised if the file cannot be parsed or the number of columns does
+        not match the iris columns
+    RuntimeError
+        raised if an unexpected error captured
+    """
+
+    start_idx = 0
+    chunks = _read_engine_chunks(path_obj, engine, chunksize)
+    while True:
+        try:
+            iris_df = next(chunks)
+        except StopIteration:
+            break
+        except PermissionError:
+            raise PermissionError(
+                f"You do not have permissions to read {path_obj} file"
+            )
+        except RuntimeError:
+            raise
+        except ValueError:
+
+            # files with no data cannot be parsed by pandas and pyarrow
+            if start_idx > 0 or get_file_dimensions(path_obj)[0] > 0:
+                raise
+            if chunksize is None:
+                yield pd.DataFrame(columns=IRIS_COLUMNS)
+            break
+        except Exception:
+            raise RuntimeError("Unexpected error captured when loading file")
+
+        iris_df = _clean_engine_chunk(iris_df, start_idx, dtype)
+        start_idx += len(iris_df)
+
+        # chunks with no data are skipped, files with no data are returned
+        # with untyped columns like the python engine
+        if len(iris_df) == 0:
+            if chunksize is not None:
+                continue
+            iris_df = pd.DataFrame(columns=IRIS_COLUMNS)
+
+        yield iris_df
+
+
+def read_data_file(
+    path: str,
+    chunksize: Optional[int] = None,
+    dtype: Any = np.float64,
+    engine: str = "python",
+    memoize: bool = False,
+) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+    """Loads contents from iris data file as a dataframe. gzip, bz2, xz and
+    zstd (requires zstandard) compressed files are detected from their first
+    bytes and decompressed as a stream while they are parsed. Species are
+    stored as a pd.Categorical, chunks only hold the species found in each
+    chunk as categories.
+
+    Parameters
+    ----------
+    path : str
+        path to datafile
+    chunksize : Optional[int], optional
+        if provided, returns an iterator of dataframes containing `chunksize`
+        rows each instead of loading the whole file, by default None
+    dtype : Any, optional
+        data type of float columns, either np.float32 or np.float64, by
+        default np.float64
+    engine : str, optional
+        parser used to read the file. "python" splits rows in python, "c"
+        uses pandas.read_csv and "pyarrow" uses the multithreaded
+        pyarrow.csv reader (requires pyarrow). All engines skip rows with no
+        data, but the "c" and "pyarrow" engines read empty entries as NaN
+        instead of empty strings and the "pyarrow" engine requires all rows
+        to have the same number of entries, by default "python"
+    memoize : bool, optional
+        keeps the parsed file in an in-process memo keyed by resolved path,
+        modification time and size. Later calls on the unchanged file return
+        a read-only view of the memoized dataframe instead of parsing it
+        again. The memo evicts least recently used files above a total
+        size, see `set_read_memo_budget()` and `get_read_memo_stats()`, by
+        default False
+
+    Returns
+    -------
+    Union[pd.DataFrame, Iterator[pd.DataFrame]]
+        contents within data file as a dataframe, or an iterator of dataframe
+        chunks if `chunksize` is provided
+
+    Raises
+    ------
+    FileNotFoundError:
+        Raised when a provided path points to a non-existing file
+    PermissionError
+        Raised if you do not have read permissions.
+    RuntimeError
+        raised if an unexpected error captured
+    TypeError
+        Raised if chunksize is not an integer
+    ValueError
+        Raised if chunksize is lower than 1, dtype is not supported, an
+        unsupported engine is provided, memoize is used with chunksize or
+        the number of columns in the file does not match the iris columns
+    ImportError
+        Raised if the pyarrow engine is used without pyarrow installed
+    """
+
+    path_obj = Path(path)
+    if not path_obj.is_file():
+        raise FileNotFoundError(f"{path} does not exist.")
+    dtype = _get_matrix_dtype(dtype)
+    if engine not in _READ_ENGINES:
+        raise ValueError(
+            f"engine must be one of {_READ_ENGINES}, not {engine}"
+        )
+    if engine == "pyarrow" and pa_csv is None:
+        raise ImportError("pyarrow engine requires pyarrow to be installed")
+
+    # checking chunk size
+    if chunksize is not None:
+        if not isinstance(chunksize, int):
+            raise TypeError(
+                f"chunksize must be an integer not {type(chunksize)}"
+            )
+        if chunksize < 1:
+            raise ValueError("chunksize must be larger than 0")
+        if memoize:
+            raise ValueError("memoize cannot be used with chunksize")
+
+    # memoized files are returned without parsing them again
+    if memoize:
+        file_stat = path_obj.stat()
+        memo_key = (
+            str(path_obj.resolve()),
+            file_stat.st_mtime_ns,
+            file_stat.st_size,
+            dtype.name,
+            engine,
+        )
+        with _READ_MEMO_LOCK:
+            if memo_key in _READ_MEMO:
+                _READ_MEMO_STATS["hits"] += 1
+                _READ_MEMO.move_to_end(memo_key)
+                return _get_memo_view(_READ_MEMO[memo_key][0])
+            _READ_MEMO_STATS["misses"] += 1
+
+    # reading file with pandas or pyarrow
+    if engine != "python":
+        chunks = _read_engine_data(path_obj, engine, chunksize, dtype)
+        if chunksize is not None:
+            return chunks
+        iris_df = next(chunks)
+        if memoize:
+            return _memoize_data_frame(memo_key, iris_df)
+        return iris_df
+
+    # reading file in chunks
+    if chunksize is not None:
+        return _read_data_chunks(path_obj, chunksize, dtype=dtype)
+
+    try:
+        with _open_data_file(path_obj) as infile:
+            data_entries = list(_read_rows(infile))
+
+    except PermissionError:
+        raise PermissionError(
+            f"You do not have permissions to read {path} file"
+        )
+    except RuntimeError:
+        raise
+    except Exception:
+        raise RuntimeError("Unexpected error captured when loading file")
+
+    iris_df = _entries_to_dataframe(data_entries, dtype=dtype)
+    if memoize:
+        return _memoize_data_frame(memo_key, iris_df)
+    return iris_df
+
+
+def set_read_memo_budget(max_bytes: int) -> None:
+    """Sets the total size of the dataframes kept by the in-process memo of
+    `read_data_file(memoize=True)`. Least recently used dataframes are
+    evicted until the memo fits the new size.
+
+    Parameters
+    ----------
+    max_bytes : int
+        maximum number of bytes used by memoized dataframes, measured with
+        `DataFrame.memory_usage(deep=True)`. 0 disables the memo
+
+    Raises
+    ------
+    TypeError
+        Raised if max_bytes is not an integer
+    ValueError
+        Raised if max_bytes is negative
+    """
+
+    global _READ_MEMO_MAX_BYTES
+    if not isinstance(max_bytes, int):
+        raise TypeError(f"max_bytes must be an integer not {type(max_bytes)}")
+    if max_bytes < 0:
+        raise ValueError("max_bytes must not be negative")
+
+    with _READ_MEMO_LOCK:
+        _READ_MEMO_MAX_BYTES = max_bytes
+        _evict_read_memo()
+
+
+def get_read_memo_stats() -> Dict[str, int]:
+    """Reports the counters of the in-process memo of
+    `read_data_file(memoize=True)`.
+
+    Returns
+    -------
+    Dict[str, int]
+        "hits", "misses" and "evictions" since the memo was last cleared,
+        number of memoized "entries", their total "bytes" and the
+        "max_bytes" budget
+    """
+
+    with _READ_MEMO_LOCK:
+        return {
+            **_READ_MEMO_STATS,
+            "entries": len(_READ_MEMO),
+            "bytes": sum(n_bytes for _, n_bytes in _READ_MEMO.values()),
+            "max_bytes": _READ_MEMO_MAX_BYTES,
+        }
+
+
+def clear_read_memo() -> None:
+    """Removes all dataframes from the in-process memo of
+    `read_data_file(memoize=True)` and resets its counters"""
+
+    with _READ_MEMO_LOCK:
+        _READ_MEMO.clear()
+        for counter in _READ_MEMO_STATS:
+            _READ_MEMO_STATS[counter] = 0
+
+
+def read_cached_data_file(
+    path: str,
+    cache_dir: Optional[str] = None,
+    dtype: Any = np.float64,
+    engine: str = "python",
+) -> pd.DataFrame:
+    """Loads contents from iris data file through an on-disk columnar cache.
+    The first load parses the file with `read_data_file()` and stores the
+    typed dataframe as an uncompressed Feather file. Later loads memory-map
+    the Feather file instead of parsing. A cache entry is used only if it
+    was parsed with the same dtype, engine and cache version, and if the
+    size and modification time of the data file are unchanged or its
+    content hash still matches. Dataframes that cannot be stored as Feather
+    files (e.g. columns mixing empty fields and numbers) are not cached.
+
+    Requires pyarrow, if it is not installed the file is parsed on every
+    call.
+
+    Parameters
+    ----------
+    path : str
+        path to datafile
+    cache_dir : Optional[str], optional
+        directory where cache entries are stored. If None, entries are stored
+        in a ".dataproc_cache" directory next to the data file, by default
+        None
+    dtype : Any, optional
+        data type of float columns, either np.float32 or np.float64, by
+        default np.float64
+    engine : str, optional
+        parser used when the file is not cached, see `read_data_file()`, by
+        default "python"
+
+    Returns
+    -------
+    pd.DataFrame
+        contents within data file as a dataframe
+
+    Raises
+    ------
+    FileNotFoundError:
+        Raised when a provided path points to a non-existing file
+    PermissionError
+        Raised if you do not have read permissions.
+    RuntimeError
+        raised if an unexpected error captured
+    ValueError
+        Raised if dtype or engine is not supported
+    """
+
+    path_obj = Path(path)
+    if not path_obj.is_file():
+        raise FileNotFoundError(f"{path} does not exist.")
+    dtype = _get_matrix_dtype(dtype)
+
+    if feather is None:
+        return read_data_file(path, dtype=dtype, engine=engine)
+
+    if engine not in _READ_ENGINES:
+        raise ValueError(
+            f"engine must be one of {_READ_ENGINES}, not {engine}"
+        )
+
+    # cache entries are named after the data file's absolute path, the
+    # engine and the cache version
+    path_obj = path_obj.resolve()
+    if cache_dir is None:
+        cache_dir = path_obj.parent / _CACHE_DIR_NAME
+    path_hash = hashlib.sha256(str(path_obj).encode("utf-8")).hexdigest()
+    cache_path = Path(cache_dir) / (
+        f"{path_obj.stem}-{path_hash[:16]}-{engine}-v{_CACHE_VERSION}.feather"
+    )
+
+    # information used to check if a cache entry is still valid, entries of
+    # an unchanged file are matched on all of it, entries of a touched file
+    # on everything but its size and modification time
+    file_stats = path_obj.stat()
+    parse_info = {
+        "dtype": dtype.name,
+        "engine": engine,
+        "version": _CACHE_VERSION,
+    }
+    cache_info = {
+        "size": str(file_stats.st_size),
+        "mtime_ns": str(file_stats.st_mtime_ns),
+        **parse_info,
+    }
+
+    # loading cache entry
+    content_hash = None
+    if cache_path.is_file():
+        try:
+            cached_table = feather.read_table(cache_path, memory_map=True)
+            cached_info = {
+                key.decode("utf-8"): value.decode("utf-8")
+                for key, value in cached_table.schema.metadata.items()
+                if key.startswith(b"dataproc_")
+            }
+        except Exception:
+            cached_table = None
+            cached_info = {}
+
+        # unchanged file
+        if all(
+            cached_info.get(f"dataproc_{key}") == value
+            for key, value in cache_info.items()
+        ):
+            return cached_table.to_pandas()
+
+        # file was touched but its contents are the same
+        content_hash = hash_file(path_obj)
+        if cached_info.get("dataproc_hash") == content_hash and all(
+            cached_info.get(f"dataproc_{key}") == value
+            for key, value in parse_info.items()
+        ):
+            iris_df = cached_table.to_pandas()
+            _write_cache_entry(iris_df, cache_path, cache_info, content_hash)
+            return iris_df
+
+    # parsing file and storing cache entry
+    iris_df = read_data_file(path, dtype=dtype, engine=engine)
+    if content_hash is None:
+        content_hash = hash_file(path_obj)
+    _write_cache_entry(iris_df, cache_path, cache_info, content_hash)
+
+    return iris_df
+
+
+def read_data_files(
+    paths: Iterable[str],
+    workers: Optional[int] = None,
+    dtype: Any = np.float64,
+    engine: str = "python",
+) -> Tuple[pd.DataFrame, Dict[str, Exception]]:
+    """Loads multiple iris data files in parallel across a process pool and
+    concatenates them into a single dataframe. Files are concatenated in the
+    order they are provided and a "source_file" column records the file each
+    row comes from. Files that cannot be loaded are skipped and their errors
+    are returned instead of stopping the whole batch.
+
+    Parameters
+    ----------
+    paths : Iterable[str]
+        paths to datafiles
+    workers : Optional[int], optional
+        number of processes used to load the files. If 1, files are loaded in
+        the current process. If None, the number of CPUs is used, by default
+        None
+    dtype : Any, optional
+        data type of float columns, either np.float32 or np.float64, by
+        default np.float64
+    engine : str, optional
+        parser used to read each file, see `read_data_file()`, by default
+        "python"
+
+    Returns
+    -------
+    Tuple[pd.DataFrame, Dict[str, Exception]]
+        concatenated dataframe and a dictionary that maps each file that
+        could not be loaded to its error (FileNotFoundError, PermissionError,
+        RuntimeError or ValueError, same as `read_data_file()`)
+
+    Raises
+    ------
+    TypeError
+        Raised if workers is not an integer
+    ValueError
+        Raised if workers is lower than 1, dtype is not supported or an
+        unsupported engine is provided
+    """
+
+    paths = [str(path) for path in paths]
+    dtype = _get_matrix_dtype(dtype)
+    if engine not in _READ_ENGINES:
+        raise ValueError(
+            f"engine must be one of {_READ_ENGINES}, not {engine}"
+        )
+    if workers is None:
+        workers = os.cpu_count() or 1
+    elif not isinstance(workers, int):
+        raise TypeError(f"workers must be an integer not {type(workers)}")
+    elif workers < 1:
+        raise ValueError("workers must be larger than 0")
+
+    # loading files, results are returned in the same order as paths
+    tasks = [(path, dtype, engine) for path in paths]
+    if workers == 1 or len(paths) <= 1:
+        results = [_read_data_file_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_read_data_file_task, tasks))
+
+    # collecting loaded files and errors
+    iris_dfs = []
+    errors = {}
+    for path, (iris_df, error) in zip(paths, results):
+        if error is not None:
+            errors[path] = error
+            continue
+        iris_df["source_file"] = path
+        iris_dfs.append(iris_df)
+
+    if len(iris_dfs) == 0:
+        iris_df = pd.DataFrame(columns=IRIS_COLUMNS + ["source_file"])
+    else:
+        iris_df = _categorize_columns(pd.concat(iris_dfs, ignore_index=True))
+    iris_df["source_file"] = pd.Categorical(
+        iris_df["source_file"], categories=list(dict.fromkeys(paths))
+    )
+
+    return iris_df, errors
+
+
+def get_memory_usage(iris_df: pd.DataFrame) -> Dict[str, int]:
+    """Reports the memory used by an iris dataframe and the memory saved by
+    storing columns as pd.Categorical instead of one python string per row.
+
+    Parameters
+    ----------
+    iris_df : pd.DataFrame
+        iris dataframe, see `read_data_file()`
+
+    Returns
+    -------
+    Dict[str, int]
+        "bytes" used by the dataframe, "object_bytes" the dataframe would use
+        with categorical columns stored as python objects and "saved_bytes"
+        the difference between both. Strings are included in all counts.
+
+    Raises
+    ------
+    TypeError
+        raised if iris_df is not a data frame
+    """
+
+    if not isinstance(iris_df, pd.DataFrame):
+        raise TypeError("Iris data must be a pandas dataframe")
+
+    categorical_cols = [
+        col_name
+        for col_name, col_dtype in iris_df.dtypes.items()
+        if isinstance(col_dtype, pd.CategoricalDtype)
+    ]
+    object_df = iris_df.astype(
+        {col_name: object for col_name in categorical_cols}
+    )
+
+    n_bytes = int(iris_df.memory_usage(deep=True).sum())
+    n_object_bytes = int(object_df.memory_usage(deep=True).sum())
+
+    return {
+        "bytes": n_bytes,
+        "object_bytes": n_object_bytes,
+        "saved_bytes": n_object_bytes - n_bytes,
+    }
+
+
+def get_species_index(
+    iris_df: pd.DataFrame,
+) -> Tuple[np.ndarray, Dict[Any, slice]]:
+    """Builds an index of the rows of each species. Rows are stably sorted by
+    species, so the rows of each species are contiguous and can be taken
+    from the sorted columns as slices without copying them.
+
+    Parameters
+    ----------
+    iris_df : pd.DataFrame
+        iris dataframe, see `read_data_file()`
+
+    Returns
+    -------
+    Tuple[np.ndarray, Dict[Any, slice]]
+        row positions of the dataframe sorted by species and a dictionary that
+        maps each species, in order of appearance, to its slice of the sorted
+        rows. Rows with no species are left out.
+
+    Raises
+    ------
+    TypeError
+        raised if iris_df is not a data frame
+    """
+
+    if not isinstance(iris_df, pd.DataFrame):
+        raise TypeError("Iris data must be a pandas dataframe")
+
+    # species codes in order of appearance, missing species are coded as -1
+    codes, species = pd.factorize(iris_df["iris_species"])
+    order = np.argsort(codes, kind="stable")
+    order = order[np.count_nonzero(codes < 0):]
+
+    # bounds of each species within the sorted rows
+    counts = np.bincount(codes[codes >= 0], minlength=len(species))
+    bounds = np.concatenate([[0], np.cumsum(counts)])
+
+    species_slices = {
+        species_name: slice(int(start), int(stop))
+        for species_name, start, stop in zip(
+            species.tolist(), bounds[:-1], bounds[1:]
+        )
+    }
+
+    return order, species_slices
+
+
+def get_quantile_sketch(
+    values: Iterable[float],
+    size: int = _SKETCH_SIZE,
+    n_extremes: int = _SKETCH_EXTREMES,
+) -> Dict[str, Any]:
+    """Summarizes values into a quantile sketch of bounded size. Sketches of
+    different chunks or files can be merged with `merge_quantile_sketches()`
+    so quantiles of data that does not fit in memory can be estimated one
+    chunk at a time. Quantiles are exact while the sketch holds fewer than
+    `size` values. NaN values are ignored.
+
+    Parameters
+    ----------
+    values : Iterable[float]
+        values to summarize
+    size : int, optional
+        maximum number of weighted values kept, by default 1024
+    n_extremes : int, optional
+        number of lowest and highest values kept exactly, by default 128
+
+    Returns
+    -------
+    Dict[str, Any]
+        sketch with the sorted weighted "values" and their "weights", the
+        "count", "sum", "min" and "max" of the values and the "lowest" and
+        "highest" values
+    """
+
+    values = np.asarray(values, dtype=np.float64).ravel()
+    values = np.sort(values[~np.isnan(values)])
+
+    sketch_values, sketch_weights = _compress_sketch(
+        values, np.ones(len(values)), size
+    )
+
+    return {
+        "values": sketch_values,
+        "weights": sketch_weights,
+        "count": len(values),
+        "sum": float(values.sum()),
+        "min": float(values[0]) if len(values) > 0 else np.nan,
+        "max": float(values[-1]) if len(values) > 0 else np.nan,
+        "lowest": values[:n_extremes].copy(),
+        "highest": values[max(len(values) - n_extremes, 0):].copy(),
+    }
+
+
+def merge_quantile_sketches(
+    sketches: Iterable[Dict[str, Any]],
+    size: int = _SKETCH_SIZE,
+    n_extremes: int = _SKETCH_EXTREMES,
+) -> Dict[str, Any]:
+    """Merges quantile sketches, see `get_quantile_sketch()`.
+
+    Parameters
+    ----------
+    sketches : Iterable[Dict[str, Any]]
+        sketches to merge
+    size : int, optional
+        maximum number of weighted values kept, by default 1024
+    n_extremes : int, optional
+        number of lowest and highest values kept exactly, by default 128
+
+    Returns
+    -------
+    Dict[str, Any]
+        merged sketch
+    """
+
+    sketches = list(sketches)
+    if len(sketches) == 0:
+        return get_quantile_sketch([], size=size, n_extremes=n_extremes)
+
+    values = np.concatenate([sketch["values"] for sketch in sketches])
+    weights = np.concatenate([sketch["weights"] for sketch in sketches])
+    order = np.argsort(values, kind="stable")
+    merged_values, merged_weights = _compress_sketch(
+        values[order], weights[order], size
+    )
+
+    lowest = np.sort(np.concatenate([sk["lowest"] for sk in sketches]))
+    highest = np.sort(np.concatenate([sk["highest"] for sk in sketches]))
+    non_empty = [sketch for sketch in sketches if sketch["count"] > 0]
+
+    return {
+        "values": merged_values,
+        "weights": merged_weights,
+        "count": sum(sketch["count"] for sketch in sketches),
+        "sum": sum(sketch["sum"] for sketch in sketches),
+        "min": min((sketch["min"] for sketch in non_empty), default=np.nan),
+        "max": max((sketch["max"] for sketch in non_empty), default=np.nan),
+        "lowest": lowest[:n_extremes],
+        "highest": highest[max(len(highest) - n_extremes, 0):],
+    }
+
+
+def get_sketch_quantiles(
+    sketch: Dict[str, Any], quantiles: Iterable[float]
+) -> np.ndarray:
+    """Estimates quantiles from a quantile sketch. Values are interpolated
+    linearly between ranks the same way as `np.quantile()`, so quantiles of
+    sketches that were not compressed are exact.
+
+    Parameters
+    ----------
+    sketch : Dict[str, Any]
+        quantile sketch, see `get_quantile_sketch()`
+    quantiles : Iterable[float]
+        quantiles to estimate, between 0 and 1
+
+    Returns
+    -------
+    np.ndarray
+        estimated quantiles, NaN if the sketch is empty
+    """
+
+    quantiles = np.asarray(quantiles, dtype=np.float64)
+    if sketch["count"] == 0:
+        return np.full(quantiles.shape, np.nan)
+
+    # each value is placed at the (0-based) rank of its middle, the minimum
+    # and maximum are placed at the first and last ranks
+    weights = sketch["weights"]
+    mid_ranks = np.cumsum(weights) - weights / 2 - 0.5
+    last_rank = sketch["count"] - 1
+    ranks = np.concatenate([[0], mid_ranks, [last_rank]])
+    values = np.concatenate(
+        [[sketch["min"]], sketch["values"], [sketch["max"]]]
+    )
+
+    return np.interp(quantiles * last_rank, ranks, values)
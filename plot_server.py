@@ -0,0 +1,590 @@
+"""
+Local server that plots iris data files on request
+
+The server keeps matplotlib and pandas loaded, keeps parsed iris data files
+in memory and renders plots in a fixed pool of worker processes, so each
+request only pays for the plotting. Only iris data files under a root
+directory are served, request paths are resolved relative to it.
+
+* PlotServer - asyncio HTTP server (TCP or Unix socket) with an LRU cache of
+parsed iris data files
+
+Routes (GET only):
+
+* /plot/{boxplot,scatter,merged}?path=...[&format=..][&dpi=..][&fast_png=1]
+[&density_threshold=..] - image of an iris data file
+
+* /data?path=... - number of rows, columns and memory usage of an iris data
+file
+
+* /stats - cache hits, misses and evictions
+
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import multiprocessing
+import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from urllib.parse import parse_qs
+from urllib.parse import unquote
+from urllib.parse import urlsplit
+
+import data_processor as dp
+import plotter as pl
+
+pd = dp.LazyModule("pandas")
+plt = dp.LazyModule("matplotlib.pyplot")
+
+
+class PlotServer:
+    """Plots iris data files on request. Parsed iris data files are kept in
+    an LRU cache keyed by resolved file path and modification time, plots
+    are rendered by a bounded pool of worker processes.
+
+    Parameters
+    ----------
+    root : str
+        directory of the served iris data files. Request paths are resolved
+        relative to it and paths resolving outside of it are rejected
+    cache_size : int, optional
+        number of parsed iris data files kept in memory, by default 8
+    jobs : int, optional
+        number of worker processes rendering plots, by default 1
+    density_threshold : Optional[int], optional
+        default number of rows above which the scatter plot is drawn as a
+        density plot, see `pl.get_plot_data()`, by default None
+
+    Raises
+    ------
+    NotADirectoryError
+        raised if root is not a directory
+    ValueError
+        raised if cache_size or jobs is not positive
+    """
+
+    def __init__(
+        self,
+        root: str,
+        cache_size: int = 8,
+        jobs: int = 1,
+        density_threshold: Optional[int] = None,
+    ) -> None:
+
+        if cache_size < 1:
+            raise ValueError(
+                f"cache_size must be a positive integer, not {cache_size}"
+            )
+        if jobs < 1:
+            raise ValueError(f"jobs must be a positive integer, not {jobs}")
+        if not Path(root).is_dir():
+            raise NotADirectoryError(f"{root} is not a directory")
+
+        self.root = Path(root).resolve()
+        self.cache_size = cache_size
+        self.jobs = jobs
+        self.density_threshold = density_threshold
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+        # (resolved path, mtime) -> task parsing the iris data file, requests
+        # for a file that is being parsed wait for the same task
+        self._cache = OrderedDict()
+        self._executor = None
+        self._render_slots = None
+
+    def start_workers(self) -> None:
+        """Starts the worker processes and loads matplotlib in them. Forked
+        workers are started before the event loop runs any threads."""
+
+        if self._executor is not None:
+            return None
+
+        if "fork" in multiprocessing.get_all_start_methods():
+            mp_context = multiprocessing.get_context("fork")
+        else:
+            mp_context = multiprocessing.get_context()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.jobs,
+            mp_context=mp_context,
+            initializer=_init_render_worker,
+        )
+        for future in [
+            self._executor.submit(os.getpid) for _ in range(self.jobs)
+        ]:
+            future.result()
+
+    def close(self) -> None:
+        """Shuts down the worker processes"""
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def resolve_path(self, path: str) -> Path:
+        """Resolves the path of an iris data file relative to the root
+        directory, symbolic links included.
+
+        Parameters
+        ----------
+        path : str
+            path to iris data file, relative to the root directory
+
+        Returns
+        -------
+        Path
+            resolved path
+
+        Raises
+        ------
+        PermissionError
+            raised if the path resolves outside of the root directory
+        """
+
+        path_obj = (self.root / path).resolve()
+        if not path_obj.is_relative_to(self.root):
+            raise PermissionError(f"{path} is outside of the served directory")
+
+        return path_obj
+
+    async def get_iris_data(self, path: str) -> pd.DataFrame:
+        """Returns the parsed iris data file, see `dp.read_data_file()`.
+        Files are parsed once per modification time.
+
+        Parameters
+        ----------
+        path : str
+            path to iris data file, relative to the root directory
+
+        Returns
+        -------
+        pd.DataFrame
+            iris data
+
+        Raises
+        ------
+        FileNotFoundError
+            raised if the iris data file does not exist
+        PermissionError
+            raised if the path resolves outside of the root directory
+        """
+
+        path_obj = self.resolve_path(path)
+        if not path_obj.is_file():
+            raise FileNotFoundError(f"{path} does not exist")
+        key = (str(path_obj), path_obj.stat().st_mtime_ns)
+
+        if key in self._cache:
+            self.stats["hits"] += 1
+            self._cache.move_to_end(key)
+            return await asyncio.shield(self._cache[key])
+
+        # previous versions of a modified file are dropped
+        self.stats["misses"] += 1
+        for cached_key in list(self._cache):
+            if cached_key[0] == key[0]:
+                del self._cache[cached_key]
+
+        loop = asyncio.get_running_loop()
+        task = asyncio.ensure_future(
+            loop.run_in_executor(None, dp.read_data_file, str(path_obj))
+        )
+        self._cache[key] = task
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+            self.stats["evictions"] += 1
+
+        # shielded, so a cancelled request does not cancel the parsing other
+        # requests wait for
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            if self._cache.get(key) is task:
+                del self._cache[key]
+            raise
+
+    async def render(
+        self,
+        path: str,
+        plot_kind: str,
+        save_options: Optional[Dict[str, Any]] = None,
+        density_threshold: Optional[int] = None,
+    ) -> bytes:
+        """Renders a plot of an iris data file in a worker process.
+
+        Parameters
+        ----------
+        path : str
+            path to iris data file, relative to the root directory
+        plot_kind : str
+            plot rendered, one of `pl.PLOT_KINDS`
+        save_options : Optional[Dict[str, Any]], optional
+            `savefig()` arguments, see `pl.get_save_options()`, by default
+            None (png)
+        density_threshold : Optional[int], optional
+            number of rows above which the scatter plot is drawn as a
+            density plot, by default None (server default)
+
+        Returns
+        -------
+        bytes
+            image
+
+        Raises
+        ------
+        ValueError
+            raised if the plot kind is not supported
+        PermissionError
+            raised if the path resolves outside of the root directory
+        RuntimeError
+            raised if the worker processes are not started, see
+            `start_workers()`
+        """
+
+        # workers are never forked here: the event loop may already run
+        # threads (e.g. files parsed in the default executor)
+        if self._executor is None:
+            raise RuntimeError(
+                "Worker processes are not started, call start_workers() "
+                "before the event loop runs"
+            )
+        if plot_kind not in pl.PLOT_KINDS:
+            raise ValueError(
+                f"Unsupported plot {plot_kind}, supported plots are "
+                f"{pl.PLOT_KINDS}"
+            )
+        if density_threshold is None:
+            density_threshold = self.density_threshold
+
+        iris_df = await self.get_iris_data(path)
+        loop = asyncio.get_running_loop()
+        plot_data = await loop.run_in_executor(
+            None,
+            partial(
+                pl.get_plot_data,
+                iris_df,
+                plot_kind,
+                density_threshold=density_threshold,
+            ),
+        )
+
+        # requests wait for a free worker instead of queueing plot data in
+        # the executor
+        if self._render_slots is None:
+            self._render_slots = asyncio.Semaphore(self.jobs)
+        async with self._render_slots:
+            return await loop.run_in_executor(
+                self._executor,
+                _render_image,
+                plot_data,
+                plot_kind,
+                save_options or {},
+            )
+
+    async def handle_request(
+        self, target: str
+    ) -> Tuple[int, str, bytes]:
+        """Handles a GET request.
+
+        Parameters
+        ----------
+        target : str
+            request target, route and query
+
+        Returns
+        -------
+        Tuple[int, str, bytes]
+            status code, content type and body of the response
+        """
+
+        url = urlsplit(target)
+        route = unquote(url.path).strip("/").split("/")
+        query = {
+            name: values[-1] for name, values in parse_qs(url.query).items()
+        }
+
+        try:
+            if route == ["stats"]:
+                body = {**self.stats, "cached_files": len(self._cache)}
+                return 200, "application/json", json.dumps(body).encode()
+
+            if route == ["data"]:
+                iris_df = await self.get_iris_data(_get_query_path(query))
+                body = {
+                    "n_rows": len(iris_df),
+                    "columns": list(iris_df.columns),
+                    "memory_usage": dp.get_memory_usage(iris_df),
+                }
+                return 200, "application/json", json.dumps(body).encode()
+
+            if len(route) == 2 and route[0] == "plot":
+                save_options = pl.get_save_options(
+                    query.get("format", "png"),
+                    dpi=float(query["dpi"]) if "dpi" in query else None,
+                    fast_png=query.get("fast_png", "0") in ["1", "true"],
+                )
+                density_threshold = query.get("density_threshold")
+                image = await self.render(
+                    _get_query_path(query),
+                    route[1],
+                    save_options,
+                    density_threshold=(
+                        None
+                        if density_threshold is None
+                        else int(density_threshold)
+                    ),
+                )
+                return 200, _CONTENT_TYPES[save_options["format"]], image
+
+            return 404, "text/plain", f"Unknown route {url.path}".encode()
+
+        except FileNotFoundError as e:
+            return 404, "text/plain", str(e).encode()
+        except PermissionError as e:
+            return 403, "text/plain", str(e).encode()
+        except (KeyError, TypeError, ValueError) as e:
+            return 400, "text/plain", f"{e.__class__.__name__}: {e}".encode()
+        except Exception as e:
+            return 500, "text/plain", f"{e.__class__.__name__}: {e}".encode()
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Reads one HTTP request from a connection, writes the response and
+        closes the connection"""
+
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()).strip() != b"":
+                pass
+
+            parts = request_line.decode("latin-1").split()
+            if len(parts) != 3:
+                status, content_type, body = (
+                    400,
+                    "text/plain",
+                    b"Malformed request",
+                )
+            elif parts[0] != "GET":
+                status, content_type, body = (
+                    405,
+                    "text/plain",
+                    f"Unsupported method {parts[0]}".encode(),
+                )
+            else:
+                status, content_type, body = await self.handle_request(
+                    parts[1]
+                )
+
+            writer.write(
+                f"HTTP/1.1 {status} {_STATUS_REASONS[status]}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1")
+            )
+            writer.write(body)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        socket_path: Optional[str] = None,
+        ready: Optional[asyncio.Future] = None,
+    ) -> None:
+        """Serves requests until cancelled. Worker processes that are not
+        started yet are forked before the server accepts requests, so before
+        any file is parsed in a thread.
+
+        Parameters
+        ----------
+        host : str, optional
+            host of the TCP server, by default "127.0.0.1"
+        port : int, optional
+            port of the TCP server, 0 picks a free port, by default 8000
+        socket_path : Optional[str], optional
+            serves on a Unix socket instead of TCP, by default None
+        ready : Optional[asyncio.Future], optional
+            set to the address of the server once it accepts connections,
+            by default None
+        """
+
+        self.start_workers()
+
+        if socket_path is not None:
+            server = await asyncio.start_unix_server(
+                self.handle_connection, path=socket_path
+            )
+        else:
+            server = await asyncio.start_server(
+                self.handle_connection, host=host, port=port
+            )
+
+        async with server:
+            address = server.sockets[0].getsockname()
+            if ready is not None:
+                ready.set_result(address)
+            await server.serve_forever()
+
+
+# -------------------------
+# additional functions
+# -------------------------
+
+# content type of each image format
+_CONTENT_TYPES = {
+    "png": "image/png",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+    "svg": "image/svg+xml",
+}
+
+# reason phrases of the response status codes
+_STATUS_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+def _get_query_path(query: Dict[str, str]) -> str:
+    """Returns the iris data file of a request query"""
+
+    if "path" not in query:
+        raise ValueError("Missing path of the iris data file")
+
+    return query["path"]
+
+
+def _init_render_worker() -> None:
+    """Sets up a worker process: loads matplotlib with the non-interactive
+    Agg backend"""
+    plt.switch_backend("Agg")
+
+
+def _render_image(
+    plot_data: Tuple[Any, Any],
+    plot_kind: str,
+    save_options: Dict[str, Any],
+) -> bytes:
+    """Draws a plot in a worker process and returns the saved image, see
+    `pl.render_plot()`"""
+
+    image = io.BytesIO()
+    pl.render_plot(plot_data, plot_kind, image, save_options)
+
+    return image.getvalue()
+
+
+def main() -> int:
+
+    # CLI arguments
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-r",
+        "--root",
+        dest="root",
+        required=True,
+        help="directory of the served iris datasets, request paths are "
+        "relative to it and paths outside of it are rejected",
+    )
+    parser.add_argument(
+        "--host",
+        dest="host",
+        default="127.0.0.1",
+        help="host of the server, other hosts than 127.0.0.1 serve the "
+        "iris datasets under --root to the network",
+    )
+    parser.add_argument(
+        "-p",
+        "--port",
+        dest="port",
+        type=int,
+        default=8000,
+        help="port of the server",
+    )
+    parser.add_argument(
+        "--socket",
+        dest="socket_path",
+        default=None,
+        help="serve on a Unix socket instead of host and port",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type=int,
+        default=1,
+        help="number of worker processes used to render the plots",
+    )
+    parser.add_argument(
+        "--cache_size",
+        dest="cache_size",
+        type=int,
+        default=8,
+        help="number of parsed iris datasets kept in memory",
+    )
+    parser.add_argument(
+        "--density_threshold",
+        dest="density_threshold",
+        type=int,
+        default=pl.DENSITY_THRESHOLD,
+        help="number of rows above which the scatter plot is drawn as a "
+        "density plot (2D histogram of each species)",
+    )
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be a positive integer")
+    if args.cache_size < 1:
+        parser.error("--cache_size must be a positive integer")
+    if args.density_threshold < 0:
+        parser.error("--density_threshold must not be negative")
+    if not Path(args.root).is_dir():
+        parser.error(f"--root {args.root} is not a directory")
+
+    plot_server = PlotServer(
+        args.root,
+        cache_size=args.cache_size,
+        jobs=args.jobs,
+        density_threshold=args.density_threshold,
+    )
+
+    # workers are forked before the event loop starts
+    plot_server.start_workers()
+    if args.socket_path is not None:
+        print(f"Serving on {args.socket_path}")
+    else:
+        print(f"Serving on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(
+            plot_server.serve(
+                host=args.host, port=args.port, socket_path=args.socket_path
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        plot_server.close()
+
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,89 +9,148 @@ and length
 * merged_boxplot_and_scatter - wrapper function that merges the two plot into
 one
 
+* get_plot_data, render_plot, get_save_options - render API: computes the
+plot data of an iris dataframe once and renders any plot kind from it into
+a file or a binary file object
+
 """
+from __future__ import annotations
+
 import argparse
+import glob
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import pickle
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
 from pathlib import Path
+from typing import Any
+from typing import BinaryIO
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
 
 import data_processor as dp
-import matplotlib.pyplot as plt
-import pandas as pd
+import numpy as np
+
+# matplotlib and pandas are imported on first use, so the command line
+# starts fast
+mpl = dp.LazyModule("matplotlib")
+plt = dp.LazyModule("matplotlib.pyplot")
+cbook = dp.LazyModule("matplotlib.cbook")
+mcolors = dp.LazyModule("matplotlib.colors")
+mpatches = dp.LazyModule("matplotlib.patches")
+pd = dp.LazyModule("pandas")
+
+# plots rendered from the plot data of an iris data file, see render_plot()
+PLOT_KINDS = ["boxplot", "scatter", "merged"]
+
+# number of rows above which scatter plots are drawn as density plots
+DENSITY_THRESHOLD = 100_000
 
 
 def create_iris_boxplot(
-    iris_df: pd.DataFrame, outname: str, axis=None
+    iris_df: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+    outname: str,
+    axis=None,
+    file_format: Optional[str] = None,
+    dpi: Optional[float] = None,
+    fast_png: bool = False,
 ) -> plt.Axes:
-    """Creates a box plot of sepal width/length and petal width/length.
+    """Creates a box plot of sepal width/length and petal width/length. If
+    an axis is provided, the box plot is drawn on it and no image is saved.
+    Dataframe chunks (e.g. `dp.read_data_file(chunksize=...)`) are
+    summarized one at a time, so files that do not fit in memory can be
+    plotted.
 
     Parameters
     ----------
-    iris_df : pd.DataFrame
-        dataframe containing iris data
+    iris_df : Union[pd.DataFrame, Iterable[pd.DataFrame]]
+        dataframe containing iris data, or dataframe chunks
     outname : str
         name of produced image
+    file_format : Optional[str], optional
+        image format: "png", "jpeg", "webp" or "svg", by default None (taken
+        from the outname extension, png otherwise)
+    dpi : Optional[float], optional
+        resolution of raster images, by default None (matplotlib default)
+    fast_png : bool, optional
+        saves png images with low zlib compression, faster to write but
+        larger, by default False
 
     Raises
     ------
     TypeError
-        raised if iris_df is not a data frame or out name is not a string type
+        raised if iris_df is not a data frame or dataframe chunks, or out name
+        is not a string type
     ValueError
-        raised if expected column values do not match from extracted data
+        raised if expected column values do not match from extracted data,
+        or if save options are not supported
     """
 
     # type checking
-    if not isinstance(iris_df, pd.DataFrame):
-        raise TypeError("Iris data must be a pandas dataframe")
     if not isinstance(outname, str):
         raise TypeError(f"outname must be a string, not {type(outname)}")
 
-    # columns
-    sel_cols = iris_df.columns.tolist()[:-1]
-    if sel_cols != [
-        "sepal_width",
-        "sepal_length",
-        "petal_width",
-        "petal_length",
-    ]:
-        raise ValueError(
-            "Column from dataset do not match with expected column names"
+    box_stats = _get_boxplot_stats(_get_iris_chunks(iris_df))
+    if axis is None:
+        return _save_boxplot(
+            box_stats,
+            outname,
+            get_save_options(file_format, dpi=dpi, fast_png=fast_png),
         )
 
-    # format data into dictionary
-    data = {}
-    for col_name in sel_cols:
-        data_array = iris_df[col_name].values
-        data[col_name] = data_array
-
-    # creating subplot
-    fig, ax = plt.subplots()
-    if axis is not None:
-        ax = axis
-
-    ax.boxplot(data.values())
-    ax.set_xticklabels(data.keys())
-    ax.set_ylabel("cm")
-    ax.set_title("Iris boxplot of all species")
-
-    # saving plot
-    plt.savefig(outname)
-    plt.close()
-
-    return ax
+    _draw_boxplot(axis, box_stats)
+    return axis
 
 
 def petal_width_v_length_scatter(
-    iris_df: pd.DataFrame, outname: str, axis=None
+    iris_df: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+    outname: str,
+    axis=None,
+    species_index: Optional[Tuple[np.ndarray, Dict[Any, slice]]] = None,
+    density_threshold: Optional[int] = None,
+    file_format: Optional[str] = None,
+    dpi: Optional[float] = None,
+    fast_png: bool = False,
 ) -> plt.Axes:
     """Creates a scatter plot that compares all sepal widths across all species
-    . Returns axis object that contains all the plot data.
+    . Returns axis object that contains all the plot data. If an axis is
+    provided, the scatter plot is drawn on it and no image is saved. Above
+    `density_threshold` rows, points are binned into a 2D histogram per
+    species and drawn as images instead of one marker per row. Only the
+    sepal columns and species of dataframe chunks are kept.
 
     Parameters
     ----------
-    iris_df : pd.DataFrame
-        data frame containing iris data
+    iris_df : Union[pd.DataFrame, Iterable[pd.DataFrame]]
+        data frame containing iris data, or dataframe chunks
     outname : str
         name of generated image output
+    species_index : Optional[Tuple[np.ndarray, Dict[Any, slice]]], optional
+        rows of each species, see `dp.get_species_index()`. Built from
+        iris_df if not provided, cannot be used with chunks, by default None
+    density_threshold : Optional[int], optional
+        number of rows above which the density plot is drawn, by default
+        None (100000 rows)
+    file_format : Optional[str], optional
+        image format: "png", "jpeg", "webp" or "svg", by default None (taken
+        from the outname extension, png otherwise). Points of svg images
+        are rasterized
+    dpi : Optional[float], optional
+        resolution of raster images, by default None (matplotlib default)
+    fast_png : bool, optional
+        saves png images with low zlib compression, faster to write but
+        larger, by default False
 
     Return
     ------
@@ -101,54 +160,68 @@ def petal_width_v_length_scatter(
     Raises
     ------
     TypeError
-        raised if iris_df is not a data frame or out name is not a string type
+        raised if iris_df is not a data frame or dataframe chunks, or out name
+        is not a string type
     ValueError
-        raised if expected column values do not match from extracted data
+        raised if expected column values do not match from extracted data,
+        if a species index is used with chunks or if save options are not
+        supported
     """
     # type checking
-    if not isinstance(iris_df, pd.DataFrame):
-        raise TypeError("Iris data must be a pandas dataframe")
     if not isinstance(outname, str):
         raise TypeError(f"outname must be a string, not {type(outname)}")
+    if not isinstance(iris_df, pd.DataFrame):
+        if species_index is not None:
+            raise ValueError("species_index cannot be used with chunks")
+        iris_df = _concat_scatter_columns(_get_iris_chunks(iris_df))
 
-    # plotting data based on species
-    fig, ax = plt.subplots()
-    if axis is not None:
-        ax = axis
-
-    species = iris_df["iris_species"].unique().tolist()
-    for species_name in species:
-        iris_subset = iris_df[iris_df["iris_species"] == species_name]
-        ax.scatter(
-            iris_subset["sepal_length"],
-            iris_subset["sepal_width"],
-            label=species_name,
+    scatter_data = _get_scatter_data(
+        iris_df, species_index, density_threshold=density_threshold
+    )
+    if axis is None:
+        return _save_scatter(
+            scatter_data,
+            outname,
+            get_save_options(file_format, dpi=dpi, fast_png=fast_png),
         )
 
-    # labeling axis
-    ax.set_ylabel("sepal_width (cm)")
-    ax.set_xlabel("sepal_length (cm)")
-    ax.set_title("Sepal Length vs Sepal Width based on Species")
-    ax.legend()
-
-    # saving plot
-    plt.savefig(outname)
-
-    plt.close()
-    return ax
+    _draw_scatter(axis, scatter_data)
+    return axis
 
 
 def merged_boxplot_and_scatter(
-    iris_df: pd.DataFrame, outname: str
+    iris_df: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+    outname: str,
+    species_index: Optional[Tuple[np.ndarray, Dict[Any, slice]]] = None,
+    density_threshold: Optional[int] = None,
+    file_format: Optional[str] = None,
+    dpi: Optional[float] = None,
+    fast_png: bool = False,
 ) -> plt.Axes:
-    """plots both boxplot and scatter plot together and saves it.
+    """plots both boxplot and scatter plot together and saves it. Dataframe
+    chunks are read once, see `create_iris_boxplot()` and
+    `petal_width_v_length_scatter()`.
 
     Parameters
     ----------
-    iris_df : pd.DataFrame
-        iris data frame
+    iris_df : Union[pd.DataFrame, Iterable[pd.DataFrame]]
+        iris data frame, or dataframe chunks
     outname : str
         outname of generated image
+    species_index : Optional[Tuple[np.ndarray, Dict[Any, slice]]], optional
+        rows of each species, see `dp.get_species_index()`, cannot be used
+        with chunks, by default None
+    density_threshold : Optional[int], optional
+        number of rows above which the scatter plot is drawn as a density
+        plot, see `petal_width_v_length_scatter()`, by default None
+    file_format : Optional[str], optional
+        image format: "png", "jpeg", "webp" or "svg", by default None (taken
+        from the outname extension, png otherwise)
+    dpi : Optional[float], optional
+        resolution of raster images, by default None (matplotlib default)
+    fast_png : bool, optional
+        saves png images with low zlib compression, faster to write but
+        larger, by default False
 
     Returns
     -------
@@ -156,23 +229,201 @@ def merged_boxplot_and_scatter(
         Merged image with named by outname in current directory
     """
     # type checking
-    if not isinstance(iris_df, pd.DataFrame):
-        raise TypeError("Iris data must be a pandas dataframe")
     if not isinstance(outname, str):
         raise TypeError(f"outname must be a string, not {type(outname)}")
+    if not isinstance(iris_df, pd.DataFrame) and species_index is not None:
+        raise ValueError("species_index cannot be used with chunks")
 
-    fig, ax = plt.subplots(1, 2)
-    fig.set_size_inches(20, 10)
-    create_iris_boxplot(iris_df, outname=outname, axis=ax[0])
-    petal_width_v_length_scatter(iris_df, outname=outname, axis=ax[1])
+    _save_merged(
+        *get_plot_data(
+            iris_df,
+            species_index=species_index,
+            density_threshold=density_threshold,
+        ),
+        outname,
+        get_save_options(file_format, dpi=dpi, fast_png=fast_png),
+    )
 
-    for i in range(len(ax)):
-        ax[i].spines["top"].set_visible(False)
-        ax[i].spines["right"].set_visible(False)
-        ax[i].spines["bottom"].set_visible(True)
-        ax[i].spines["left"].set_visible(True)
 
-    plt.savefig(outname)
+def get_plot_data(
+    iris_df: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+    plot_kind: str = "merged",
+    species_index: Optional[Tuple[np.ndarray, Dict[Any, slice]]] = None,
+    density_threshold: Optional[int] = None,
+) -> Tuple[Optional[List[Dict[str, Any]]], Optional[Dict[str, Any]]]:
+    """Computes the box plot statistics and scatter data a plot needs, the
+    merged plot needs both. Dataframe chunks are read once: they are
+    summarized for the box plot while their sepal columns are kept for the
+    scatter plot.
+
+    Parameters
+    ----------
+    iris_df : Union[pd.DataFrame, Iterable[pd.DataFrame]]
+        dataframe containing iris data, or dataframe chunks
+    plot_kind : str, optional
+        plot the data is computed for, one of `PLOT_KINDS`, by default
+        "merged"
+    species_index : Optional[Tuple[np.ndarray, Dict[Any, slice]]], optional
+        rows of each species of a dataframe, see `dp.get_species_index()`,
+        by default None
+    density_threshold : Optional[int], optional
+        number of rows above which the scatter plot is drawn as a density
+        plot, by default None (`DENSITY_THRESHOLD`)
+
+    Returns
+    -------
+    Tuple[Optional[List[Dict[str, Any]]], Optional[Dict[str, Any]]]
+        box plot statistics and scatter data, None if the plot does not use
+        them, see `render_plot()`
+
+    Raises
+    ------
+    TypeError
+        raised if iris_df is not a data frame or an iterable of data frames
+    ValueError
+        raised if the plot kind is not supported
+    """
+
+    if plot_kind not in PLOT_KINDS:
+        raise ValueError(
+            f"Unsupported plot {plot_kind}, supported plots are {PLOT_KINDS}"
+        )
+    use_box_stats = plot_kind != "scatter"
+    use_scatter_data = plot_kind != "boxplot"
+
+    box_stats = None
+    scatter_data = None
+    if isinstance(iris_df, pd.DataFrame):
+        if use_box_stats:
+            box_stats = _get_boxplot_stats(iris_df)
+        if use_scatter_data:
+            scatter_data = _get_scatter_data(
+                iris_df, species_index, density_threshold=density_threshold
+            )
+        return box_stats, scatter_data
+
+    scatter_chunks = []
+
+    def collect_chunks() -> Iterator[pd.DataFrame]:
+        for iris_chunk in _get_iris_chunks(iris_df):
+            if use_scatter_data:
+                scatter_chunks.append(
+                    iris_chunk[["sepal_length", "sepal_width", "iris_species"]]
+                )
+            yield iris_chunk
+
+    if use_box_stats:
+        box_stats = _get_boxplot_stats(collect_chunks())
+    else:
+        for _ in collect_chunks():
+            pass
+    if use_scatter_data:
+        scatter_data = _get_scatter_data(
+            _concat_scatter_columns(scatter_chunks),
+            density_threshold=density_threshold,
+        )
+
+    return box_stats, scatter_data
+
+
+def render_plot(
+    plot_data: Tuple[Optional[List[Dict[str, Any]]], Optional[Dict[str, Any]]],
+    plot_kind: str,
+    outname: Union[str, BinaryIO],
+    save_options: Optional[Dict[str, Any]] = None,
+) -> Union[str, BinaryIO]:
+    """Draws and saves one plot from the plot data of an iris data file.
+
+    Parameters
+    ----------
+    plot_data : Tuple[Optional[List[Dict[str, Any]]], Optional[Dict]]
+        box plot statistics and scatter data, see `get_plot_data()`
+    plot_kind : str
+        plot drawn, one of `PLOT_KINDS`
+    outname : Union[str, BinaryIO]
+        name of the generated image, or binary file object the image is
+        written to
+    save_options : Optional[Dict[str, Any]], optional
+        `savefig()` arguments, see `get_save_options()`, by default None
+
+    Returns
+    -------
+    Union[str, BinaryIO]
+        name of the generated image, with its extension, or file object
+
+    Raises
+    ------
+    ValueError
+        raised if the plot kind is not supported
+    """
+
+    if plot_kind not in PLOT_KINDS:
+        raise ValueError(
+            f"Unsupported plot {plot_kind}, supported plots are {PLOT_KINDS}"
+        )
+    save_options = save_options or {}
+    box_stats, scatter_data = plot_data
+    if plot_kind == "boxplot":
+        _save_boxplot(box_stats, outname, save_options)
+    elif plot_kind == "scatter":
+        _save_scatter(scatter_data, outname, save_options)
+    else:
+        _save_merged(box_stats, scatter_data, outname, save_options)
+
+    if not isinstance(outname, str):
+        return outname
+    return _get_image_name(outname, save_options)
+
+
+def get_save_options(
+    file_format: Optional[str] = None,
+    dpi: Optional[float] = None,
+    fast_png: bool = False,
+) -> Dict[str, Any]:
+    """Checks image save options and converts them into `savefig()`
+    arguments.
+
+    Parameters
+    ----------
+    file_format : Optional[str], optional
+        "png", "jpeg", "webp" or "svg", by default None
+    dpi : Optional[float], optional
+        resolution of raster images, by default None
+    fast_png : bool, optional
+        saves png images with low zlib compression, by default False
+
+    Returns
+    -------
+    Dict[str, Any]
+        `savefig()` arguments
+
+    Raises
+    ------
+    ValueError
+        raised if the format is not supported, dpi is not positive or
+        fast_png is used with a format other than png
+    """
+
+    if file_format is not None and file_format not in _SAVE_FORMATS:
+        raise ValueError(
+            f"Unsupported format {file_format}, supported formats are "
+            f"{_SAVE_FORMATS}"
+        )
+    if dpi is not None and not dpi > 0:
+        raise ValueError(f"dpi must be positive, not {dpi}")
+
+    save_options = {}
+    if file_format is not None:
+        save_options["format"] = file_format
+    if dpi is not None:
+        save_options["dpi"] = dpi
+    if fast_png:
+        if file_format not in [None, "png"]:
+            raise ValueError("fast_png can only be used with png images")
+        save_options["format"] = "png"
+        save_options["pil_kwargs"] = {"compress_level": _FAST_PNG_COMPRESSION}
+
+    return save_options
 
 
 def display_exception(e: BaseException) -> None:
@@ -191,22 +442,839 @@ def display_exception(e: BaseException) -> None:
     # extracting name and message from exception
     try:
         e_name = e.__class__.__name__
-        print(f"{e_name}: {e}")
-        sys.exit(1)
     except BaseException:
         raise TypeError("Exception class was not provided")
+    print(f"{e_name}: {e}")
+    sys.exit(1)
+
+
+# ------------------------------
+# additional functions
+# ------------------------------
+# suffix of the image generated by each plot
+_PLOT_SUFFIXES = {
+    "boxplot": "_boxplot",
+    "scatter": "_scatterplot",
+    "merged": "_merged_box_and_scatter",
+}
+
+# number of bins along each axis of the density plots
+_DENSITY_BINS = 256
+
+# image formats supported when saving plots, points of vector formats are
+# rasterized
+_SAVE_FORMATS = ["png", "jpeg", "webp", "svg"]
+_VECTOR_FORMATS = ["svg"]
+
+# zlib compression level of png images saved with fast_png (default is 6)
+_FAST_PNG_COMPRESSION = 1
+
+# name of the manifest of generated images, written next to the images
+_MANIFEST_NAME = ".plotter_manifest.json"
+
+# plot data of the iris data files of the window being rendered and save
+# options, set in worker processes by _init_plot_worker() and
+# _render_plot_task()
+_WORKER_PLOT_DATA = {}
+_WORKER_WINDOW = None
+_WORKER_SAVE_OPTIONS = {}
+
+# identifiers of the windows of files rendered by _render_plots()
+_PLOT_WINDOWS = itertools.count()
+
+
+def _get_iris_chunks(
+    iris_df: Union[pd.DataFrame, Iterable[pd.DataFrame]]
+) -> Iterator[pd.DataFrame]:
+    """Iterates over a dataframe (single chunk) or dataframe chunks, each
+    chunk is checked when it is read.
+
+    Raises
+    ------
+    TypeError
+        raised if iris_df is not a data frame or an iterable of data frames
+    """
+
+    if isinstance(iris_df, pd.DataFrame):
+        yield iris_df
+        return None
+    if not isinstance(iris_df, Iterable):
+        raise TypeError(
+            "Iris data must be a pandas dataframe or dataframe chunks"
+        )
+
+    for iris_chunk in iris_df:
+        if not isinstance(iris_chunk, pd.DataFrame):
+            raise TypeError(
+                "Iris data must be a pandas dataframe or dataframe chunks"
+            )
+        yield iris_chunk
+
+
+def _concat_scatter_columns(
+    iris_chunks: Iterable[pd.DataFrame],
+) -> pd.DataFrame:
+    """Concatenates the sepal columns and species of dataframe chunks, the
+    only columns used by the scatter plot. Species stay categorical."""
+
+    scatter_cols = ["sepal_length", "sepal_width", "iris_species"]
+    scatter_chunks = [iris_chunk[scatter_cols] for iris_chunk in iris_chunks]
+    if len(scatter_chunks) == 0:
+        return pd.DataFrame(columns=scatter_cols)
+
+    species = [
+        scatter_chunk["iris_species"] for scatter_chunk in scatter_chunks
+    ]
+    if all(isinstance(col.dtype, pd.CategoricalDtype) for col in species):
+        species = pd.api.types.union_categoricals(
+            species, sort_categories=True
+        )
+    else:
+        species = pd.concat(species, ignore_index=True).to_numpy()
+
+    scatter_df = pd.concat(
+        [scatter_chunk[scatter_cols[:2]] for scatter_chunk in scatter_chunks],
+        ignore_index=True,
+    )
+    scatter_df["iris_species"] = species
+
+    return scatter_df
+
+
+def _get_boxplot_stats(
+    iris_df: Union[pd.DataFrame, Iterable[pd.DataFrame]]
+) -> List[Dict[str, Any]]:
+    """Computes the box plot statistics of sepal width/length and petal
+    width/length from quantile sketches, see `dp.get_quantile_sketch()`.
+    Dataframe chunks are summarized one at a time, so chunks of data that
+    does not fit in memory can be plotted.
+
+    Parameters
+    ----------
+    iris_df : Union[pd.DataFrame, Iterable[pd.DataFrame]]
+        dataframe containing iris data, or dataframe chunks
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        statistics of each column, see `_get_sketch_boxplot_stats()`
+
+    Raises
+    ------
+    ValueError
+        raised if expected column values do not match from extracted data
+    """
+
+    iris_chunks = [iris_df] if isinstance(iris_df, pd.DataFrame) else iris_df
+
+    col_sketches = {}
+    for iris_chunk in iris_chunks:
+
+        # columns
+        sel_cols = iris_chunk.columns.tolist()[:-1]
+        if sel_cols != [
+            "sepal_width",
+            "sepal_length",
+            "petal_width",
+            "petal_length",
+        ]:
+            raise ValueError(
+                "Column from dataset do not match with expected column names"
+            )
+
+        for col_name in sel_cols:
+            col_sketch = dp.get_quantile_sketch(iris_chunk[col_name].values)
+            if col_name in col_sketches:
+                col_sketch = dp.merge_quantile_sketches(
+                    [col_sketches[col_name], col_sketch]
+                )
+            col_sketches[col_name] = col_sketch
+
+    return [
+        _get_sketch_boxplot_stats(col_sketch, label=col_name)
+        for col_name, col_sketch in col_sketches.items()
+    ]
+
+
+def _get_sketch_boxplot_stats(
+    sketch: Dict[str, Any], label: Any = None, whis: float = 1.5
+) -> Dict[str, Any]:
+    """Computes box plot statistics from a quantile sketch, the same way as
+    `matplotlib.cbook.boxplot_stats()`. Whiskers reach the most extreme
+    values within `whis` times the interquartile range of the quartiles.
+    Outliers are taken from the lowest and highest values kept by the
+    sketch, so at most `n_extremes` outliers are drawn on each side.
+
+    Parameters
+    ----------
+    sketch : Dict[str, Any]
+        quantile sketch, see `dp.get_quantile_sketch()`
+    label : Any, optional
+        label of the box, by default None
+    whis : float, optional
+        whisker length in interquartile ranges, by default 1.5
+
+    Returns
+    -------
+    Dict[str, Any]
+        box plot statistics drawn by `ax.bxp()`
+    """
+
+    q1, med, q3 = dp.get_sketch_quantiles(sketch, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    count = sketch["count"]
+    low_fence = q1 - whis * iqr
+    high_fence = q3 + whis * iqr
+
+    # whiskers are exact if a kept extreme value falls within the fences,
+    # otherwise they are estimated from the sketch values
+    lowest = sketch["lowest"]
+    highest = sketch["highest"]
+    low_values = lowest[lowest >= low_fence]
+    if len(low_values) == 0:
+        low_values = sketch["values"][sketch["values"] >= low_fence]
+    high_values = highest[highest <= high_fence]
+    if len(high_values) == 0:
+        high_values = sketch["values"][sketch["values"] <= high_fence]
+    whislo = min(low_values.min(), q1) if len(low_values) > 0 else q1
+    whishi = max(high_values.max(), q3) if len(high_values) > 0 else q3
+
+    fliers = np.concatenate(
+        [lowest[lowest < whislo], highest[highest > whishi]]
+    )
+
+    return {
+        "label": label,
+        "mean": sketch["sum"] / count if count > 0 else np.nan,
+        "iqr": iqr,
+        "cilo": med - 1.57 * iqr / np.sqrt(count) if count > 0 else np.nan,
+        "cihi": med + 1.57 * iqr / np.sqrt(count) if count > 0 else np.nan,
+        "whislo": whislo,
+        "whishi": whishi,
+        "fliers": fliers,
+        "q1": q1,
+        "med": med,
+        "q3": q3,
+    }
+
+
+def _get_scatter_data(
+    iris_df: pd.DataFrame,
+    species_index: Optional[Tuple[np.ndarray, Dict[Any, slice]]] = None,
+    density_threshold: Optional[int] = None,
+    bins: int = _DENSITY_BINS,
+) -> Dict[str, Any]:
+    """Extracts the sepal length and width of each species. Above
+    `density_threshold` rows, the points of each species are binned into a
+    2D histogram instead, so the drawing time does not depend on the number
+    of rows.
+
+    Parameters
+    ----------
+    iris_df : pd.DataFrame
+        dataframe containing iris data
+    species_index : Optional[Tuple[np.ndarray, Dict[Any, slice]]], optional
+        rows of each species, see `dp.get_species_index()`. Built from
+        iris_df if not provided, by default None
+    density_threshold : Optional[int], optional
+        number of rows above which points are binned, by default None
+        (`DENSITY_THRESHOLD`)
+    bins : int, optional
+        number of bins along each axis, by default `_DENSITY_BINS`
+
+    Returns
+    -------
+    Dict[str, Any]
+        "points": sepal lengths and widths of each species, or "density":
+        2D histogram (sepal length x sepal width) of each species and
+        "extent": (left, right, bottom, top) edges of the histograms
+    """
+
+    # columns are sorted by species once, each species is a slice (view) of
+    # the sorted columns
+    if species_index is None:
+        species_index = dp.get_species_index(iris_df)
+    order, species_slices = species_index
+    sepal_length = iris_df["sepal_length"].to_numpy()[order]
+    sepal_width = iris_df["sepal_width"].to_numpy()[order]
+
+    # points are drawn as they are up to the density threshold, columns of
+    # files with no data rows are not numeric
+    if density_threshold is None:
+        density_threshold = DENSITY_THRESHOLD
+    if len(order) > density_threshold:
+        sepal_length = sepal_length.astype(np.float64, copy=False)
+        sepal_width = sepal_width.astype(np.float64, copy=False)
+        finite = np.isfinite(sepal_length) & np.isfinite(sepal_width)
+    if len(order) <= density_threshold or not finite.any():
+        return {
+            "points": {
+                species_name: (
+                    sepal_length[species_rows],
+                    sepal_width[species_rows],
+                )
+                for species_name, species_rows in species_slices.items()
+            }
+        }
+
+    # all species share the same bins
+    hist_range = [
+        [sepal_length[finite].min(), sepal_length[finite].max()],
+        [sepal_width[finite].min(), sepal_width[finite].max()],
+    ]
+
+    densities = {}
+    for species_name, species_rows in species_slices.items():
+        density, x_edges, y_edges = np.histogram2d(
+            sepal_length[species_rows],
+            sepal_width[species_rows],
+            bins=bins,
+            range=hist_range,
+        )
+        densities[species_name] = density
+
+    return {
+        "density": densities,
+        "extent": (x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]),
+    }
+
+
+def _draw_boxplot(ax: plt.Axes, box_stats: List[Dict[str, Any]]) -> None:
+    """Draws a box plot from precomputed statistics, see
+    `_get_boxplot_stats()`"""
+
+    ax.bxp(box_stats)
+    ax.set_ylabel("cm")
+    ax.set_title("Iris boxplot of all species")
+
+
+def _draw_scatter(
+    ax: plt.Axes, scatter_data: Dict[str, Any], rasterized: bool = False
+) -> None:
+    """Draws a scatter plot, or a density plot, of each species from
+    extracted columns, see `_get_scatter_data()`. Points are drawn as a
+    single image in vector outputs if rasterized is True."""
+
+    if "points" in scatter_data:
+        for species_name, (sepal_length, sepal_width) in scatter_data[
+            "points"
+        ].items():
+            ax.scatter(
+                sepal_length,
+                sepal_width,
+                label=species_name,
+                rasterized=rasterized,
+            )
+        ax.legend()
+    else:
+        _draw_density(ax, scatter_data["density"], scatter_data["extent"])
+
+    # labeling axis
+    ax.set_ylabel("sepal_width (cm)")
+    ax.set_xlabel("sepal_length (cm)")
+    ax.set_title("Sepal Length vs Sepal Width based on Species")
+
+
+def _draw_density(
+    ax: plt.Axes,
+    densities: Dict[Any, np.ndarray],
+    extent: Tuple[float, float, float, float],
+) -> None:
+    """Draws the 2D histogram of each species as an image. Each species uses
+    the color of its scatter plot, with opacity increasing with the
+    (log-scaled) number of points in each bin."""
+
+    legend_handles = []
+    for idx, (species_name, density) in enumerate(densities.items()):
+        color = mcolors.to_rgb(f"C{idx % 10}")
+        cmap = mcolors.LinearSegmentedColormap.from_list(
+            f"density_{idx}", [(*color, 0.0), (*color, 1.0)]
+        )
+        ax.imshow(
+            np.log1p(density.T),
+            cmap=cmap,
+            extent=extent,
+            origin="lower",
+            aspect="auto",
+            interpolation="nearest",
+        )
+        legend_handles.append(mpatches.Patch(color=color, label=species_name))
+
+    ax.legend(handles=legend_handles)
+
+
+def _get_image_name(outname: str, save_options: Dict[str, Any]) -> str:
+    """Returns the name of the image saved as outname, an extension is added
+    if outname does not end with the image format"""
+
+    file_format = save_options.get("format")
+    if file_format is None:
+        if Path(outname).suffix != "":
+            return outname
+        file_format = plt.rcParams["savefig.format"]
+    if Path(outname).suffix == f".{file_format}":
+        return outname
+
+    return f"{outname}.{file_format}"
+
+
+def _save_figure(
+    fig: plt.Figure,
+    outname: Union[str, BinaryIO],
+    save_options: Dict[str, Any],
+) -> Union[str, BinaryIO]:
+    """Saves a figure once and closes it, returns the image name. Figures
+    can also be saved to binary file objects, e.g. `io.BytesIO`, in the
+    format of the save options (png otherwise)"""
+
+    if isinstance(outname, str):
+        image_name = _get_image_name(outname, save_options)
+    else:
+        image_name = outname
+        save_options = {"format": "png", **save_options}
+    fig.savefig(image_name, **save_options)
+    plt.close(fig)
+
+    return image_name
+
+
+def _save_boxplot(
+    box_stats: List[Dict[str, Any]],
+    outname: Union[str, BinaryIO],
+    save_options: Optional[Dict[str, Any]] = None,
+) -> plt.Axes:
+    """Draws a box plot in a new figure and saves it as outname, see
+    `get_save_options()`"""
+
+    fig, ax = plt.subplots()
+    _draw_boxplot(ax, box_stats)
+    _save_figure(fig, outname, save_options or {})
+
+    return ax
+
+
+def _save_scatter(
+    scatter_data: Dict[str, Any],
+    outname: Union[str, BinaryIO],
+    save_options: Optional[Dict[str, Any]] = None,
+) -> plt.Axes:
+    """Draws a scatter plot in a new figure and saves it as outname, see
+    `get_save_options()`"""
+
+    save_options = save_options or {}
+    fig, ax = plt.subplots()
+    _draw_scatter(
+        ax,
+        scatter_data,
+        rasterized=save_options.get("format") in _VECTOR_FORMATS,
+    )
+    _save_figure(fig, outname, save_options)
+
+    return ax
+
+
+def _save_merged(
+    box_stats: List[Dict[str, Any]],
+    scatter_data: Dict[str, Any],
+    outname: Union[str, BinaryIO],
+    save_options: Optional[Dict[str, Any]] = None,
+) -> np.ndarray:
+    """Draws the box plot and scatter plot side by side in a new figure and
+    saves it as outname, see `get_save_options()`"""
+
+    save_options = save_options or {}
+    fig, ax = plt.subplots(1, 2)
+    fig.set_size_inches(20, 10)
+    _draw_boxplot(ax[0], box_stats)
+    _draw_scatter(
+        ax[1],
+        scatter_data,
+        rasterized=save_options.get("format") in _VECTOR_FORMATS,
+    )
+
+    for i in range(len(ax)):
+        ax[i].spines["top"].set_visible(False)
+        ax[i].spines["right"].set_visible(False)
+        ax[i].spines["bottom"].set_visible(True)
+        ax[i].spines["left"].set_visible(True)
+
+    _save_figure(fig, outname, save_options)
+
+    return ax
+
+
+def _use_agg_backend() -> None:
+    """Selects the non-interactive Agg backend for the command line, unless
+    a backend is set with MPLBACKEND. Importing plotter keeps the backend of
+    the importing program"""
+
+    if "MPLBACKEND" not in os.environ:
+        mpl.use("Agg")
+
+
+def _init_plot_worker(save_options: Dict[str, Any]) -> None:
+    """Sets up a worker process: selects the non-interactive Agg backend and
+    stores the save options"""
+
+    global _WORKER_SAVE_OPTIONS
+    plt.switch_backend("Agg")
+    _WORKER_SAVE_OPTIONS = save_options
+
+
+def _start_plot_workers(
+    jobs: int, save_options: Optional[Dict[str, Any]] = None
+) -> ProcessPoolExecutor:
+    """Starts the worker processes rendering plots, see `_render_plots()`.
+    The workers are started once and render every window of files, so they
+    are forked before any file is loaded.
+
+    Parameters
+    ----------
+    jobs : int
+        number of worker processes
+    save_options : Optional[Dict[str, Any]], optional
+        `savefig()` arguments, see `get_save_options()`, by default None
+
+    Returns
+    -------
+    ProcessPoolExecutor
+        worker processes
+    """
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        mp_context = multiprocessing.get_context("fork")
+    else:
+        mp_context = multiprocessing.get_context()
+
+    return ProcessPoolExecutor(
+        max_workers=jobs,
+        mp_context=mp_context,
+        initializer=_init_plot_worker,
+        initargs=(save_options or {},),
+    )
+
+
+def _render_plot_task(
+    window_id: int,
+    data_key: str,
+    file_plot_data: bytes,
+    plot_kind: str,
+    outname: str,
+) -> str:
+    """Renders a plot in a worker process, see `render_plot()`. The plot
+    data of each file is unpickled once per worker and window, and dropped
+    when the worker gets a task of the next window."""
+
+    global _WORKER_PLOT_DATA, _WORKER_WINDOW
+    if window_id != _WORKER_WINDOW:
+        _WORKER_PLOT_DATA = {}
+        _WORKER_WINDOW = window_id
+    if data_key not in _WORKER_PLOT_DATA:
+        _WORKER_PLOT_DATA[data_key] = pickle.loads(file_plot_data)
+
+    return render_plot(
+        _WORKER_PLOT_DATA[data_key], plot_kind, outname, _WORKER_SAVE_OPTIONS
+    )
+
+
+def _render_plots(
+    plot_data: Dict[str, Any],
+    plot_tasks: List[Tuple[str, str, str]],
+    jobs: int = 1,
+    save_options: Optional[Dict[str, Any]] = None,
+    executor: Optional[ProcessPoolExecutor] = None,
+) -> Iterator[str]:
+    """Renders plots, in worker processes if more than one job is used.
+
+    Parameters
+    ----------
+    plot_data : Dict[str, Any]
+        plot data of each iris data file, see `render_plot()`
+    plot_tasks : List[Tuple[str, str, str]]
+        iris data file, plot kind and image name of each plot
+    jobs : int, optional
+        number of worker processes, by default 1
+    save_options : Optional[Dict[str, Any]], optional
+        `savefig()` arguments, see `get_save_options()`, by default None
+    executor : Optional[ProcessPoolExecutor], optional
+        worker processes started with the same save options by
+        `_start_plot_workers()`, reused across calls. If None, workers are
+        started for this call only, by default None
+
+    Returns
+    -------
+    Iterator[str]
+        names of the generated images, in the order of `plot_tasks`
+    """
+
+    save_options = save_options or {}
+    if jobs == 1 or len(plot_tasks) <= 1:
+        for data_key, plot_kind, outname in plot_tasks:
+            yield render_plot(
+                plot_data[data_key], plot_kind, outname, save_options
+            )
+        return None
+
+    with ExitStack() as stack:
+        if executor is None:
+            executor = stack.enter_context(
+                _start_plot_workers(
+                    min(jobs, len(plot_tasks)), save_options
+                )
+            )
+
+        # the plot data of each file is pickled once and sent with each of
+        # its tasks
+        window_id = next(_PLOT_WINDOWS)
+        pickled_data = {
+            data_key: pickle.dumps(
+                plot_data[data_key], protocol=pickle.HIGHEST_PROTOCOL
+            )
+            for data_key in dict.fromkeys(task[0] for task in plot_tasks)
+        }
+        futures = [
+            executor.submit(
+                _render_plot_task,
+                window_id,
+                data_key,
+                pickled_data[data_key],
+                plot_kind,
+                outname,
+            )
+            for data_key, plot_kind, outname in plot_tasks
+        ]
+        for future in futures:
+            yield future.result()
+
+
+def _get_batch_files(batch: str) -> List[str]:
+    """Lists the iris data files of a batch. A batch is either a directory
+    (all files within it, except hidden files and images, so outputs
+    written next to the iris data files are not read back as inputs), a
+    manifest file (one iris data file per line, relative paths start at the
+    manifest directory, empty lines and lines starting with # are skipped)
+    or a glob pattern.
+
+    Parameters
+    ----------
+    batch : str
+        directory, manifest file or glob pattern
+
+    Returns
+    -------
+    List[str]
+        paths to iris data files
+
+    Raises
+    ------
+    FileNotFoundError
+        raised if the batch does not contain any files
+    """
+
+    batch_path = Path(batch)
+    if batch_path.is_dir():
+        iris_data_files = sorted(
+            str(file_path)
+            for file_path in batch_path.iterdir()
+            if file_path.is_file() and not _is_batch_output(file_path)
+        )
+    elif batch_path.is_file():
+        with open(batch_path, "r") as infile:
+            iris_data_files = [
+                str(batch_path.parent / line.strip())
+                for line in infile
+                if line.strip() and not line.lstrip().startswith("#")
+            ]
+    else:
+        iris_data_files = sorted(
+            file_name
+            for file_name in glob.glob(batch, recursive=True)
+            if Path(file_name).is_file()
+        )
+
+    if len(iris_data_files) == 0:
+        raise FileNotFoundError(f"No iris data files found in {batch}")
+
+    return list(dict.fromkeys(iris_data_files))
+
+
+def _is_batch_output(file_path: Path) -> bool:
+    """Checks if a file in a batch directory is a hidden file (e.g. the
+    image manifest) or an image generated by plotter"""
+
+    file_format = file_path.suffix.lstrip(".").lower()
+    return file_path.name.startswith(".") or file_format in (
+        _SAVE_FORMATS + ["jpg"]
+    )
+
+
+def _get_outnames(iris_data_files: List[str], outname: str) -> Dict[str, str]:
+    """Builds the image prefix of each iris data file. A single file uses
+    outname, multiple files add the file name (or the file path if names
+    are repeated) after outname.
+
+    Parameters
+    ----------
+    iris_data_files : List[str]
+        paths to iris data files
+    outname : str
+        outname of the generated files
+
+    Returns
+    -------
+    Dict[str, str]
+        image prefix of each iris data file
+    """
+
+    if len(iris_data_files) == 1:
+        return {iris_data_files[0]: outname}
+
+    file_names = [Path(iris_data).stem for iris_data in iris_data_files]
+    if len(set(file_names)) < len(file_names):
+        file_names = [
+            "_".join(Path(iris_data).with_suffix("").parts).lstrip("_/")
+            for iris_data in iris_data_files
+        ]
+
+    return {
+        iris_data: f"{outname}_{file_name}"
+        for iris_data, file_name in zip(iris_data_files, file_names)
+    }
+
+
+def _load_plot_data(
+    iris_data: str,
+    cache: bool = False,
+    cache_dir: Optional[str] = None,
+    density_threshold: Optional[int] = None,
+    chunksize: Optional[int] = None,
+) -> Tuple[Tuple[List[Dict[str, Any]], Dict[str, Any]], int]:
+    """Loads an iris data file and computes the data shared by the standalone
+    and merged plots.
+
+    Parameters
+    ----------
+    iris_data : str
+        path to iris data file
+    cache : bool, optional
+        loads the file through an on-disk cache, by default False
+    cache_dir : Optional[str], optional
+        directory of the cache, see `dp.read_cached_data_file()`, by default
+        None
+    density_threshold : Optional[int], optional
+        number of rows above which the scatter plot is drawn as a density
+        plot, see `_get_scatter_data()`, by default None
+    chunksize : Optional[int], optional
+        reads the file in chunks of `chunksize` rows, only the sepal columns
+        are kept in memory, see `get_plot_data()`. Not used with the cache,
+        by default None
+
+    Returns
+    -------
+    Tuple[Tuple[List[Dict[str, Any]], Dict[str, Any]], int]
+        plot data, see `render_plot()`, and number of rows in the file
+    """
+
+    # loading iris.data and convert into dataframe
+    if cache:
+        iris_df = dp.read_cached_data_file(iris_data, cache_dir=cache_dir)
+    else:
+        iris_df = dp.read_data_file(iris_data, chunksize=chunksize)
+
+    # plot data is computed once and shared by the standalone and merged
+    # plots, each figure is saved once
+    n_rows = 0
+
+    def count_rows(
+        iris_chunks: Iterable[pd.DataFrame],
+    ) -> Iterator[pd.DataFrame]:
+        nonlocal n_rows
+        for iris_chunk in iris_chunks:
+            n_rows += len(iris_chunk)
+            yield iris_chunk
+
+    plot_data = get_plot_data(
+        iris_df if isinstance(iris_df, pd.DataFrame) else count_rows(iris_df),
+        density_threshold=density_threshold,
+    )
+    if isinstance(iris_df, pd.DataFrame):
+        n_rows = len(iris_df)
+
+    return plot_data, n_rows
+
+
+def _get_code_version() -> str:
+    """Returns a version of the plotting code: the sha256 hash of the
+    plotter and data_processor sources"""
+
+    code_hash = hashlib.sha256()
+    for module_file in [__file__, dp.__file__]:
+        with open(module_file, "rb") as infile:
+            code_hash.update(infile.read())
+
+    return code_hash.hexdigest()
+
+
+def _load_manifest(manifest_path: Path) -> Dict[str, Dict[str, Any]]:
+    """Loads a manifest of generated images, missing or unreadable manifests
+    are empty.
+
+    Parameters
+    ----------
+    manifest_path : Path
+        path to manifest
+
+    Returns
+    -------
+    Dict[str, Dict[str, Any]]
+        input hash, plot parameters and code version of each image
+    """
+
+    try:
+        with open(manifest_path, "r") as infile:
+            manifest = json.load(infile)
+    except (OSError, ValueError):
+        return {}
+
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def _write_manifest(
+    manifest_path: Path, manifest: Dict[str, Dict[str, Any]]
+) -> None:
+    """Writes a manifest of generated images. The manifest is written to a
+    temporary file first and then moved in place, so an interrupted run
+    never leaves a partial manifest."""
+
+    tmp_path = manifest_path.with_name(f"{manifest_path.name}.{os.getpid()}")
+    try:
+        with open(tmp_path, "w") as outfile:
+            json.dump(manifest, outfile, indent=2, sort_keys=True)
+        os.replace(tmp_path, manifest_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
 
 
 def main() -> int:
 
     # CLI arguments
     parser = argparse.ArgumentParser()
-    parser.add_argument(
+    input_group = parser.add_mutually_exclusive_group(required=True)
+    input_group.add_argument(
         "-i",
         "--iris_data",
         dest="iris_data",
-        required=True,
-        help="iris dataset",
+        nargs="+",
+        help="iris dataset, images of multiple datasets are named "
+        "{outname}_{dataset name}_{plot type}",
+    )
+    input_group.add_argument(
+        "-b",
+        "--batch",
+        dest="batch",
+        help="batch of iris datasets: a directory, a manifest file listing "
+        "one dataset per line or a glob pattern (quoted). Files that cannot "
+        "be loaded are reported and skipped",
     )
     parser.add_argument(
         "-o",
@@ -215,45 +1283,230 @@ def main() -> int:
         required=True,
         help="outname of the generated files",
     )
+    parser.add_argument(
+        "--cache",
+        dest="cache",
+        action="store_true",
+        help="load iris dataset through an on-disk cache of parsed files",
+    )
+    parser.add_argument(
+        "--cache_dir",
+        dest="cache_dir",
+        default=None,
+        help="directory of the cache, defaults to a .dataproc_cache "
+        "directory next to the iris dataset",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        dest="jobs",
+        type=int,
+        default=1,
+        help="number of worker processes used to render the plots",
+    )
+    parser.add_argument(
+        "--chunksize",
+        dest="chunksize",
+        type=int,
+        default=None,
+        help="read iris datasets in chunks of rows, for datasets larger than "
+        "memory: only the sepal columns are kept for the scatter plot",
+    )
+    parser.add_argument(
+        "--density_threshold",
+        dest="density_threshold",
+        type=int,
+        default=DENSITY_THRESHOLD,
+        help="number of rows above which the scatter plot is drawn as a "
+        "density plot (2D histogram of each species)",
+    )
+    parser.add_argument(
+        "--format",
+        dest="file_format",
+        choices=_SAVE_FORMATS,
+        default="png",
+        help="format of the generated images, points of svg images are "
+        "rasterized",
+    )
+    parser.add_argument(
+        "--dpi",
+        dest="dpi",
+        type=float,
+        default=None,
+        help="resolution of the generated images, defaults to matplotlib's "
+        "savefig.dpi",
+    )
+    parser.add_argument(
+        "--fast_png",
+        dest="fast_png",
+        action="store_true",
+        help="save png images with low compression, faster but larger",
+    )
+    parser.add_argument(
+        "--force",
+        dest="force",
+        action="store_true",
+        help="render all images, including images that are up to date "
+        "with their iris dataset, plot parameters and code version",
+    )
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be a positive integer")
+    if args.density_threshold < 0:
+        parser.error("--density_threshold must not be negative")
+    if args.chunksize is not None:
+        if args.chunksize < 1:
+            parser.error("--chunksize must be a positive integer")
+        if args.cache:
+            parser.error("--chunksize cannot be used with --cache")
+    try:
+        save_options = get_save_options(
+            args.file_format, dpi=args.dpi, fast_png=args.fast_png
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    _use_agg_backend()
 
-    # setting up output names
-    boxplot_outname = f"{args.outname}_boxplot"
-    scatter_outname = f"{args.outname}_scatterplot"
-    merge_outname = f"{args.outname}_merged_box_and_scatter"
+    start_time = time.perf_counter()
 
-    # loading iris.data and convert into dataframe
-    try:
-        iris_df = dp.read_data_file(args.iris_data)
-    except FileNotFoundError as e:
-        display_exception(e)
-    except PermissionError as e:
-        display_exception(e)
-    except RuntimeError as e:
-        display_exception(e)
+    # setting up input files and output names
+    if args.batch is not None:
+        try:
+            iris_data_files = _get_batch_files(args.batch)
+        except FileNotFoundError as e:
+            display_exception(e)
+    else:
+        iris_data_files = list(dict.fromkeys(args.iris_data))
+    outnames = _get_outnames(iris_data_files, args.outname)
 
-    # generate plots
-    # -- creating box plot
-    try:
-        create_iris_boxplot(iris_df=iris_df, outname=boxplot_outname)
-    except TypeError as e:
-        display_exception(e)
-    except ValueError as e:
-        display_exception(e)
+    # images are up to date if the manifest next to them records the same
+    # input hash, plot parameters and code version
+    code_version = _get_code_version()
+    manifests = {}
+    image_entries = {}
+    n_hits = 0
+    n_misses = 0
 
-    # -- create scatter plot
+    # plot data is held for a window of `jobs` files at a time, the window
+    # is rendered by the same worker processes before the next files are
+    # loaded
+    executor = None
+    if args.jobs > 1:
+        executor = _start_plot_workers(args.jobs, save_options)
+    plot_data = {}
+    plot_tasks = []
+    n_files = 0
+    n_rows = 0
+    failed_files = []
     try:
-        petal_width_v_length_scatter(iris_df=iris_df, outname=scatter_outname)
-    except TypeError as e:
-        display_exception(e)
-    except ValueError as e:
-        display_exception(e)
+        for file_idx, iris_data in enumerate(iris_data_files):
+            # manifest entry of each image: input hash, plot parameters and
+            # code version
+            input_hash = (
+                dp.hash_file(Path(iris_data))
+                if Path(iris_data).is_file()
+                else None
+            )
+            file_tasks = []
+            for plot_kind, suffix in _PLOT_SUFFIXES.items():
+                outname = f"{outnames[iris_data]}{suffix}"
+                image_path = Path(_get_image_name(outname, save_options))
+                manifest_path = image_path.parent / _MANIFEST_NAME
+                if manifest_path not in manifests:
+                    manifests[manifest_path] = _load_manifest(manifest_path)
+                image_entry = {
+                    "input_hash": input_hash,
+                    "plot": plot_kind,
+                    "density_threshold": args.density_threshold,
+                    "chunksize": args.chunksize,
+                    "save_options": save_options,
+                    "code_version": code_version,
+                }
+                image_entries[image_path] = image_entry
 
-    # -- generate merged boxplot and scatter plot in one figure
-    try:
-        merged_boxplot_and_scatter(iris_df=iris_df, outname=merge_outname)
-    except Exception as e:
+                # skipping images that are up to date
+                up_to_date = (
+                    input_hash is not None
+                    and image_path.is_file()
+                    and manifests[manifest_path].get(image_path.name)
+                    == image_entry
+                )
+                if up_to_date and not args.force:
+                    n_hits += 1
+                else:
+                    file_tasks.append((iris_data, plot_kind, outname))
+
+            # files with all images up to date are not loaded
+            if len(file_tasks) > 0:
+                try:
+                    plot_data[iris_data], n_file_rows = _load_plot_data(
+                        iris_data,
+                        cache=args.cache,
+                        cache_dir=args.cache_dir,
+                        density_threshold=args.density_threshold,
+                        chunksize=args.chunksize,
+                    )
+                    plot_tasks.extend(file_tasks)
+                    n_files += 1
+                    n_rows += n_file_rows
+                except (
+                    FileNotFoundError,
+                    PermissionError,
+                    RuntimeError,
+                    KeyError,
+                    TypeError,
+                    ValueError,
+                ) as e:
+
+                    # batches skip files that cannot be loaded
+                    if args.batch is None:
+                        display_exception(e)
+                    print(f"{iris_data}: {e.__class__.__name__}: {e}")
+                    failed_files.append(iris_data)
+
+            if (
+                len(plot_data) < args.jobs
+                and file_idx < len(iris_data_files) - 1
+            ):
+                continue
+
+            # generate plots: box plot, scatter plot and merged boxplot and
+            # scatter plot in one figure
+            for image_name in _render_plots(
+                plot_data,
+                plot_tasks,
+                jobs=args.jobs,
+                save_options=save_options,
+                executor=executor,
+            ):
+                image_path = Path(image_name)
+                manifests[image_path.parent / _MANIFEST_NAME][
+                    image_path.name
+                ] = image_entries[image_path]
+                n_misses += 1
+            plot_data = {}
+            plot_tasks = []
+    except (OSError, RuntimeError, ValueError) as e:
         display_exception(e)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        for manifest_path, manifest in manifests.items():
+            if n_misses > 0 and manifest_path.parent.is_dir():
+                _write_manifest(manifest_path, manifest)
+    print(f"Manifest: {n_hits} hits, {n_misses} misses")
+
+    # throughput summary of batches
+    if args.batch is not None:
+        elapsed_time = time.perf_counter() - start_time
+        print(
+            f"Processed {n_files} files ({n_rows} rows) in "
+            f"{elapsed_time:.2f} s: {n_files / elapsed_time:.2f} "
+            f"files/s, {n_rows / elapsed_time:.1f} rows/s"
+        )
+        if len(failed_files) > 0:
+            print(f"Failed to load {len(failed_files)} files")
+            sys.exit(1)
 
     print("Plotter complete!")
     sys.exit(0)
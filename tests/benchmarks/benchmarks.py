@@ -0,0 +1,633 @@
+"""
+Benchmarks for DataProc hot paths.
+
+Each benchmark returns a dictionary of measurements (timings are in seconds
+unless the name states otherwise) which are printed once the benchmark is
+completed. Run from this directory:
+
+    python benchmarks.py
+
+The scaling benchmarks time each hot path on synthetic iris files from 150
+to 10^7 rows. Results can be saved as JSON, together with the commit and
+library versions, and compared against the results of another commit:
+
+    python benchmarks.py --sizes 150 10000 -o results.json
+    python benchmarks.py --sizes 150 10000 --compare results.json
+
+"""
+import argparse
+import bz2
+import contextlib
+import gzip
+import inspect
+import io
+import json
+import lzma
+import platform
+import subprocess
+import sys
+import time
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+import data_processor as dp
+import plotter as pl
+
+
+def _eval_format_entry(entry: str):
+    """Previous entry conversion that relied on eval(). Used as a baseline
+    for comparison."""
+    if entry.isdigit():
+        return int(entry)
+    try:
+        return float(entry)
+    except ValueError:
+        try:
+            return eval(entry.capitalize())
+        except NameError:
+            return str(entry)
+
+
+# number of rows of the synthetic iris files of the scaling benchmarks
+_SCALING_SIZES = (150, 10_000, 1_000_000, 10_000_000)
+
+# largest files timed through python lists of every entry (python read
+# engine, _format_types), larger lists do not fit in memory
+_PYTHON_LIST_MAX_ROWS = 1_000_000
+
+# files above this number of rows are timed once instead of best of 3
+_SINGLE_RUN_ROWS = 1_000_000
+
+# synthetic iris files shared by the benchmarks, by number of rows
+_IRIS_FILES = {}
+
+# species of the synthetic iris data
+_SPECIES = ["Iris-setosa", "Iris-versicolor", "Iris-virginica"]
+
+
+def _best_time(func: Callable, repeat: int = 5, number: int = 1) -> float:
+    """Returns the best run time of `func` across `repeat` runs"""
+    return min(timeit.repeat(func, repeat=repeat, number=number)) / number
+
+
+def _get_repeat(n_rows: int) -> int:
+    """Returns the number of runs of scaling benchmarks on n_rows"""
+    return 1 if n_rows > _SINGLE_RUN_ROWS else 3
+
+
+def _get_iris_df(
+    n_rows: int, seed: int = 0, decimals: Optional[int] = 1
+) -> pd.DataFrame:
+    """Returns a synthetic iris dataframe, measurements are in [0, 10) and
+    have one decimal as in iris.data, or full precision if decimals is
+    None"""
+
+    rng = np.random.default_rng(seed)
+    measurements = rng.random((n_rows, 4)) * 10
+    if decimals is not None:
+        measurements = np.round(measurements, decimals)
+    iris_df = pd.DataFrame(measurements, columns=dp.IRIS_COLUMNS[:-1])
+    iris_df["iris_species"] = pd.Categorical(
+        rng.choice(_SPECIES, size=n_rows)
+    )
+
+    return iris_df
+
+
+def _get_iris_file(n_rows: int) -> Path:
+    """Writes a synthetic iris file of `_get_iris_df()` once per number of
+    rows, see `_remove_iris_files()`"""
+
+    if n_rows not in _IRIS_FILES:
+        save_path = Path(f"bench_iris_{n_rows}.data")
+        _get_iris_df(n_rows).to_csv(
+            save_path, header=False, index=False, float_format="%.1f"
+        )
+        _IRIS_FILES[n_rows] = save_path
+
+    return _IRIS_FILES[n_rows]
+
+
+def _remove_iris_files() -> None:
+    """Removes the synthetic iris files shared by the benchmarks"""
+
+    for save_path in _IRIS_FILES.values():
+        save_path.unlink(missing_ok=True)
+    _IRIS_FILES.clear()
+
+
+def bench_format_entry_strings(n_rows: int = 100_000) -> Dict[str, float]:
+    """Compares eval() based conversion against the literal parser on a
+    string heavy column"""
+
+    # string heavy column: mostly species names with a few literals
+    choices = _SPECIES + ["true"]
+    rng = np.random.default_rng(0)
+    column = rng.choice(choices, size=n_rows).tolist()
+
+    results = {
+        "eval_format_entry": _best_time(
+            lambda: [_eval_format_entry(entry) for entry in column]
+        ),
+        "literal_format_entry": _best_time(
+            lambda: [dp._format_entry(entry) for entry in column]
+        ),
+        "convert_column": _best_time(
+            lambda: dp._convert_column(np.array(column))
+        ),
+    }
+
+    return results
+
+
+def bench_write_matrix(
+    n_rows: int = 10_000, n_columns: int = 100
+) -> Dict[str, float]:
+    """Compares write_matrix_to_file engines on a 10^6 entry matrix"""
+
+    results = {}
+    for engine, precision in [("python", None), ("bulk", None), ("bulk", 6)]:
+        file_name = f"bench_mat_{engine}"
+        save_path = Path(f"{file_name}.csv")
+
+        def write_matrix():
+            save_path.unlink(missing_ok=True)
+            dp.write_matrix_to_file(
+                n_rows,
+                n_columns,
+                file_name,
+                engine=engine,
+                precision=precision,
+            )
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            results[f"{engine}_precision_{precision}"] = _best_time(
+                write_matrix, repeat=3
+            )
+        save_path.unlink()
+
+    return results
+
+
+def bench_matrix_dtypes(
+    n_rows: int = 10_000, n_columns: int = 1_000
+) -> Dict[str, float]:
+    """Measures seeded matrix generation time (s) and peak memory (MiB) for
+    each supported dtype"""
+
+    results = {}
+    for dtype in [np.float32, np.float64]:
+        dtype_name = np.dtype(dtype).name
+        results[f"{dtype_name}_seconds"] = _best_time(
+            lambda: dp.get_random_matrix(
+                n_rows, n_columns, seed=0, dtype=dtype
+            )
+        )
+
+        tracemalloc.start()
+        dp.get_random_matrix(n_rows, n_columns, seed=0, dtype=dtype)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[f"{dtype_name}_peak_mib"] = peak_bytes / 2**20
+
+    return results
+
+
+def bench_compressed_read(n_rows: int = 200_000) -> Dict[str, float]:
+    """Measures decode and parse throughput (MB of uncompressed data per
+    second) of read_data_file for each supported codec"""
+
+    content = _get_iris_file(n_rows).read_bytes()
+
+    codecs = {
+        "plain": lambda data: data,
+        "gzip": gzip.compress,
+        "bz2": bz2.compress,
+        "xz": lzma.compress,
+    }
+    if zstandard is not None:
+        codecs["zstd"] = zstandard.ZstdCompressor().compress
+
+    results = {}
+    for codec, compress in codecs.items():
+        save_path = Path(f"bench_iris_{codec}.data")
+        save_path.write_bytes(compress(content))
+        for engine in dp._READ_ENGINES:
+            seconds = _best_time(
+                lambda: dp.read_data_file(save_path, engine=engine), repeat=3
+            )
+            results[f"{codec}_{engine}_mb_per_s"] = (
+                len(content) / seconds / 1e6
+            )
+        save_path.unlink()
+
+    return results
+
+
+def bench_species_memory(n_rows: int = 1_000_000) -> Dict[str, float]:
+    """Measures the memory (MiB) of an iris dataframe with categorical and
+    object species, see `dp.get_memory_usage()`"""
+
+    iris_df = _get_iris_df(n_rows)
+
+    return {
+        f"{name}_mib": n_bytes / 2**20
+        for name, n_bytes in dp.get_memory_usage(iris_df).items()
+    }
+
+
+def bench_scatter_render(
+    sizes: Tuple[int, ...] = (10_000, 100_000, 1_000_000)
+) -> Dict[str, float]:
+    """Compares the time to draw and save the scatter plot with one marker
+    per row against the density plot"""
+
+    results = {}
+    for n_rows in sizes:
+        iris_df = _get_iris_df(n_rows, decimals=None)
+
+        for mode, density_threshold in [("points", n_rows), ("density", 0)]:
+            results[f"{mode}_{n_rows}"] = _best_time(
+                lambda: pl._save_scatter(
+                    pl._get_scatter_data(
+                        iris_df, density_threshold=density_threshold
+                    ),
+                    "bench_scatter",
+                ),
+                repeat=3,
+            )
+        Path("bench_scatter.png").unlink()
+
+    return results
+
+
+def bench_boxplot_stats(
+    n_rows: int = 1_000_000, chunksize: int = 100_000
+) -> Dict[str, float]:
+    """Compares box plot statistics computed from full columns
+    (matplotlib.cbook.boxplot_stats) against quantile sketches of chunks,
+    time (s) and peak memory (MiB)"""
+
+    iris_df = _get_iris_df(n_rows, decimals=None)
+    iris_chunks = [
+        iris_df.iloc[start:start + chunksize]
+        for start in range(0, n_rows, chunksize)
+    ]
+
+    def full_stats():
+        pl.cbook.boxplot_stats(
+            [iris_df[col_name].values for col_name in dp.IRIS_COLUMNS[:-1]]
+        )
+
+    def sketch_stats():
+        pl._get_boxplot_stats(iris_chunks)
+
+    results = {}
+    for name, func in [("full", full_stats), ("sketch", sketch_stats)]:
+        results[f"{name}_seconds"] = _best_time(func, repeat=3)
+        tracemalloc.start()
+        func()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[f"{name}_peak_mib"] = peak_bytes / 2**20
+
+    return results
+
+
+def bench_save_formats(n_rows: int = 50_000) -> Dict[str, float]:
+    """Compares the save time (s) and file size (KiB) of the merged plot for
+    each image format and png compression"""
+
+    iris_df = _get_iris_df(n_rows, decimals=None)
+    box_stats = pl._get_boxplot_stats(iris_df)
+    scatter_data = pl._get_scatter_data(iris_df)
+
+    settings = {
+        "png": {"file_format": "png"},
+        "png_fast": {"file_format": "png", "fast_png": True},
+        "png_dpi_50": {"file_format": "png", "dpi": 50},
+        "jpeg": {"file_format": "jpeg"},
+        "webp": {"file_format": "webp"},
+        "svg": {"file_format": "svg"},
+    }
+
+    results = {}
+    for name, setting in settings.items():
+        save_options = pl.get_save_options(**setting)
+        image_name = pl._get_image_name("bench_save", save_options)
+        results[f"{name}_seconds"] = _best_time(
+            lambda: pl._save_merged(
+                box_stats, scatter_data, "bench_save", save_options
+            ),
+            repeat=3,
+        )
+        results[f"{name}_kib"] = Path(image_name).stat().st_size / 2**10
+        Path(image_name).unlink()
+
+    return results
+
+
+def bench_read_memo(n_rows: int = 200_000) -> Dict[str, float]:
+    """Compares parsing a data file against memoized reads of the unchanged
+    file, time (s) and memo size (MiB)"""
+
+    save_path = _get_iris_file(n_rows)
+
+    dp.clear_read_memo()
+    results = {
+        "parse_seconds": _best_time(
+            lambda: dp.read_data_file(save_path), repeat=3
+        ),
+        "memoized_seconds": _best_time(
+            lambda: dp.read_data_file(save_path, memoize=True)
+        ),
+        "memo_mib": dp.get_read_memo_stats()["bytes"] / 2**20,
+    }
+    dp.clear_read_memo()
+
+    return results
+
+
+def bench_read_scaling(
+    sizes: Tuple[int, ...] = _SCALING_SIZES
+) -> Dict[str, Optional[float]]:
+    """Times read_data_file for each engine and the chunked python engine.
+    Files above _PYTHON_LIST_MAX_ROWS are not read whole by the python
+    engine (None)"""
+
+    engines = ["python", "c"]
+    if dp.pa_csv is not None:
+        engines.append("pyarrow")
+
+    results = {}
+    for n_rows in sizes:
+        save_path = _get_iris_file(n_rows)
+        repeat = _get_repeat(n_rows)
+        for engine in engines:
+            if engine == "python" and n_rows > _PYTHON_LIST_MAX_ROWS:
+                results[f"{engine}_{n_rows}"] = None
+                continue
+            results[f"{engine}_{n_rows}"] = _best_time(
+                lambda: dp.read_data_file(save_path, engine=engine),
+                repeat=repeat,
+            )
+        results[f"python_chunked_{n_rows}"] = _best_time(
+            lambda: sum(
+                len(chunk)
+                for chunk in dp.read_data_file(save_path, chunksize=100_000)
+            ),
+            repeat=repeat,
+        )
+
+    return results
+
+
+def bench_format_types_scaling(
+    sizes: Tuple[int, ...] = _SCALING_SIZES
+) -> Dict[str, Optional[float]]:
+    """Times _format_types on the split rows of iris files, up to
+    _PYTHON_LIST_MAX_ROWS rows (None above)"""
+
+    results = {}
+    for n_rows in sizes:
+        if n_rows > _PYTHON_LIST_MAX_ROWS:
+            results[f"format_types_{n_rows}"] = None
+            continue
+        with open(_get_iris_file(n_rows), "r") as infile:
+            data_content = [line.rstrip("\n").split(",") for line in infile]
+        results[f"format_types_{n_rows}"] = _best_time(
+            lambda: dp._format_types(data_content), repeat=_get_repeat(n_rows)
+        )
+        del data_content
+
+    return results
+
+
+def bench_dimensions_scaling(
+    sizes: Tuple[int, ...] = _SCALING_SIZES
+) -> Dict[str, float]:
+    """Times get_file_dimensions on iris files"""
+
+    results = {}
+    for n_rows in sizes:
+        save_path = _get_iris_file(n_rows)
+        results[f"dimensions_{n_rows}"] = _best_time(
+            lambda: dp.get_file_dimensions(str(save_path)),
+            repeat=_get_repeat(n_rows),
+        )
+
+    return results
+
+
+def bench_matrix_scaling(
+    sizes: Tuple[int, ...] = _SCALING_SIZES, n_columns: int = 5
+) -> Dict[str, float]:
+    """Times seeded get_random_matrix and the bulk csv write_matrix_to_file
+    for matrices with the rows of each iris file size"""
+
+    results = {}
+    for n_rows in sizes:
+        repeat = _get_repeat(n_rows)
+        results[f"random_matrix_{n_rows}"] = _best_time(
+            lambda: dp.get_random_matrix(n_rows, n_columns, seed=0),
+            repeat=repeat,
+        )
+
+        file_name = f"bench_mat_{n_rows}"
+        save_path = Path(f"{file_name}.csv")
+
+        def write_matrix():
+            save_path.unlink(missing_ok=True)
+            dp.write_matrix_to_file(
+                n_rows, n_columns, file_name, engine="bulk", seed=0
+            )
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            results[f"write_matrix_{n_rows}"] = _best_time(
+                write_matrix, repeat=repeat
+            )
+        save_path.unlink()
+
+    return results
+
+
+def bench_plot_scaling(
+    sizes: Tuple[int, ...] = _SCALING_SIZES
+) -> Dict[str, float]:
+    """Times each plotting function, from a parsed dataframe to the saved
+    png image"""
+
+    plot_funcs = {
+        "boxplot": pl.create_iris_boxplot,
+        "scatter": pl.petal_width_v_length_scatter,
+        "merged": pl.merged_boxplot_and_scatter,
+    }
+
+    results = {}
+    for n_rows in sizes:
+        iris_df = dp.read_data_file(_get_iris_file(n_rows), engine="c")
+        for plot_kind, plot_func in plot_funcs.items():
+            results[f"{plot_kind}_{n_rows}"] = _best_time(
+                lambda: plot_func(iris_df, "bench_plot"),
+                repeat=_get_repeat(n_rows),
+            )
+            pl.plt.close("all")
+        Path("bench_plot.png").unlink()
+        del iris_df
+
+    return results
+
+
+def _get_git_commit() -> Optional[str]:
+    """Returns the commit of the benchmarked code, None outside of git"""
+
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(dp.__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+
+    return result.stdout.strip()
+
+
+def _compare_results(
+    results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any]
+) -> None:
+    """Prints the ratio of each measurement to the same measurement of
+    saved baseline results, ratios above 1 are slower or larger"""
+
+    print(f"compared to {baseline.get('commit')}:")
+    for benchmark_name, measurements in results.items():
+        baseline_measurements = baseline["results"].get(benchmark_name, {})
+        for name, value in measurements.items():
+            baseline_value = baseline_measurements.get(name)
+            if value is None or not baseline_value:
+                continue
+            print(
+                f"  {benchmark_name}.{name:<30} {value / baseline_value:.3f}x"
+            )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    benchmarks = [
+        bench_format_entry_strings,
+        bench_write_matrix,
+        bench_matrix_dtypes,
+        bench_compressed_read,
+        bench_species_memory,
+        bench_scatter_render,
+        bench_boxplot_stats,
+        bench_save_formats,
+        bench_read_memo,
+        bench_read_scaling,
+        bench_format_types_scaling,
+        bench_dimensions_scaling,
+        bench_matrix_scaling,
+        bench_plot_scaling,
+    ]
+    benchmark_names = [benchmark.__name__ for benchmark in benchmarks]
+
+    # CLI arguments
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-b",
+        "--benchmarks",
+        dest="benchmarks",
+        nargs="+",
+        choices=benchmark_names,
+        default=benchmark_names,
+        help="benchmarks to run, by default all",
+    )
+    parser.add_argument(
+        "--sizes",
+        dest="sizes",
+        nargs="+",
+        type=int,
+        default=list(_SCALING_SIZES),
+        help="number of rows of the synthetic iris files of the scaling "
+        "benchmarks",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        dest="output",
+        default=None,
+        help="JSON file the results are saved to",
+    )
+    parser.add_argument(
+        "--compare",
+        dest="compare",
+        default=None,
+        help="JSON file of saved results to compare against",
+    )
+    args = parser.parse_args(argv)
+    if any(n_rows < 1 for n_rows in args.sizes):
+        parser.error("--sizes must be positive integers")
+
+    results = {}
+    try:
+        for benchmark in benchmarks:
+            if benchmark.__name__ not in args.benchmarks:
+                continue
+            kwargs = {}
+            if "sizes" in inspect.signature(benchmark).parameters:
+                kwargs["sizes"] = tuple(args.sizes)
+
+            print(f"{benchmark.__name__}:")
+            results[benchmark.__name__] = benchmark(**kwargs)
+            for name, value in results[benchmark.__name__].items():
+                if value is None:
+                    print(f"  {name:<30} skipped")
+                else:
+                    print(f"  {name:<30} {value:.6f}")
+    finally:
+        _remove_iris_files()
+
+    saved_results = {
+        "commit": _get_git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "versions": {
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "matplotlib": pl.plt.matplotlib.__version__,
+        },
+        "sizes": args.sizes,
+        "results": results,
+    }
+    if args.output is not None:
+        with open(args.output, "w") as outfile:
+            json.dump(saved_results, outfile, indent=2)
+        print(f"Results saved to {args.output}")
+    if args.compare is not None:
+        with open(args.compare, "r") as infile:
+            _compare_results(results, json.load(infile))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
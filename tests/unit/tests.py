@@ -1,14 +1,28 @@
+import asyncio
+import bz2
+import gzip
 import hashlib
+import lzma
 import os
 import pickle
 import random
+import shutil
+import subprocess
+import sys
 import unittest
 from pathlib import Path
+from typing import Dict
 
 import numpy as np
 import pandas as pd
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 import data_processor as dp
+import plot_server as ps
 import plotter as pl
 
 
@@ -80,6 +94,83 @@ class TestMatrixGeneration(unittest.TestCase):
 
         self.assertRaises(ValueError, dp.get_random_matrix, n_rows, n_cols)
 
+    def test_make_seeded_matrix(self) -> None:
+        """Seeded matrices are the same regardless of the number of workers
+        and can be written into a preallocated array"""
+
+        n_rows = 1000
+        n_cols = 200
+
+        expected_mat = dp.get_random_matrix(n_rows, n_cols, seed=42, workers=1)
+        out_mat = np.empty((n_rows, n_cols))
+        test_mat = dp.get_random_matrix(
+            n_rows, n_cols, seed=42, out=out_mat, workers=4
+        )
+        other_mat = dp.get_random_matrix(n_rows, n_cols, seed=7)
+
+        self.assertIs(test_mat, out_mat)
+        np.testing.assert_array_equal(expected_mat, test_mat)
+        self.assertFalse(np.array_equal(expected_mat, other_mat))
+        self.assertTrue(((test_mat >= 0) & (test_mat < 1)).all())
+
+    def test_make_matrix_seed_types(self) -> None:
+        """Seeds can be numpy integers and Generators, matrices without a
+        seed are written into a preallocated array in place"""
+
+        expected_mat = dp.get_random_matrix(50, 20, seed=3)
+        np.testing.assert_array_equal(
+            dp.get_random_matrix(50, 20, seed=np.int64(3)), expected_mat
+        )
+
+        gen_mat_1 = dp.get_random_matrix(
+            50, 20, seed=np.random.default_rng(3)
+        )
+        gen_mat_2 = dp.get_random_matrix(
+            50, 20, seed=np.random.default_rng(3)
+        )
+        generator = np.random.default_rng(3)
+        first_mat = dp.get_random_matrix(50, 20, seed=generator)
+        second_mat = dp.get_random_matrix(50, 20, seed=generator)
+        np.testing.assert_array_equal(gen_mat_1, gen_mat_2)
+        np.testing.assert_array_equal(gen_mat_1, first_mat)
+        self.assertFalse(np.array_equal(first_mat, second_mat))
+
+        out_mat = np.empty((50, 20))
+        np.random.seed(42)
+        test_mat = dp.get_random_matrix(50, 20, out=out_mat)
+        np.random.seed(42)
+        other_mat = dp.get_random_matrix(50, 20, out=np.empty((50, 20)))
+        self.assertIs(test_mat, out_mat)
+        np.testing.assert_array_equal(test_mat, other_mat)
+        self.assertTrue(((test_mat >= 0) & (test_mat < 1)).all())
+
+    def test_make_seeded_matrix_bad_inputs(self) -> None:
+        """Checks for exceptions with bad seed, out and workers inputs"""
+
+        self.assertRaises(TypeError, dp.get_random_matrix, 10, 10, seed="42")
+        self.assertRaises(TypeError, dp.get_random_matrix, 10, 10, seed=4.2)
+        self.assertRaises(
+            ValueError, dp.get_random_matrix, 10, 10, out=np.empty((5, 10))
+        )
+        self.assertRaises(
+            ValueError, dp.get_random_matrix, 10, 10, seed=42, workers=0
+        )
+
+    def test_make_float32_matrix(self) -> None:
+        """Generates float32 matrices with and without a seed"""
+
+        seeded_mat = dp.get_random_matrix(10, 10, seed=42, dtype=np.float32)
+        np.random.seed(42)
+        global_mat_1 = dp.get_random_matrix(10, 10, dtype=np.float32)
+        np.random.seed(42)
+        global_mat_2 = dp.get_random_matrix(10, 10, dtype=np.float32)
+
+        self.assertEqual(seeded_mat.dtype, np.float32)
+        np.testing.assert_array_equal(global_mat_1, global_mat_2)
+        self.assertRaises(
+            ValueError, dp.get_random_matrix, 10, 10, dtype=np.int64
+        )
+
     def test_making_multiple_matrix(self) -> None:
         """Generates 100 matrices and checks for type and shape. There is a
         10% probability where one of the inputs will be a float"""
@@ -207,6 +298,60 @@ class TestIO(unittest.TestCase):
 
         self.assertEqual(expected_formatted_conts, test_conts)
 
+    def test_type_converts_3(self) -> None:
+        """Column-wise conversion matches converting each entry on its own,
+        including columns that fall back to per entry conversion"""
+
+        unformated_conts = [
+            ["6.4", "8", "nan", "6", "Iris-setosa"],
+            ["5.9", "1.3", "none", "8", "Iris-setosa"],
+            ["4.2", "8.1", "8.6", "9", "Iris-versicolor"],
+        ]
+
+        expected_formatted_conts = [
+            [dp._format_entry(entry) for entry in row]
+            for row in unformated_conts
+        ]
+        test_conts = dp._format_types(unformated_conts)
+
+        self.assertEqual(str(expected_formatted_conts), str(test_conts))
+        for expected_row, test_row in zip(
+            expected_formatted_conts, test_conts
+        ):
+            self.assertEqual(
+                [type(entry) for entry in expected_row],
+                [type(entry) for entry in test_row],
+            )
+
+    def test_convert_column_types(self) -> None:
+        """Checks that single typed columns are converted into numpy arrays"""
+
+        int_col = dp._convert_column(np.array(["1", "2", "3"]))
+        float_col = dp._convert_column(np.array(["1.5", "2.0", "3e2"]))
+        bool_col = dp._convert_column(np.array(["true", "False", "True"]))
+        str_col = dp._convert_column(np.array(["Iris-setosa", "Iris-setosa"]))
+
+        self.assertEqual(int_col.dtype, np.int64)
+        self.assertEqual(float_col.dtype, np.float64)
+        self.assertEqual(bool_col.tolist(), [True, False, True])
+        self.assertEqual(str_col.tolist(), ["Iris-setosa", "Iris-setosa"])
+
+    def test_format_entry_literals(self) -> None:
+        """Checks that literal spellings are parsed without evaluating any
+        code and unknown entries are kept as strings"""
+
+        self.assertIs(dp._format_entry("true"), True)
+        self.assertIs(dp._format_entry("FALSE"), False)
+        self.assertIsNone(dp._format_entry("None"))
+        self.assertEqual(dp._format_entry("-Infinity"), float("-inf"))
+        self.assertTrue(np.isnan(dp._format_entry("NaN")))
+        self.assertEqual(dp._format_entry("1e-3"), 0.001)
+        self.assertEqual(dp._format_entry(".5"), 0.5)
+        self.assertEqual(dp._format_entry("1+2"), "1+2")
+        self.assertEqual(
+            dp._format_entry("__import__('os')"), "__import__('os')"
+        )
+
     def test_loading_datafile(self) -> None:
         """Tests loading in datafile, and checks if the loaded contents is
         the same as the expected contents. Check data structure and integrity
@@ -231,6 +376,9 @@ class TestIO(unittest.TestCase):
         ]
 
         expected_df = pd.DataFrame(data=expected_conts, columns=cols)
+        expected_df["iris_species"] = expected_df["iris_species"].astype(
+            "category"
+        )
         expected_types = expected_df.dtypes.values.tolist()
 
         #
@@ -244,6 +392,204 @@ class TestIO(unittest.TestCase):
         self.assertEqual(expected_types, test_types)
         self.assertEqual(cols, loaded_conts.columns.tolist())
 
+    def test_loading_datafile_missing_entries(self) -> None:
+        """Rows with missing entries are padded with NaN, rows with more
+        entries than the iris columns raise ValueError"""
+        data_file_path = "raggedfile.data"
+
+        with open(data_file_path, "w") as f:
+            f.write("6.4,8.4,2.2,6.8,Iris-setosa\n5.9,1.3,2.3\n")
+        try:
+            iris_df = dp.read_data_file(data_file_path)
+        finally:
+            os.remove(data_file_path)
+
+        self.assertEqual(iris_df.shape, (2, 5))
+        self.assertEqual(iris_df.iloc[1, :3].tolist(), [5.9, 1.3, 2.3])
+        self.assertTrue(iris_df.iloc[1, 3:].isna().all())
+
+        with open(data_file_path, "w") as f:
+            f.write("6.4,8.4,2.2,6.8,Iris-setosa,1.0\n")
+        try:
+            self.assertRaises(ValueError, dp.read_data_file, data_file_path)
+        finally:
+            os.remove(data_file_path)
+
+    def test_loading_datafile_chunks(self) -> None:
+        """Loads datafile in chunks and checks that the concatenated chunks
+        are the same as loading the whole file"""
+        data_file_path = "datafile.data"
+
+        expected_df = dp.read_data_file(data_file_path)
+        chunks = list(dp.read_data_file(data_file_path, chunksize=4))
+
+        # each chunk holds the species categories found in the chunk
+        test_df = pd.concat(chunks).astype({"iris_species": "category"})
+
+        self.assertEqual([len(chunk) for chunk in chunks], [4, 2])
+        self.assertTrue(expected_df.equals(test_df))
+
+    def test_loading_datafile_categorical_species(self) -> None:
+        """Species are loaded as a categorical column and use less memory
+        than python strings"""
+        data_file_path = "datafile.data"
+
+        test_df = dp.read_data_file(data_file_path)
+        species = test_df["iris_species"]
+
+        self.assertIsInstance(species.dtype, pd.CategoricalDtype)
+        self.assertEqual(
+            species.cat.categories.tolist(),
+            ["Iris-setosa", "Iris-versicolor", "Iris-virginica"],
+        )
+
+        memory_usage = dp.get_memory_usage(test_df)
+        self.assertGreater(memory_usage["saved_bytes"], 0)
+        self.assertEqual(
+            memory_usage["object_bytes"] - memory_usage["bytes"],
+            memory_usage["saved_bytes"],
+        )
+        self.assertRaises(TypeError, dp.get_memory_usage, "notadataframe")
+
+    def test_quantile_sketch(self) -> None:
+        """Quantiles of small sketches are exact, merged sketches of chunks
+        estimate the quantiles of all chunks"""
+
+        rng = np.random.default_rng(0)
+        quantiles = [0.0, 0.25, 0.5, 0.75, 1.0]
+
+        values = rng.normal(size=500)
+        values[10] = np.nan
+        sketch = dp.get_quantile_sketch(values)
+        self.assertEqual(sketch["count"], 499)
+        np.testing.assert_allclose(
+            dp.get_sketch_quantiles(sketch, quantiles),
+            np.nanquantile(values, quantiles),
+        )
+
+        values = rng.lognormal(size=100_000)
+        sketch = dp.merge_quantile_sketches(
+            dp.get_quantile_sketch(chunk)
+            for chunk in np.array_split(values, 10)
+        )
+        self.assertEqual(sketch["count"], len(values))
+        self.assertLessEqual(len(sketch["values"]), 1024)
+        self.assertEqual(len(sketch["highest"]), 128)
+        self.assertEqual(sketch["max"], values.max())
+        np.testing.assert_allclose(
+            dp.get_sketch_quantiles(sketch, quantiles),
+            np.quantile(values, quantiles),
+            rtol=1e-2,
+        )
+
+        empty_sketch = dp.merge_quantile_sketches([])
+        self.assertEqual(empty_sketch["count"], 0)
+        self.assertTrue(
+            np.isnan(dp.get_sketch_quantiles(empty_sketch, [0.5])).all()
+        )
+
+    def test_loading_datafile_bad_chunksize(self) -> None:
+        """Checks for exceptions if chunksize is not a positive integer"""
+        data_file_path = "datafile.data"
+
+        self.assertRaises(
+            TypeError, dp.read_data_file, data_file_path, chunksize=1.5
+        )
+        self.assertRaises(
+            ValueError, dp.read_data_file, data_file_path, chunksize=0
+        )
+
+    def test_loading_datafile_float32(self) -> None:
+        """Loads float columns of the datafile as float32"""
+        data_file_path = "datafile.data"
+
+        expected_df = dp.read_data_file(data_file_path)
+        test_df = dp.read_data_file(data_file_path, dtype=np.float32)
+
+        self.assertTrue(
+            (test_df.dtypes.iloc[:-1] == np.float32).all(),
+        )
+        np.testing.assert_allclose(
+            expected_df.iloc[:, :-1].values, test_df.iloc[:, :-1].values
+        )
+
+    def test_loading_cached_datafile(self) -> None:
+        """Loads datafile through the on-disk cache and checks that modified
+        files are parsed again"""
+        data_file_path = "datafile.data"
+        cache_dir = "test_cache"
+
+        expected_df = dp.read_data_file(data_file_path)
+        first_df = dp.read_cached_data_file(data_file_path, cache_dir)
+        cached_df = dp.read_cached_data_file(data_file_path, cache_dir)
+
+        # modifying data file
+        with open(data_file_path, "a") as f:
+            f.write("1.0,2.0,3.0,4.0,Iris-setosa\n")
+        modified_df = dp.read_cached_data_file(data_file_path, cache_dir)
+        shutil.rmtree(cache_dir)
+
+        self.assertTrue(expected_df.equals(first_df))
+        self.assertTrue(expected_df.equals(cached_df))
+        self.assertEqual(len(modified_df), len(expected_df) + 1)
+
+    def test_loading_cached_datafile_engines(self) -> None:
+        """Cache entries are kept per engine and files that cannot be
+        stored in the cache are returned uncached"""
+        data_file_path = "cachefile.data"
+        cache_dir = "test_cache"
+        with open(data_file_path, "w") as f:
+            f.write("5.1,3.5,1.4,,Iris-setosa\n")
+            f.write("4.9,3.0,1.4,0.2,Iris-setosa\n")
+        self.addCleanup(os.remove, data_file_path)
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+
+        for engine in dp._READ_ENGINES:
+            with self.subTest(engine=engine):
+                expected_df = dp.read_data_file(data_file_path, engine=engine)
+                for _ in range(2):
+                    test_df = dp.read_cached_data_file(
+                        data_file_path, cache_dir, engine=engine
+                    )
+                    pd.testing.assert_frame_equal(test_df, expected_df)
+
+        # the python engine keeps the empty field as a string in an object
+        # column, which is not cached
+        cache_names = sorted(path.name for path in Path(cache_dir).iterdir())
+        self.assertEqual(len(cache_names), len(dp._READ_ENGINES) - 1)
+        self.assertFalse(any("-python-" in name for name in cache_names))
+
+    def test_loading_multiple_datafiles(self) -> None:
+        """Loads multiple files in parallel, keeping their order and
+        collecting errors of files that cannot be loaded"""
+        data_file_path = "datafile.data"
+        bad_file_path = "datafile_bad_cols.data"
+        with open(bad_file_path, "w") as f:
+            f.write("1,2,3\n")
+
+        paths = [data_file_path, "notafile.data", bad_file_path]
+        expected_df = dp.read_data_file(data_file_path)
+        for workers in [1, 2]:
+            test_df, errors = dp.read_data_files(
+                paths + [data_file_path], workers=workers
+            )
+
+            self.assertEqual(len(test_df), 2 * len(expected_df))
+            self.assertEqual(
+                test_df.columns.tolist(), dp.IRIS_COLUMNS + ["source_file"]
+            )
+            self.assertEqual(
+                test_df[dp.IRIS_COLUMNS].values.tolist(),
+                2 * expected_df.values.tolist(),
+            )
+            self.assertEqual(
+                set(test_df["source_file"].tolist()), {data_file_path}
+            )
+            self.assertIsInstance(errors["notafile.data"], FileNotFoundError)
+            self.assertIsInstance(errors[bad_file_path], ValueError)
+
+        os.remove(bad_file_path)
+
     def test_load_datafile_not_exists(self) -> None:
         """Checks for exceptions if the file does not exists"""
         file_not_exist = "notafile.data"
@@ -299,6 +645,109 @@ class TestIO(unittest.TestCase):
             # removing generated file
             os.remove(str(test_path))
 
+    def test_writing_random_matrix_bulk(self) -> None:
+        """Checks that the bulk engine writes the same contents as the python
+        engine"""
+
+        # writing the same matrix with both engines
+        for engine in ["python", "bulk"]:
+            np.random.seed(42)
+            dp.write_matrix_to_file(25, 7, f"test_mat_{engine}", engine=engine)
+
+        with open("test_mat_python.csv") as f:
+            expected_conts = f.read()
+        with open("test_mat_bulk.csv") as f:
+            test_conts = f.read()
+        os.remove("test_mat_python.csv")
+        os.remove("test_mat_bulk.csv")
+
+        self.assertEqual(expected_conts, test_conts)
+
+    def test_writing_matrix_blocks(self) -> None:
+        """Writes a matrix that is provided in blocks of rows with a set
+        precision"""
+
+        matrix = np.random.rand(10, 3)
+        blocks = (matrix[start:start + 4] for start in range(0, 10, 4))
+        dp.write_matrix_blocks(blocks, "test_mat_blocks", precision=3)
+
+        test_mat = np.loadtxt("test_mat_blocks.csv", delimiter=",")
+        os.remove("test_mat_blocks.csv")
+
+        self.assertEqual(test_mat.shape, (10, 3))
+        np.testing.assert_allclose(test_mat, matrix, rtol=5e-3)
+
+    def test_writing_matrix_bad_engine(self) -> None:
+        """Checks for exceptions if an unsupported engine is provided"""
+
+        self.assertRaises(
+            ValueError,
+            dp.write_matrix_to_file,
+            10,
+            10,
+            "test_mat",
+            engine="rust",
+        )
+
+    def test_writing_binary_matrix(self) -> None:
+        """Writes matrices in binary formats and loads them back as
+        memory-maps"""
+
+        for file_format in ["npy", "raw"]:
+            np.random.seed(42)
+            dp.write_matrix_to_file(
+                25, 7, "test_mat", block_rows=10, file_format=file_format
+            )
+            np.random.seed(42)
+            expected_mat = np.concatenate(
+                [np.random.rand(n_rows, 7) for n_rows in [10, 10, 5]]
+            )
+
+            test_mat = dp.load_matrix_file(f"test_mat.{file_format}", 7)
+            self.assertIsInstance(test_mat, np.memmap)
+            self.assertFalse(test_mat.flags.writeable)
+            np.testing.assert_array_equal(expected_mat, test_mat)
+
+            del test_mat
+            os.remove(f"test_mat.{file_format}")
+
+    def test_writing_float32_matrix(self) -> None:
+        """Writes float32 matrices and reads them back without loss"""
+
+        expected_mat = dp.get_random_matrix(20, 5, seed=7, dtype=np.float32)
+        for file_format in ["csv", "npy"]:
+            dp.write_matrix_to_file(
+                20,
+                5,
+                "test_mat_f32",
+                file_format=file_format,
+                seed=7,
+                dtype=np.float32,
+                engine="bulk",
+                block_rows=3,
+            )
+
+        csv_mat = np.loadtxt("test_mat_f32.csv", delimiter=",", dtype="f4")
+        npy_mat = dp.load_matrix_file("test_mat_f32.npy")
+
+        np.testing.assert_array_equal(expected_mat, csv_mat)
+        np.testing.assert_array_equal(expected_mat, npy_mat)
+        self.assertEqual(npy_mat.dtype, np.float32)
+
+        del npy_mat
+        os.remove("test_mat_f32.csv")
+        os.remove("test_mat_f32.npy")
+
+    def test_loading_raw_matrix_bad_columns(self) -> None:
+        """Checks for exceptions if a raw matrix file does not match the
+        provided number of columns"""
+
+        dp.write_matrix_to_file(3, 3, "test_mat", file_format="raw")
+
+        self.assertRaises(ValueError, dp.load_matrix_file, "test_mat.raw")
+        self.assertRaises(ValueError, dp.load_matrix_file, "test_mat.raw", 4)
+        os.remove("test_mat.raw")
+
     def test_file_exists(self) -> None:
         """Test whether a file exists"""
 
@@ -321,6 +770,47 @@ class TestIO(unittest.TestCase):
         test_shape = dp.get_file_dimensions(csv_file)
         self.assertEqual(test_shape, expected_shape)
 
+    def test_shape_blank_rows(self) -> None:
+        """Checks that rows with no data are skipped when counting rows"""
+        csv_file = "datafile_blank_rows.data"
+
+        with open(csv_file, "w") as f:
+            f.write("\n1.0,2.0,3.0\n\n4.0,5.0,6.0\n\n7.0,8.0,9.0")
+
+        test_shape = dp.get_file_dimensions(csv_file)
+        os.remove(csv_file)
+
+        self.assertEqual(test_shape, (3, 3))
+
+    def test_shape_empty_file(self) -> None:
+        """Files with no data have the same shape as the loaded dataframe"""
+        csv_file = "datafile_empty.data"
+
+        with open(csv_file, "w") as f:
+            f.write("\n\n")
+
+        test_shape = dp.get_file_dimensions(csv_file)
+        expected_shape = dp.read_data_file(csv_file).shape
+        os.remove(csv_file)
+
+        self.assertEqual(test_shape, (0, 5))
+        self.assertEqual(test_shape, expected_shape)
+
+    def test_count_rows_across_blocks(self) -> None:
+        """Counts rows when rows are split across multiple blocks"""
+
+        data = np.frombuffer(
+            b"1.0,2.0,Iris-setosa\n\n3.0,4.0,Iris-setosa\n5.0,6.0,x",
+            dtype=np.uint8,
+        )
+
+        for block_size in range(1, data.size + 1):
+            blocks = [
+                data[start:start + block_size]
+                for start in range(0, data.size, block_size)
+            ]
+            self.assertEqual(dp._count_data_rows(blocks), 3)
+
     def test_shape_file_not_exists(self) -> None:
         """Tests file not found exception in get_file_dimensions"""
 
@@ -383,6 +873,343 @@ class TestIO(unittest.TestCase):
         os.remove(cls.file_no_permission)
 
 
+class TestReadEngines(unittest.TestCase):
+    """Test class checks that all parsing engines of read_data_file return
+    the same contents and raise the same exceptions"""
+
+    engines = ["python", "c", "pyarrow"]
+
+    def assert_engines_match(self, data_file_path: str, **kwargs) -> None:
+        """Reads a file with all engines and compares them to the python
+        engine"""
+
+        expected_df = dp.read_data_file(
+            data_file_path, engine="python", **kwargs
+        )
+        for engine in self.engines[1:]:
+            test_df = dp.read_data_file(
+                data_file_path, engine=engine, **kwargs
+            )
+
+            self.assertEqual(expected_df.columns.tolist(), dp.IRIS_COLUMNS)
+            self.assertEqual(
+                expected_df.columns.tolist(), test_df.columns.tolist()
+            )
+            self.assertEqual(
+                expected_df.index.tolist(), test_df.index.tolist()
+            )
+            self.assertEqual(
+                expected_df.dtypes.tolist(), test_df.dtypes.tolist()
+            )
+            self.assertEqual(
+                expected_df.values.tolist(), test_df.values.tolist()
+            )
+
+    def test_engines_datafile(self) -> None:
+        """All engines load the same datafile contents"""
+        self.assert_engines_match(self.datafile)
+
+    def test_engines_blank_rows(self) -> None:
+        """All engines skip rows with no data"""
+        self.assert_engines_match(self.blank_rows_file)
+
+    def test_engines_title_and_whitespace_rows(self) -> None:
+        """All engines skip title and whitespace-only rows and keep "NA"
+        species as strings"""
+
+        self.assert_engines_match(self.title_rows_file)
+        for engine in self.engines:
+            test_chunks = list(
+                dp.read_data_file(
+                    self.title_rows_file, chunksize=2, engine=engine
+                )
+            )
+            test_df = pd.concat(test_chunks)
+            self.assertEqual(
+                (len(test_df), test_df.shape[1]),
+                dp.get_file_dimensions(self.title_rows_file),
+            )
+            self.assertEqual(test_df["iris_species"].tolist()[1], "NA")
+
+    def test_engines_int_and_bool_columns(self) -> None:
+        """All engines infer integer and bool columns"""
+        self.assert_engines_match(self.typed_file)
+
+    def test_engines_categorical_species(self) -> None:
+        """All engines parse species as a categorical column, and a species
+        column of numbers the same way as the python engine"""
+
+        for engine in self.engines:
+            iris_df = dp.read_data_file(self.datafile, engine=engine)
+            self.assertIsInstance(
+                iris_df["iris_species"].dtype, pd.CategoricalDtype
+            )
+
+        data_file_path = "engines_numeric_species.data"
+        with open(data_file_path, "w") as f:
+            f.write("1,2.5,3,4,5\n6,7.5,8,9,10\n")
+        try:
+            self.assert_engines_match(data_file_path)
+        finally:
+            os.remove(data_file_path)
+
+    def test_engines_float32(self) -> None:
+        """All engines load float columns as float32"""
+        self.assert_engines_match(self.datafile, dtype=np.float32)
+
+    def test_engines_empty_file(self) -> None:
+        """All engines load files with no data"""
+        self.assert_engines_match(self.empty_file)
+
+    def test_engines_chunks(self) -> None:
+        """All engines return the same chunks"""
+
+        expected_chunks = list(
+            dp.read_data_file(self.blank_rows_file, chunksize=2)
+        )
+        for engine in self.engines[1:]:
+            test_chunks = list(
+                dp.read_data_file(
+                    self.blank_rows_file, chunksize=2, engine=engine
+                )
+            )
+
+            self.assertEqual(len(expected_chunks), len(test_chunks))
+            for expected_df, test_df in zip(expected_chunks, test_chunks):
+                self.assertTrue(expected_df.equals(test_df))
+
+    def test_engines_file_not_exists(self) -> None:
+        """All engines raise FileNotFoundError for missing files"""
+        for engine in self.engines:
+            self.assertRaises(
+                FileNotFoundError,
+                dp.read_data_file,
+                "notafile.data",
+                engine=engine,
+            )
+
+    def test_engines_wrong_number_of_columns(self) -> None:
+        """All engines raise ValueError if the number of columns does not
+        match the iris columns"""
+        data_file_path = "engines_seven_cols.data"
+        with open(data_file_path, "w") as f:
+            f.write("1,2,3,4,5,6,7\n1,2,3,4,5\n")
+        self.addCleanup(os.remove, data_file_path)
+
+        for engine in self.engines:
+            for test_file in [self.six_cols_file, data_file_path]:
+                self.assertRaises(
+                    ValueError,
+                    dp.read_data_file,
+                    test_file,
+                    engine=engine,
+                )
+
+    def test_unsupported_engine(self) -> None:
+        """Checks for exceptions if an unsupported engine is provided"""
+        self.assertRaises(
+            ValueError, dp.read_data_file, self.datafile, engine="rust"
+        )
+
+    def test_engines_compressed_files(self) -> None:
+        """All engines load compressed files with the same contents and
+        dimensions as the uncompressed file"""
+
+        expected_df = dp.read_data_file(self.blank_rows_file)
+        expected_dimensions = dp.get_file_dimensions(self.blank_rows_file)
+        for compressed_file in self.compressed_files:
+            self.assert_engines_match(compressed_file)
+            for engine in self.engines:
+                test_chunks = dp.read_data_file(
+                    compressed_file, chunksize=2, engine=engine
+                )
+                test_df = pd.concat(test_chunks).astype(
+                    {"iris_species": "category"}
+                )
+                self.assertTrue(expected_df.equals(test_df))
+            self.assertTrue(
+                expected_df.equals(dp.read_data_file(compressed_file))
+            )
+            self.assertEqual(
+                expected_dimensions, dp.get_file_dimensions(compressed_file)
+            )
+
+    @classmethod
+    def setUp(cls) -> None:
+
+        # generating file names
+        cls.datafile = "engines_datafile.data"
+        cls.blank_rows_file = "engines_blank_rows.data"
+        cls.typed_file = "engines_typed.data"
+        cls.empty_file = "engines_empty.data"
+        cls.six_cols_file = "engines_six_cols.data"
+        cls.title_rows_file = "engines_title_rows.data"
+
+        # generating random iris data
+        random.seed(42)
+        species = ["Iris-setosa", "Iris-versicolor", "Iris-virginica"]
+        with open(cls.datafile, "w") as f:
+            for idx in range(30):
+                rand_entries = [
+                    str(round(random.random() * 10, 1)) for _ in range(4)
+                ]
+                entries_str = ",".join(rand_entries)
+                f.write(f"{entries_str},{species[idx % 3]}\n")
+
+        with open(cls.blank_rows_file, "w") as f:
+            f.write("\n5.1,3.5,1.4,0.2,Iris-setosa\n\n\n")
+            f.write("4.9,3.0,1.4,0.2,Iris-setosa\n")
+            f.write("7.0,3.2,4.7,1.4,Iris-versicolor\n\n")
+            f.write("6.3,3.3,6.0,2.5,Iris-virginica")
+
+        with open(cls.typed_file, "w") as f:
+            f.write("1,2.5,true,3,Iris-setosa\n")
+            f.write("4,5.5,False,6,Iris-versicolor\n")
+
+        with open(cls.empty_file, "w") as f:
+            f.write("\n\n")
+
+        with open(cls.six_cols_file, "w") as f:
+            f.write("1,2,3,4,5,6\n")
+
+        with open(cls.title_rows_file, "w") as f:
+            f.write("Iris data\n5.1,3.5,1.4,0.2,Iris-setosa\n   \n")
+            f.write("4.9,3.0,1.4,0.2,NA\n\t\n")
+            f.write("6.3,3.3,6.0,2.5,Iris-virginica\n")
+
+        # compressed copies of the blank rows file
+        with open(cls.blank_rows_file, "rb") as f:
+            content = f.read()
+        codecs = {"gzip": gzip, "bz2": bz2, "xz": lzma}
+        if zstandard is not None:
+            codecs["zstd"] = zstandard.ZstdCompressor()
+        cls.compressed_files = []
+        for codec, compressor in codecs.items():
+            compressed_file = f"engines_blank_rows_{codec}.data"
+            with open(compressed_file, "wb") as f:
+                f.write(compressor.compress(content))
+            cls.compressed_files.append(compressed_file)
+
+    @classmethod
+    def tearDown(cls) -> None:
+        os.remove(cls.datafile)
+        os.remove(cls.blank_rows_file)
+        os.remove(cls.typed_file)
+        os.remove(cls.empty_file)
+        os.remove(cls.six_cols_file)
+        os.remove(cls.title_rows_file)
+        for compressed_file in cls.compressed_files:
+            os.remove(compressed_file)
+
+
+class TestReadMemo(unittest.TestCase):
+    """Test class checks the in-process memo of read_data_file: hits on
+    unchanged files, read-only results, invalidation and byte budget"""
+
+    data_file_path = "memofile.data"
+
+    def setUp(self) -> None:
+        conts = [
+            "6.4,8.4,2.2,6.8,Iris-setosa",
+            "5.9,1.3,2.3,8.6,Iris-versicolor",
+            "6.0,7.3,12.7,2.8,Iris-virginica",
+        ]
+        with open(self.data_file_path, "w") as f:
+            f.write("\n".join(conts) + "\n")
+        dp.clear_read_memo()
+
+    def tearDown(self) -> None:
+        dp.clear_read_memo()
+        dp.set_read_memo_budget(1 << 28)
+        os.remove(self.data_file_path)
+
+    def test_memo_hits(self) -> None:
+        """Unchanged files are parsed once, per dtype and engine"""
+
+        iris_df = dp.read_data_file(self.data_file_path, memoize=True)
+        memo_df = dp.read_data_file(self.data_file_path, memoize=True)
+        pd.testing.assert_frame_equal(
+            memo_df, dp.read_data_file(self.data_file_path)
+        )
+        pd.testing.assert_frame_equal(memo_df, iris_df)
+        dp.read_data_file(self.data_file_path, memoize=True, engine="c")
+        dp.read_data_file(self.data_file_path, memoize=True, dtype=np.float32)
+
+        stats = dp.get_read_memo_stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 3)
+        self.assertEqual(stats["entries"], 3)
+        self.assertRaises(
+            ValueError,
+            dp.read_data_file,
+            self.data_file_path,
+            chunksize=2,
+            memoize=True,
+        )
+
+    def test_memo_read_only(self) -> None:
+        """Changes to returned dataframes do not reach the memo"""
+
+        memo_df = dp.read_data_file(self.data_file_path, memoize=True)
+        with self.assertRaises(ValueError):
+            memo_df["sepal_length"].to_numpy()[0] = 100.0
+        try:
+            memo_df.loc[0, "sepal_length"] = 100.0
+        except ValueError:
+            pass
+
+        # in-place writes to the categorical species column
+        memo_df.iloc[0, 4] = "Iris-virginica"
+        memo_df.loc[1, "iris_species"] = "Iris-virginica"
+        memo_df["iris_species"] = "changed"
+
+        expected_df = dp.read_data_file(self.data_file_path)
+        pd.testing.assert_frame_equal(
+            dp.read_data_file(self.data_file_path, memoize=True), expected_df
+        )
+        self.assertEqual(
+            expected_df["iris_species"].tolist(),
+            ["Iris-setosa", "Iris-versicolor", "Iris-virginica"],
+        )
+
+    def test_memo_invalidation(self) -> None:
+        """Modified files are parsed again and replace their old version"""
+
+        dp.read_data_file(self.data_file_path, memoize=True)
+        with open(self.data_file_path, "a") as f:
+            f.write("5.0,3.0,1.6,0.2,Iris-setosa\n")
+        memo_df = dp.read_data_file(self.data_file_path, memoize=True)
+
+        self.assertEqual(len(memo_df), 4)
+        stats = dp.get_read_memo_stats()
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(stats["entries"], 1)
+
+    def test_memo_budget(self) -> None:
+        """Least recently used files are evicted above the byte budget"""
+
+        shutil.copy(self.data_file_path, "memofile_copy.data")
+        try:
+            dp.read_data_file(self.data_file_path, memoize=True)
+            n_bytes = dp.get_read_memo_stats()["bytes"]
+            dp.set_read_memo_budget(n_bytes + n_bytes // 2)
+            dp.read_data_file("memofile_copy.data", memoize=True)
+            dp.read_data_file("memofile_copy.data", memoize=True)
+        finally:
+            os.remove("memofile_copy.data")
+
+        stats = dp.get_read_memo_stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["entries"], 1)
+        self.assertEqual(stats["hits"], 1)
+        self.assertLessEqual(stats["bytes"], stats["max_bytes"])
+
+        dp.set_read_memo_budget(0)
+        self.assertEqual(dp.get_read_memo_stats()["entries"], 0)
+        self.assertRaises(ValueError, dp.set_read_memo_budget, -1)
+        self.assertRaises(TypeError, dp.set_read_memo_budget, 1.5)
+
+
 class TestPlotter(unittest.TestCase):
     def test_barplot(self) -> None:
         """Creates a plot and generates a md5 hash. Compares md5 hashes for
@@ -497,6 +1324,533 @@ class TestPlotter(unittest.TestCase):
         self.assertEqual(expected_hash, test_hash)
         self.assertEqual(expected_type, test_type)
 
+    def test_scatter_species_index(self) -> None:
+        """Scatter plot points of each species taken from the species index
+        match the rows selected by species"""
+
+        conts = [
+            [6.4, 8.4, 2.2, 6.8, "Iris-virginica"],
+            [5.9, 1.3, 2.3, 8.6, "Iris-setosa"],
+            [4.2, 8.1, 8.6, 9.0, "Iris-versicolor"],
+            [3.8, 11.6, 4.0, 3.0, "Iris-setosa"],
+            [6.0, 7.3, 12.7, 2.8, "Iris-virginica"],
+            [10.3, 5.8, 1.5, 7.7, "Iris-setosa"],
+        ]
+        iris_df = pd.DataFrame(data=conts, columns=dp.IRIS_COLUMNS)
+        iris_df["iris_species"] = iris_df["iris_species"].astype("category")
+
+        species_index = dp.get_species_index(iris_df)
+        order, species_slices = species_index
+        self.assertEqual(order.tolist(), [0, 4, 1, 3, 5, 2])
+        self.assertEqual(
+            list(species_slices),
+            ["Iris-virginica", "Iris-setosa", "Iris-versicolor"],
+        )
+
+        ax = pl.petal_width_v_length_scatter(
+            iris_df, outname="testscatter", species_index=species_index
+        )
+        os.remove("testscatter.png")
+
+        for collection, species_name in zip(ax.collections, species_slices):
+            iris_subset = iris_df[iris_df["iris_species"] == species_name]
+            self.assertEqual(
+                collection.get_offsets().tolist(),
+                iris_subset[["sepal_length", "sepal_width"]].values.tolist(),
+            )
+
+    def test_merged_plot_figures(self) -> None:
+        """The merged plot saves a single image and leaves no open figures,
+        plots drawn on a provided axis are not saved"""
+
+        conts = [
+            [6.4, 8.4, 2.2, 6.8, "Iris-setosa"],
+            [5.9, 1.3, 2.3, 8.6, "Iris-setosa"],
+            [4.2, 8.1, 8.6, 9.0, "Iris-versicolor"],
+            [6.0, 7.3, 12.7, 2.8, "Iris-virginica"],
+        ]
+        iris_df = pd.DataFrame(data=conts, columns=dp.IRIS_COLUMNS)
+        outname = "testmerged"
+
+        pl.plt.close("all")
+        pl.merged_boxplot_and_scatter(iris_df, outname=outname)
+        self.assertEqual(pl.plt.get_fignums(), [])
+        self.assertTrue(os.path.exists(f"{outname}.png"))
+        os.remove(f"{outname}.png")
+
+        fig, ax = pl.plt.subplots()
+        pl.create_iris_boxplot(iris_df, outname=outname, axis=ax)
+        pl.petal_width_v_length_scatter(iris_df, outname=outname, axis=ax)
+        self.assertEqual(pl.plt.get_fignums(), [fig.number])
+        self.assertFalse(os.path.exists(f"{outname}.png"))
+        pl.plt.close(fig)
+
+    def test_render_plots_jobs(self) -> None:
+        """Plots rendered in worker processes generate the same images as
+        plots rendered in the main process"""
+
+        conts = [
+            [6.4, 8.4, 2.2, 6.8, "Iris-setosa"],
+            [5.9, 1.3, 2.3, 8.6, "Iris-versicolor"],
+            [6.0, 7.3, 12.7, 2.8, "Iris-virginica"],
+        ]
+        iris_df = pd.DataFrame(data=conts, columns=dp.IRIS_COLUMNS)
+        plot_data = {
+            "iris": (
+                pl._get_boxplot_stats(iris_df),
+                pl._get_scatter_data(iris_df),
+            )
+        }
+
+        image_hashes = []
+        for jobs in [1, 2]:
+            plot_tasks = [
+                ("iris", plot_kind, f"testjobs{jobs}{suffix}")
+                for plot_kind, suffix in pl._PLOT_SUFFIXES.items()
+            ]
+            image_names = list(pl._render_plots(plot_data, plot_tasks, jobs))
+            self.assertEqual(
+                image_names, [f"{task[2]}.png" for task in plot_tasks]
+            )
+
+            job_hashes = []
+            for image_name in image_names:
+                with open(image_name, "rb") as f:
+                    job_hashes.append(hashlib.md5(f.read()).hexdigest())
+                os.remove(image_name)
+            image_hashes.append(job_hashes)
+
+        self.assertEqual(image_hashes[0], image_hashes[1])
+
+    def test_render_plots_shared_workers(self) -> None:
+        """Worker processes started once render consecutive windows of
+        files with the plot data of each window"""
+
+        windows = []
+        for scale in [1.0, 2.0]:
+            iris_df = pd.DataFrame(
+                data=[
+                    [6.4 * scale, 8.4, 2.2, 6.8, "Iris-setosa"],
+                    [5.9 * scale, 1.3, 2.3, 8.6, "Iris-versicolor"],
+                ],
+                columns=dp.IRIS_COLUMNS,
+            )
+            windows.append(
+                {
+                    "iris": (
+                        pl._get_boxplot_stats(iris_df),
+                        pl._get_scatter_data(iris_df),
+                    )
+                }
+            )
+        plot_tasks = [
+            ("iris", "boxplot", "testwindow_pool_boxplot"),
+            ("iris", "scatter", "testwindow_pool_scatter"),
+        ]
+
+        executor = pl._start_plot_workers(2)
+        self.addCleanup(executor.shutdown)
+        for plot_data in windows:
+            pool_hashes = []
+            for image_name in pl._render_plots(
+                plot_data, plot_tasks, jobs=2, executor=executor
+            ):
+                with open(image_name, "rb") as f:
+                    pool_hashes.append(hashlib.md5(f.read()).hexdigest())
+                os.remove(image_name)
+
+            expected_hashes = []
+            for image_name in pl._render_plots(plot_data, plot_tasks):
+                with open(image_name, "rb") as f:
+                    expected_hashes.append(hashlib.md5(f.read()).hexdigest())
+                os.remove(image_name)
+
+            self.assertEqual(pool_hashes, expected_hashes)
+
+    def test_batch_files(self) -> None:
+        """Batches of iris data files are listed from a directory, a manifest
+        file or a glob pattern and get one image prefix per file"""
+
+        batch_dir = Path("test_batch")
+        (batch_dir / "a").mkdir(parents=True)
+        (batch_dir / "b").mkdir()
+        iris_data_files = [
+            str(batch_dir / "a" / "iris.data"),
+            str(batch_dir / "b" / "iris.data"),
+        ]
+        for iris_data in iris_data_files:
+            Path(iris_data).write_text("5.1,3.5,1.4,0.2,Iris-setosa\n")
+        manifest = batch_dir / "manifest.txt"
+        manifest.write_text("# batch\na/iris.data\n\nb/iris.data\n")
+
+        try:
+            self.assertEqual(
+                pl._get_batch_files(str(batch_dir / "*" / "*.data")),
+                iris_data_files,
+            )
+            self.assertEqual(
+                pl._get_batch_files(str(manifest)), iris_data_files
+            )
+            self.assertEqual(
+                pl._get_batch_files(str(batch_dir / "a")), iris_data_files[:1]
+            )
+            self.assertRaises(
+                FileNotFoundError, pl._get_batch_files, "test_batch_*.none"
+            )
+
+            self.assertEqual(
+                pl._get_outnames(iris_data_files[:1], "out"),
+                {iris_data_files[0]: "out"},
+            )
+            self.assertEqual(
+                list(pl._get_outnames(iris_data_files, "out").values()),
+                ["out_test_batch_a_iris", "out_test_batch_b_iris"],
+            )
+        finally:
+            shutil.rmtree(batch_dir)
+
+    def test_batch_rerun_same_directory(self) -> None:
+        """Images and the manifest written next to the iris data files of a
+        batch directory are not read back as inputs by later runs"""
+
+        batch_dir = Path("test_batch_rerun")
+        batch_dir.mkdir()
+        for name in ["a", "b", "c"]:
+            (batch_dir / f"{name}.data").write_text(
+                "5.1,3.5,1.4,0.2,Iris-setosa\n6.3,2.5,5.0,1.9,Iris-virginica\n"
+            )
+
+        def run_batch(*args: str) -> subprocess.CompletedProcess:
+            return subprocess.run(
+                [
+                    sys.executable,
+                    pl.__file__,
+                    "-b",
+                    str(batch_dir),
+                    "-o",
+                    str(batch_dir / "run"),
+                    *args,
+                ],
+                capture_output=True,
+                text=True,
+            )
+
+        try:
+            first_run = run_batch("-j", "2")
+            self.assertEqual(first_run.returncode, 0, first_run.stdout)
+            self.assertIn("0 hits, 9 misses", first_run.stdout)
+            self.assertIn("Processed 3 files", first_run.stdout)
+
+            second_run = run_batch("--force")
+            self.assertEqual(second_run.returncode, 0, second_run.stdout)
+            self.assertIn("0 hits, 9 misses", second_run.stdout)
+            self.assertNotIn("Failed", second_run.stdout)
+
+            self.assertEqual(
+                pl._get_batch_files(str(batch_dir)),
+                [str(batch_dir / f"{name}.data") for name in ["a", "b", "c"]],
+            )
+        finally:
+            shutil.rmtree(batch_dir)
+
+    def test_missing_input_error(self) -> None:
+        """Missing input files are reported once and exit with code 1"""
+
+        result = subprocess.run(
+            [
+                sys.executable,
+                pl.__file__,
+                "-i",
+                "notafile.data",
+                "-o",
+                "testmissing",
+            ],
+            capture_output=True,
+            text=True,
+        )
+
+        self.assertEqual(result.returncode, 1)
+        self.assertEqual(
+            result.stdout.strip().splitlines(),
+            ["FileNotFoundError: notafile.data does not exist."],
+        )
+        self.assertNotIn("Traceback", result.stderr)
+
+    def test_scatter_density(self) -> None:
+        """Above the density threshold, points of each species are binned
+        into 2D histograms and drawn as images"""
+
+        rng = np.random.default_rng(0)
+        species = ["Iris-setosa", "Iris-versicolor", "Iris-virginica"]
+        iris_df = pd.DataFrame(
+            rng.random((300, 4)) * 10, columns=dp.IRIS_COLUMNS[:-1]
+        )
+        iris_df["iris_species"] = pd.Categorical(
+            [species[idx % 3] for idx in range(300)]
+        )
+
+        scatter_data = pl._get_scatter_data(iris_df, density_threshold=1000)
+        self.assertIn("points", scatter_data)
+
+        scatter_data = pl._get_scatter_data(
+            iris_df, density_threshold=100, bins=16
+        )
+        self.assertEqual(list(scatter_data["density"]), species)
+        for density in scatter_data["density"].values():
+            self.assertEqual(density.shape, (16, 16))
+            self.assertEqual(density.sum(), 100)
+        self.assertEqual(
+            scatter_data["extent"],
+            (
+                iris_df["sepal_length"].min(),
+                iris_df["sepal_length"].max(),
+                iris_df["sepal_width"].min(),
+                iris_df["sepal_width"].max(),
+            ),
+        )
+
+        ax = pl.petal_width_v_length_scatter(
+            iris_df, outname="testdensity", density_threshold=100
+        )
+        os.remove("testdensity.png")
+        self.assertEqual(len(ax.images), 3)
+        self.assertEqual(len(ax.collections), 0)
+
+        # files with no data rows have non-numeric columns in every engine
+        with open("testdensity_empty.data", "w") as f:
+            f.write("\n\n")
+        try:
+            for engine in ["python", "c", "pyarrow"]:
+                empty_df = dp.read_data_file(
+                    "testdensity_empty.data", engine=engine
+                )
+                scatter_data = pl._get_scatter_data(
+                    empty_df, density_threshold=0
+                )
+                self.assertEqual(scatter_data, {"points": {}})
+                pl.petal_width_v_length_scatter(empty_df, "testdensity")
+                pl.merged_boxplot_and_scatter(empty_df, "testdensity_merged")
+        finally:
+            os.remove("testdensity_empty.data")
+            for image_name in ["testdensity", "testdensity_merged"]:
+                if os.path.exists(f"{image_name}.png"):
+                    os.remove(f"{image_name}.png")
+
+    def test_boxplot_stats(self) -> None:
+        """Box plot statistics of small datasets match
+        matplotlib.cbook.boxplot_stats and do not depend on chunks"""
+
+        rng = np.random.default_rng(0)
+        iris_df = pd.DataFrame(
+            rng.standard_t(3, size=(300, 4)), columns=dp.IRIS_COLUMNS[:-1]
+        )
+        iris_df["iris_species"] = "Iris-setosa"
+
+        expected_stats = pl.cbook.boxplot_stats(
+            [iris_df[col_name].values for col_name in dp.IRIS_COLUMNS[:-1]],
+            labels=dp.IRIS_COLUMNS[:-1],
+        )
+        for box_stats in [
+            pl._get_boxplot_stats(iris_df),
+            pl._get_boxplot_stats(
+                iris_df.iloc[start:start + 100] for start in [0, 100, 200]
+            ),
+        ]:
+            for col_stats, expected_col_stats in zip(
+                box_stats, expected_stats
+            ):
+                self.assertEqual(
+                    col_stats["label"], expected_col_stats["label"]
+                )
+                np.testing.assert_allclose(
+                    np.sort(col_stats["fliers"]),
+                    np.sort(expected_col_stats["fliers"]),
+                )
+                for key in ["mean", "q1", "med", "q3", "whislo", "whishi"]:
+                    self.assertAlmostEqual(
+                        col_stats[key], expected_col_stats[key]
+                    )
+
+    def test_plot_chunks(self) -> None:
+        """Plotting functions accept dataframe chunks and draw the same plot
+        data as the whole dataframe"""
+        data_file_path = "chunkfile.data"
+
+        conts = [
+            "6.4,8.4,2.2,6.8,Iris-setosa",
+            "5.9,1.3,2.3,8.6,Iris-setosa",
+            "4.2,8.1,8.6,9.0,Iris-versicolor",
+            "3.8,11.6,4.0,3.0,Iris-versicolor",
+            "6.0,7.3,12.7,2.8,Iris-virginica",
+            "10.3,5.8,1.5,7.7,Iris-virginica",
+        ]
+        with open(data_file_path, "w") as f:
+            f.write("\n".join(conts) + "\n")
+        self.addCleanup(os.remove, data_file_path)
+
+        iris_df = dp.read_data_file(data_file_path)
+        expected_box_stats, expected_scatter = pl.get_plot_data(iris_df)
+        box_stats, scatter_data = pl.get_plot_data(
+            dp.read_data_file(data_file_path, chunksize=4)
+        )
+        for col_stats, expected_col_stats in zip(
+            box_stats, expected_box_stats
+        ):
+            for key in ["mean", "q1", "med", "q3", "whislo", "whishi"]:
+                self.assertAlmostEqual(
+                    col_stats[key], expected_col_stats[key]
+                )
+        self.assertEqual(
+            list(scatter_data["points"]), list(expected_scatter["points"])
+        )
+        for species_name, points in scatter_data["points"].items():
+            for values, expected_values in zip(
+                points, expected_scatter["points"][species_name]
+            ):
+                np.testing.assert_array_equal(values, expected_values)
+
+        self.assertEqual(
+            pl._load_plot_data(data_file_path, chunksize=4)[1], len(iris_df)
+        )
+
+        plot_funcs = [
+            pl.create_iris_boxplot,
+            pl.petal_width_v_length_scatter,
+            pl.merged_boxplot_and_scatter,
+        ]
+        for plot_func in plot_funcs:
+            plot_func(
+                dp.read_data_file(data_file_path, chunksize=4), "testchunks"
+            )
+            self.assertTrue(os.path.exists("testchunks.png"))
+            os.remove("testchunks.png")
+
+            self.assertRaises(TypeError, plot_func, [[1.0, 2.0]], "testchunks")
+            self.assertRaises(TypeError, plot_func, 1.0, "testchunks")
+
+        self.assertRaises(
+            ValueError,
+            pl.merged_boxplot_and_scatter,
+            iter([iris_df]),
+            "testchunks",
+            species_index=dp.get_species_index(iris_df),
+        )
+
+        # only the plot data a plot kind uses is computed
+        for iris_data in [iris_df, iter([iris_df])]:
+            box_stats, scatter_data = pl.get_plot_data(iris_data, "boxplot")
+            self.assertEqual(len(box_stats), len(expected_box_stats))
+            self.assertIsNone(scatter_data)
+        box_stats, scatter_data = pl.get_plot_data(
+            dp.read_data_file(data_file_path, chunksize=4), "scatter"
+        )
+        self.assertIsNone(box_stats)
+        self.assertEqual(
+            scatter_data["points"].keys(), expected_scatter["points"].keys()
+        )
+        self.assertRaises(ValueError, pl.get_plot_data, iris_df, "violin")
+
+    def test_save_options(self) -> None:
+        """Plots are saved in the requested format and resolution, points of
+        vector images are rasterized"""
+
+        conts = [
+            [6.4, 8.4, 2.2, 6.8, "Iris-setosa"],
+            [5.9, 1.3, 2.3, 8.6, "Iris-versicolor"],
+            [6.0, 7.3, 12.7, 2.8, "Iris-virginica"],
+        ]
+        iris_df = pd.DataFrame(data=conts, columns=dp.IRIS_COLUMNS)
+
+        pl.create_iris_boxplot(iris_df, "testsave", file_format="jpeg", dpi=50)
+        with open("testsave.jpeg", "rb") as f:
+            self.assertEqual(f.read(3), b"\xff\xd8\xff")
+        os.remove("testsave.jpeg")
+
+        ax = pl.petal_width_v_length_scatter(
+            iris_df, "testsave", file_format="svg"
+        )
+        self.assertTrue(all(c.get_rasterized() for c in ax.collections))
+        self.assertTrue(os.path.exists("testsave.svg"))
+        os.remove("testsave.svg")
+
+        pl.merged_boxplot_and_scatter(iris_df, "testsave_fast", fast_png=True)
+        pl.merged_boxplot_and_scatter(iris_df, "testsave_default")
+        fast_size = os.path.getsize("testsave_fast.png")
+        default_size = os.path.getsize("testsave_default.png")
+        os.remove("testsave_fast.png")
+        os.remove("testsave_default.png")
+        self.assertGreater(fast_size, default_size)
+
+        self.assertRaises(
+            ValueError,
+            pl.create_iris_boxplot,
+            iris_df,
+            "testsave",
+            file_format="gif",
+        )
+        self.assertRaises(
+            ValueError,
+            pl.create_iris_boxplot,
+            iris_df,
+            "testsave",
+            file_format="svg",
+            fast_png=True,
+        )
+        self.assertRaises(
+            ValueError, pl.create_iris_boxplot, iris_df, "testsave", dpi=0
+        )
+
+    def test_incremental_replot(self) -> None:
+        """Images that are up to date with the manifest are not re-plotted,
+        changed inputs and plot parameters or --force re-plot them"""
+
+        data_file_path = "replotfile.data"
+        conts = [
+            "6.4,8.4,2.2,6.8,Iris-setosa",
+            "5.9,1.3,2.3,8.6,Iris-versicolor",
+            "6.0,7.3,12.7,2.8,Iris-virginica",
+        ]
+        with open(data_file_path, "w") as f:
+            f.write("\n".join(conts) + "\n")
+        image_names = [
+            f"testreplot{suffix}.png" for suffix in pl._PLOT_SUFFIXES.values()
+        ]
+
+        def run_plotter(*args: str) -> str:
+            result = subprocess.run(
+                [
+                    sys.executable,
+                    pl.__file__,
+                    "-i",
+                    data_file_path,
+                    "-o",
+                    "testreplot",
+                    *args,
+                ],
+                capture_output=True,
+                text=True,
+            )
+            self.assertEqual(result.returncode, 0, result.stderr)
+            return result.stdout
+
+        try:
+            self.assertIn("0 hits, 3 misses", run_plotter())
+            self.assertTrue(os.path.exists(pl._MANIFEST_NAME))
+            self.assertIn("3 hits, 0 misses", run_plotter())
+            self.assertIn("0 hits, 3 misses", run_plotter("--force"))
+            self.assertIn("0 hits, 3 misses", run_plotter("--dpi", "50"))
+
+            os.remove(image_names[1])
+            self.assertIn("2 hits, 1 misses", run_plotter("--dpi", "50"))
+
+            with open(data_file_path, "a") as f:
+                f.write("5.0,3.0,1.6,0.2,Iris-setosa\n")
+            self.assertIn("0 hits, 3 misses", run_plotter("--dpi", "50"))
+        finally:
+            for file_name in [data_file_path, pl._MANIFEST_NAME, *image_names]:
+                if os.path.exists(file_name):
+                    os.remove(file_name)
+
     def test_non_string_name_scatter(self) -> None:
         """Checks for exceptions if a non-string outname was provided"""
         data_file_path = "datafile.data"
@@ -574,3 +1928,227 @@ class TestPlotter(unittest.TestCase):
         os.remove("merged_scatter_and_boxplot.png")
 
         self.assertEqual(expected_hash, test_hash)
+
+
+class TestPlotServer(unittest.TestCase):
+    """Test class checks that the plot server renders plots, caches parsed
+    files by path and modification time and reports request errors"""
+
+    data_file_path = "serverfile.data"
+
+    def setUp(self) -> None:
+        conts = [
+            "6.4,8.4,2.2,6.8,Iris-setosa",
+            "5.9,1.3,2.3,8.6,Iris-versicolor",
+            "6.0,7.3,12.7,2.8,Iris-virginica",
+        ]
+        with open(self.data_file_path, "w") as f:
+            f.write("\n".join(conts) + "\n")
+        self.plot_server = ps.PlotServer(".", cache_size=1, jobs=1)
+
+    def tearDown(self) -> None:
+        self.plot_server.close()
+        os.remove(self.data_file_path)
+
+    async def request(self, address: tuple, target: str) -> tuple:
+        """Sends a GET request, returns the status code and body"""
+        reader, writer = await asyncio.open_connection(*address)
+        writer.write(f"GET {target} HTTP/1.1\r\nHost: test\r\n\r\n".encode())
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+
+        head, body = response.split(b"\r\n\r\n", 1)
+        return int(head.split()[1]), body
+
+    async def run_requests(self, targets: list) -> list:
+        """Starts the server on a free port and sends requests in order"""
+        ready = asyncio.get_running_loop().create_future()
+        server_task = asyncio.create_task(
+            self.plot_server.serve(port=0, ready=ready)
+        )
+        address = await ready
+        try:
+            return [
+                await self.request(address, target) for target in targets
+            ]
+        finally:
+            server_task.cancel()
+
+    def test_plot_requests(self) -> None:
+        """Plots are rendered from one parse of the file"""
+
+        path = self.data_file_path
+        responses = asyncio.run(
+            self.run_requests(
+                [
+                    f"/plot/boxplot?path={path}",
+                    f"/plot/scatter?path={path}&format=svg",
+                    f"/plot/merged?path={path}&fast_png=1",
+                    f"/data?path={path}",
+                    "/stats",
+                ]
+            )
+        )
+
+        statuses = [status for status, _ in responses]
+        self.assertEqual(statuses, [200] * 5)
+        self.assertTrue(responses[0][1].startswith(b"\x89PNG"))
+        self.assertIn(b"<svg", responses[1][1])
+        self.assertTrue(responses[2][1].startswith(b"\x89PNG"))
+        self.assertIn(b'"n_rows": 3', responses[3][1])
+        self.assertIn(b'"hits": 3, "misses": 1', responses[4][1])
+
+    def test_cache_invalidation(self) -> None:
+        """Modified files are parsed again, least recently used files are
+        evicted"""
+
+        async def get_rows() -> list:
+            n_rows = [len(await self.plot_server.get_iris_data(path))]
+            with open(path, "a") as f:
+                f.write("5.0,3.0,1.6,0.2,Iris-setosa\n")
+            os.utime(path, ns=(0, 10**9))
+            n_rows.append(len(await self.plot_server.get_iris_data(path)))
+            n_rows.append(len(await self.plot_server.get_iris_data(path)))
+            return n_rows
+
+        path = self.data_file_path
+        self.assertEqual(asyncio.run(get_rows()), [3, 4, 4])
+        self.assertEqual(
+            self.plot_server.stats, {"hits": 1, "misses": 2, "evictions": 0}
+        )
+
+        shutil.copy(path, "serverfile_copy.data")
+        try:
+            asyncio.run(self.plot_server.get_iris_data("serverfile_copy.data"))
+        finally:
+            os.remove("serverfile_copy.data")
+        self.assertEqual(self.plot_server.stats["evictions"], 1)
+
+    def test_request_errors(self) -> None:
+        """Request errors are reported with their status code"""
+
+        path = self.data_file_path
+        responses = asyncio.run(
+            self.run_requests(
+                [
+                    "/plot/boxplot?path=does_not_exist.data",
+                    f"/plot/violin?path={path}",
+                    f"/plot/boxplot?path={path}&format=gif",
+                    "/plot/boxplot",
+                    "/unknown",
+                ]
+            )
+        )
+        statuses = [status for status, _ in responses]
+        self.assertEqual(statuses, [404, 400, 400, 400, 404])
+
+        # worker processes are only started by start_workers() and serve()
+        plot_server = ps.PlotServer(".")
+        with self.assertRaises(RuntimeError):
+            asyncio.run(plot_server.render(path, "boxplot"))
+        self.assertRaises(ValueError, ps.PlotServer, ".", cache_size=0)
+        self.assertRaises(ValueError, ps.PlotServer, ".", jobs=0)
+        self.assertRaises(NotADirectoryError, ps.PlotServer, path)
+
+    def test_paths_outside_root(self) -> None:
+        """Only iris data files under the root directory are served"""
+
+        root_dir = Path("test_server_root")
+        root_dir.mkdir()
+        self.addCleanup(shutil.rmtree, root_dir)
+        shutil.copy(self.data_file_path, root_dir / "iris.data")
+        outside_file = Path(self.data_file_path).resolve()
+        (root_dir / "link.data").symlink_to(outside_file)
+
+        self.plot_server = ps.PlotServer(str(root_dir), cache_size=1, jobs=1)
+        responses = asyncio.run(
+            self.run_requests(
+                [
+                    "/data?path=iris.data",
+                    f"/data?path=../{self.data_file_path}",
+                    f"/data?path={outside_file}",
+                    "/plot/boxplot?path=link.data",
+                ]
+            )
+        )
+        statuses = [status for status, _ in responses]
+        self.assertEqual(statuses, [200, 403, 403, 403])
+
+
+class TestImportTime(unittest.TestCase):
+    """Test class checks that importing plotter stays fast by deferring the
+    matplotlib and pandas imports"""
+
+    # regression threshold of the cumulative plotter import time
+    # (microseconds), importing matplotlib.pyplot and pandas up front takes
+    # well over a second
+    import_time_threshold = 750_000
+
+    # package root, where plotter.py and data_processor.py are located
+    package_dir = Path(pl.__file__).resolve().parent
+
+    def get_import_times(self, *args: str) -> Dict[str, int]:
+        """Runs python -X importtime and returns the cumulative import time
+        (microseconds) of each imported module"""
+
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", *args],
+            cwd=self.package_dir,
+            capture_output=True,
+            text=True,
+        )
+
+        import_times = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative_us, module_name = line.split("|")
+            import_times[module_name.strip()] = int(cumulative_us)
+
+        return import_times
+
+    def test_plotter_import_time(self) -> None:
+        """plotter imports without matplotlib and pandas under the import
+        time threshold"""
+
+        best_time = None
+        for _ in range(3):
+            import_times = self.get_import_times("-c", "import plotter")
+            self.assertNotIn("matplotlib", import_times)
+            self.assertNotIn("pandas", import_times)
+            self.assertNotIn("pyarrow", import_times)
+            if best_time is None or import_times["plotter"] < best_time:
+                best_time = import_times["plotter"]
+
+        self.assertLess(best_time, self.import_time_threshold)
+
+    def test_plotter_help(self) -> None:
+        """plotter.py --help does not import matplotlib and pandas"""
+
+        import_times = self.get_import_times("plotter.py", "--help")
+        self.assertIn("data_processor", import_times)
+        self.assertNotIn("matplotlib", import_times)
+        self.assertNotIn("pandas", import_times)
+
+    def test_plotter_import_keeps_backend(self) -> None:
+        """Importing plotter does not select a matplotlib backend for the
+        importing program"""
+
+        env = {
+            key: value
+            for key, value in os.environ.items()
+            if key != "MPLBACKEND"
+        }
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import os, plotter; print(os.environ.get('MPLBACKEND'))",
+            ],
+            cwd=self.package_dir,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(result.stdout.strip(), "None")